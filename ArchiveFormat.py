@@ -0,0 +1,242 @@
+
+# Importing the Python modules, the dependencies of the archive formats.
+import io
+import os
+import re
+import gzip
+import json
+from AtomicFile import atomic_writer
+
+# The zstandard module is optional, the "ndjson.zst" format can only be used if it is installed.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+"""The formats the articles of a news source can be archived in, with the extension of their files. A "json" file
+   is a single indented JSON list, the other formats hold one JSON record per line and can be compressed."""
+archive_formats = {"json": ".json", "ndjson": ".ndjson", "ndjson.gz": ".ndjson.gz", "ndjson.zst": ".ndjson.zst"}
+
+"""The extensions of the files of the archive, the longest first so ".ndjson.gz" is not mistaken for another extension."""
+archive_extensions = sorted(archive_formats.values(), key = len, reverse = True)
+
+"""The sorts of the news articles collected from a news source, the last part of the name of its file."""
+sorts = ("top", "latest")
+
+# Function is used to check an archive format.
+def check_format(archive_format):
+    """This function raises a ValueError if the archive format is unknown or needs a module which is not installed."""
+
+    if archive_format not in archive_formats:
+        raise ValueError("Unknown Archive Format: " + str(archive_format))
+    if archive_format == "ndjson.zst" and zstandard is None:
+        raise ValueError("The ndjson.zst Archive Format Needs The zstandard Module")
+
+# Function is used to find the extension of a file of the archive.
+def file_extension(file_name):
+    """This function returns the extension of a file of the archive, None is returned if it is not one."""
+
+    for extension in archive_extensions:
+        if file_name.endswith(extension):
+            return extension
+    return None
+
+# Function is used to create the name of the file of a news source.
+def source_file_name(directory, news_source, sort_by_var, archive_format = "json"):
+    """This function returns the name of the file of a news source in the directory, in the archive format."""
+
+    return os.path.join(directory, news_source + "-" + sort_by_var + archive_formats[archive_format])
+
+# Function is used to find the file of a news source.
+def find_source_file(directory, news_source, sort_by_var, archive_format = "json"):
+    """This function returns the name of the file of a news source in the directory, in whichever format it has
+       been archived. The name of the file in the archive format is returned if there is no file."""
+
+    preferred = source_file_name(directory, news_source, sort_by_var, archive_format)
+    if os.path.exists(preferred):
+        return preferred
+    for other_format in archive_formats:
+        file_name = source_file_name(directory, news_source, sort_by_var, other_format)
+        if os.path.exists(file_name):
+            return file_name
+    return preferred
+
+# Function is used to split the name of a file of the archive.
+def split_source_file_name(file_name):
+    """This function returns the date, news source and sort of a file of the archive, Archive/<date>/<source>-<sort>.<extension>."""
+
+    day = os.path.basename(os.path.dirname(file_name))
+    base_name = os.path.basename(file_name)
+    base_name = base_name[:len(base_name) - len(file_extension(base_name) or "")]
+    source, separator, sort = base_name.rpartition("-")
+    return day, source, sort
+
+# Function is used to check if a file is the file of a news source.
+def is_source_file(file_name):
+    """This function returns True if the file is the file of a news source, <source>-<sort>.<extension>. The
+       other files kept in the archive, such as Circuits.json, Quota.json or Pages/Manifest.ndjson, are not."""
+
+    if file_extension(os.path.basename(file_name)) is None:
+        return False
+    day, source, sort = split_source_file_name(file_name)
+    return bool(source) and sort in sorts
+
+# Function is used to open a compressed file for reading.
+def open_binary(file_name):
+    """This function opens a file of the archive for reading and returns a file of its uncompressed bytes."""
+
+    if file_name.endswith(".gz"):
+        return gzip.open(file_name, "rb")
+    if file_name.endswith(".zst"):
+        if zstandard is None:
+            raise OSError("The zstandard Module Is Needed To Read " + file_name)
+        return zstandard.ZstdDecompressor().stream_reader(open(file_name, "rb"), closefd = True)
+    return open(file_name, "rb")
+
+# Function is used to read the records of a file one at a time.
+def iter_records(file_name):
+    """This function is a generator yielding the records of a file of the archive one at a time. The records of
+       a line-delimited file are read line by line, so only one record is held in memory at once."""
+
+    if file_extension(file_name) == ".json":
+        with open(file_name, "r") as json_file:
+            yield from json.load(json_file)
+        return
+
+    with open_binary(file_name) as binary_file:
+        for line in io.TextIOWrapper(binary_file, encoding = "utf-8"):
+            if line.strip():
+                yield json.loads(line)
+
+# Function is used to read the uncompressed bytes of a file.
+def read_bytes(file_name, signature = None):
+    """This function returns the uncompressed bytes of a file of the archive. If a signature of the modification
+       time and size of the file is given, an OSError is raised if the file has changed since."""
+
+    with open(file_name, "rb") as raw_file:
+        if signature is not None:
+            status = os.fstat(raw_file.fileno())
+            if [status.st_mtime_ns, status.st_size] != list(signature):
+                raise OSError("File Has Changed: " + file_name)
+        data = raw_file.read()
+    if file_name.endswith(".gz"):
+        return gzip.decompress(data)
+    if file_name.endswith(".zst"):
+        if zstandard is None:
+            raise OSError("The zstandard Module Is Needed To Read " + file_name)
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+            return reader.read()
+    return data
+
+"""The white space between the records of a JSON list."""
+white_space = re.compile(r"\s*")
+
+# Function is used to find the records in the bytes of a file.
+def iter_record_spans(file_name, data):
+    """This function is a generator yielding the byte offset, length and record of every record in the
+       uncompressed bytes of a file of the archive, read with read_bytes. The bytes of a record can be decoded
+       again on their own, a line of a line-delimited file or an element of the list of a "json" file."""
+
+    if file_extension(file_name) != ".json":
+        offset = 0
+        for line in data.splitlines(keepends = True):
+            if line.strip():
+                yield offset, len(line.rstrip(b"\r\n")), json.loads(line)
+            offset = offset + len(line)
+        return
+
+    # The elements of the list are decoded one at a time, the offsets of the characters are turned into byte offsets.
+    text = data.decode("utf-8")
+    counted = [0, 0]
+    def byte_offset(position):
+        if len(text) == len(data):
+            return position
+        counted[1] = counted[1] + len(text[counted[0]:position].encode("utf-8"))
+        counted[0] = position
+        return counted[1]
+
+    decoder = json.JSONDecoder()
+    position = white_space.match(text, 0).end()
+    if text[position:position + 1] != "[":
+        raise ValueError("Not A JSON List: " + file_name)
+    position = white_space.match(text, position + 1).end()
+    while text[position:position + 1] != "]":
+        record, end = decoder.raw_decode(text, position)
+        start = byte_offset(position)
+        yield start, byte_offset(end) - start, record
+        position = white_space.match(text, end).end()
+        if text[position:position + 1] == ",":
+            position = white_space.match(text, position + 1).end()
+        elif text[position:position + 1] != "]":
+            raise ValueError("Not A JSON List: " + file_name)
+
+# Function is used to read all records of a file.
+def read_records(file_name):
+    """This function returns a list of the records of a file of the archive."""
+
+    return list(iter_records(file_name))
+
+# Function is used to write the records of a file.
+def write_records(file_name, records):
+    """This function writes the records to a file of the archive in the format given by its extension. The
+       file is written atomically and the records are written one at a time, so they can be a generator."""
+
+    extension = file_extension(file_name)
+    with atomic_writer(file_name) as binary_file:
+        if extension == ".json":
+            binary_file.write(json.dumps(list(records), indent = 4, sort_keys = False).encode("utf-8"))
+            return
+
+        if extension == ".ndjson.gz":
+            output_file = gzip.GzipFile(fileobj = binary_file, mode = "wb")
+        elif extension == ".ndjson.zst":
+            if zstandard is None:
+                raise OSError("The zstandard Module Is Needed To Write " + file_name)
+            output_file = zstandard.ZstdCompressor().stream_writer(binary_file, closefd = False)
+        else:
+            output_file = binary_file
+        for record in records:
+            output_file.write(json.dumps(record, separators = (",", ":")).encode("utf-8") + b"\n")
+        if output_file is not binary_file:
+            output_file.close()
+
+# Function is used to write the file of a news source.
+def write_source_file(directory, news_source, sort_by_var, records, archive_format = "json"):
+    """This function writes the records of a news source to the directory in the archive format. Files of the
+       news source in other formats are removed, so each news source has a single file. The name of the file
+       is returned."""
+
+    file_name = source_file_name(directory, news_source, sort_by_var, archive_format)
+    write_records(file_name, records)
+    for other_format in archive_formats:
+        if other_format != archive_format:
+            try:
+                os.remove(source_file_name(directory, news_source, sort_by_var, other_format))
+            except FileNotFoundError:
+                pass
+    return file_name
+
+# Function is used to convert the archive to another format.
+def convert_archive(archive_directory, archive_format):
+    """This function converts the file of every news source in the date directories of the archive to the
+       archive format, the records are streamed so a file is never held in memory. The number of files
+       converted is returned."""
+
+    check_format(archive_format)
+    converted = 0
+    for day in sorted(os.listdir(archive_directory)):
+        day_directory = os.path.join(archive_directory, day)
+        if not os.path.isdir(day_directory):
+            continue
+        for file_name in sorted(os.listdir(day_directory)):
+            old_file_name = os.path.join(day_directory, file_name)
+            if not is_source_file(old_file_name) or file_extension(file_name) == archive_formats[archive_format]:
+                continue
+            day, source, sort = split_source_file_name(old_file_name)
+            try:
+                write_records(source_file_name(day_directory, source, sort, archive_format), iter_records(old_file_name))
+                os.remove(old_file_name)
+                converted = converted + 1
+            except (OSError, ValueError):
+                print("<Archive Process: Error: Could Not Convert " + os.path.join(day, file_name) + ">")
+    return converted
@@ -0,0 +1,346 @@
+
+# Importing the Python modules, the dependencies of the archive index.
+import os
+import json
+import mmap
+import time
+import bisect
+import struct
+import hashlib
+import calendar
+import threading
+import collections
+import ArchiveFormat
+from AtomicFile import atomic_writer
+from ArticleStore import Article
+
+"""The file name of the index of an archive day, and of the data file older versions copied the articles to."""
+index_file_name = "Index.idx"
+data_file_name = "Index.dat"
+
+"""The first bytes of an index file, they change whenever the layout of the index changes."""
+index_magic = b"NFIDX002"
+
+"""The fixed-width record of an article in the index: the 8 byte ID hash, the number of the news source in the
+   source table, the published time in seconds since the epoch, and the byte offset and length of the article
+   in the uncompressed bytes of the file of the news source."""
+index_record = struct.Struct("<8sHqQI")
+
+"""The header of an index file: the magic bytes, the number of records and the length of the source table."""
+index_header = struct.Struct("<8sQI")
+
+# Function is used to find the ID hash of an article.
+def id_hash(article_id):
+    """This function returns the 8 byte hash of an article ID. The ID's made by Deduplication are already an
+       8 byte hash written in hexadecimal, other ID's are hashed."""
+
+    article_id = str(article_id)
+    if len(article_id) == 16:
+        try:
+            return bytes.fromhex(article_id)
+        except ValueError:
+            pass
+    return hashlib.blake2b(article_id.encode("utf-8"), digest_size = 8).digest()
+
+# Function is used to read the published time of an article.
+def published_timestamp(published):
+    """This function returns the published time of an article, an ISO 8601 time such as 2017-12-28T10:00:00Z,
+       in seconds since the epoch. 0 is returned if it cannot be read."""
+
+    try:
+        return calendar.timegm(time.strptime(str(published)[:19], "%Y-%m-%dT%H:%M:%S"))
+    except (ValueError, OverflowError):
+        return 0
+
+# Function is used to check if a directory is an archive day.
+def is_day_name(name):
+    """This function returns True if the name is the name of an archive day, a date such as 28Dec2017."""
+
+    try:
+        time.strptime(name, "%d%b%Y")
+        return True
+    except ValueError:
+        return False
+
+# Function is used to find the date of an archive day.
+def day_sort_key(day_directory):
+    """This function returns the key the archive days are sorted by, the date of a <ddMonYYYY> directory."""
+
+    name = os.path.basename(day_directory)
+    try:
+        return (time.mktime(time.strptime(name, "%d%b%Y")), name)
+    except (ValueError, OverflowError):
+        return (0, name)
+
+# Class for the index of a single archive day.
+class DayIndex:
+    """The DayIndex is the index of a single archive day, kept in an index file in the day directory. The index
+       file holds a fixed-width record of every article, giving the position of the article in the file of its
+       news source, and starts with a small source table giving the news source, sort and rows of every file of
+       the day. Listing, counting and paging the articles of a news source never decodes an article, and the
+       articles are not copied. The index file is memory-mapped, an article is only decoded from the file of
+       its news source once it is needed. The index is made again whenever a file of the day has changed."""
+
+    """The number of files of news sources whose bytes are kept in memory once an article has been read from them."""
+    cached_files = 8
+
+    def __init__(self, directory):
+        """The initiation/constructor method for the DayIndex class. The index of the day is made if it does not
+           exist or is out of date."""
+
+        self.directory = os.path.abspath(directory)
+        self.index_map = None
+        self.signature_files = []
+        self.sources = []
+        self.article_ids = {}
+        self.count = 0
+        self.records_offset = 0
+
+        # The bytes of the files most recently read from, articles are read by more than one thread.
+        self.file_bytes = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+        signature = self.signature()
+        if not self.open(signature):
+            self.build(signature)
+            if not self.open(signature):
+                raise OSError("Could Not Open Index Of " + self.directory)
+
+    def __len__(self):
+        return self.count
+
+    # Method is used to find the signature of the files of the day.
+    def signature(self):
+        """This method returns the name, modification time and size of the file of every news source of the day.
+           The index is out of date once the signature has changed."""
+
+        signature = []
+        for file_name in sorted(os.listdir(self.directory)):
+            if not ArchiveFormat.is_source_file(file_name):
+                continue
+            status = os.stat(os.path.join(self.directory, file_name))
+            signature.append([file_name, status.st_mtime_ns, status.st_size])
+        return signature
+
+    # Method is used to make the index of the day.
+    def build(self, signature):
+        """This method writes the index file of the day from the files of its news sources. The index file is
+           written atomically. The data file written by older versions is removed."""
+
+        sources = []
+        records = []
+        article_ids = {}
+        for file_number, (file_name, modified, size) in enumerate(signature):
+            day, source, sort = ArchiveFormat.split_source_file_name(os.path.join(self.directory, file_name))
+            first_row = len(records)
+            try:
+                data = ArchiveFormat.read_bytes(os.path.join(self.directory, file_name), (modified, size))
+                for offset, length, record in ArchiveFormat.iter_record_spans(file_name, data):
+                    hashed_id = id_hash(record.get("ID"))
+
+                    # An ID which is not an ID hash is kept in the source table, so the article keeps its ID.
+                    if hashed_id.hex() != str(record.get("ID")):
+                        article_ids[str(len(records))] = record.get("ID")
+                    records.append(index_record.pack(hashed_id, len(sources), published_timestamp(record.get("Published")), offset, length))
+            except (OSError, ValueError, TypeError, AttributeError):
+                print("<Archive Index Process: Error: Could Not Index " + os.path.join(day, file_name) + ">")
+                for row in range(first_row, len(records)):
+                    article_ids.pop(str(row), None)
+                del records[first_row:]
+                continue
+            sources.append([source, sort, first_row, len(records) - first_row, file_number])
+
+        source_table = json.dumps({"Signature": (signature), "Sources": (sources), "IDs": (article_ids)}).encode("utf-8")
+        with atomic_writer(os.path.join(self.directory, index_file_name)) as index_file:
+            index_file.write(index_header.pack(index_magic, len(records), len(source_table)))
+            index_file.write(source_table)
+            index_file.write(b"".join(records))
+        try:
+            os.remove(os.path.join(self.directory, data_file_name))
+        except OSError:
+            pass
+
+    # Method is used to open the index of the day.
+    def open(self, signature):
+        """This method memory-maps the index file of the day. False is returned if it does not exist or is out of date."""
+
+        self.close()
+        try:
+            with open(os.path.join(self.directory, index_file_name), "rb") as index_file:
+                index_map = mmap.mmap(index_file.fileno(), 0, access = mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+
+        try:
+            magic, count, table_length = index_header.unpack_from(index_map, 0)
+            table = json.loads(index_map[index_header.size:index_header.size + table_length])
+        except (struct.error, ValueError):
+            index_map.close()
+            return False
+        if magic != index_magic or table["Signature"] != signature:
+            index_map.close()
+            return False
+
+        self.index_map = index_map
+        self.signature_files = table["Signature"]
+        self.sources = table["Sources"]
+        self.article_ids = table["IDs"]
+        self.count = count
+        self.records_offset = index_header.size + table_length
+        return True
+
+    # Method is used to close the index of the day.
+    def close(self):
+        """This method unmaps the index file of the day."""
+
+        if self.index_map is not None:
+            self.index_map.close()
+        self.index_map = None
+        with self.lock:
+            self.file_bytes.clear()
+
+    # Method is used to find the rows of the news sources.
+    def source_rows(self, news_sources = None, sort_by_var = None):
+        """This method returns a list of tuples of the first row and number of rows of every news source of the
+           day, only for the news sources and sort if they are given. No article is decoded."""
+
+        if news_sources is not None:
+            news_sources = set(news_sources)
+        return [(first_row, count) for source, sort, first_row, count, file_number in self.sources
+                if (news_sources is None or source in news_sources) and (sort_by_var is None or sort == sort_by_var)]
+
+    # Method is used to read the record of a row.
+    def record(self, row):
+        """This method returns the ID, news source, sort and published time of a row without decoding the article."""
+
+        hashed_id, source_number, published, offset, length = index_record.unpack_from(self.index_map, self.records_offset + row * index_record.size)
+        source, sort, first_row, count, file_number = self.sources[source_number]
+        return self.article_ids.get(str(row), hashed_id.hex()), source, sort, published
+
+    # Method is used to read the bytes of the file of a news source.
+    def source_bytes(self, file_number):
+        """This method returns the uncompressed bytes of a file of the day, the most recently read files are kept
+           in memory. An OSError is raised if the file has changed since the index was opened, the index must then
+           be opened again."""
+
+        with self.lock:
+            data = self.file_bytes.get(file_number)
+            if data is not None:
+                self.file_bytes.move_to_end(file_number)
+                return data
+        file_name, modified, size = self.signature_files[file_number]
+        data = ArchiveFormat.read_bytes(os.path.join(self.directory, file_name), (modified, size))
+        with self.lock:
+            self.file_bytes[file_number] = data
+            while len(self.file_bytes) > DayIndex.cached_files:
+                self.file_bytes.popitem(last = False)
+        return data
+
+    # Method is used to decode the article of a row.
+    def article(self, row):
+        """This method decodes the article of a row from the file of its news source."""
+
+        hashed_id, source_number, published, offset, length = index_record.unpack_from(self.index_map, self.records_offset + row * index_record.size)
+        source, sort, first_row, count, file_number = self.sources[source_number]
+        data = self.source_bytes(file_number)
+        return Article.from_record(json.loads(data[offset:offset + length]), source)
+
+# Class for a selection of the articles of the archive.
+class ArchiveSelection:
+    """The ArchiveSelection is a list of the articles of some news sources across the days of an ArchiveIndex.
+       It only holds the row ranges of the news sources, so it can be counted and paged without decoding the
+       articles, an article is decoded once it is read."""
+
+    def __init__(self, ranges):
+        """The initiation/constructor method for the ArchiveSelection class. The ranges are tuples of a DayIndex,
+           the first row and the number of rows."""
+
+        self.ranges = [(day_index, first_row, count) for day_index, first_row, count in ranges if count > 0]
+
+        # The position in the selection of the first article of every range, to find a position with a binary search.
+        self.starts = []
+        total = 0
+        for day_index, first_row, count in self.ranges:
+            self.starts.append(total)
+            total = total + count
+        self.count = total
+
+    def __len__(self):
+        return self.count
+
+    # Method is used to decode a page of articles.
+    def articles(self, start, stop):
+        """This method decodes and returns the articles from the position start up to the position stop."""
+
+        articles = []
+        stop = min(stop, self.count)
+        position = max(0, start)
+        while position < stop:
+            range_number = bisect.bisect_right(self.starts, position) - 1
+            day_index, first_row, count = self.ranges[range_number]
+            offset = position - self.starts[range_number]
+            last = min(count, offset + (stop - position))
+            for row in range(first_row + offset, first_row + last):
+                articles.append(day_index.article(row))
+            position = position + (last - offset)
+        return articles
+
+    # Method is used to list the ID's of the articles.
+    def article_ids(self):
+        """This method returns the ID of every article of the selection, in order, without decoding the articles."""
+
+        return [day_index.record(row)[0] for day_index, first_row, count in self.ranges for row in range(first_row, first_row + count)]
+
+# Class for the index of an archive.
+class ArchiveIndex:
+    """The ArchiveIndex opens the DayIndex of every day of an archive, the newest day first. The directory is
+       either a single archive day or a directory of archive days, such as Archive."""
+
+    def __init__(self, directory):
+        """The initiation/constructor method for the ArchiveIndex class."""
+
+        self.directory = os.path.abspath(directory)
+        self.days = []
+        for day_directory in ArchiveIndex.day_directories(self.directory):
+            try:
+                self.days.append(DayIndex(day_directory))
+            except OSError:
+                print("<Archive Index Process: Error: Could Not Index " + day_directory + ">")
+
+    def __len__(self):
+        return sum(len(day_index) for day_index in self.days)
+
+    # Method is used to find the archive days of a directory.
+    @staticmethod
+    def day_directories(directory):
+        """This method returns the archive days of the directory, the newest day first. These are the <ddMonYYYY>
+           sub-directories which hold files of news sources, such as those of Archive. Otherwise it is the directory
+           itself if it holds files of news sources, or else every sub-directory which does."""
+
+        def has_archive_files(path):
+            return any(ArchiveFormat.is_source_file(file_name) for file_name in os.listdir(path))
+
+        sub_directories = [os.path.join(directory, name) for name in os.listdir(directory)
+                           if os.path.isdir(os.path.join(directory, name)) and has_archive_files(os.path.join(directory, name))]
+        day_directories = [sub_directory for sub_directory in sub_directories if is_day_name(os.path.basename(sub_directory))]
+        if not day_directories:
+            if has_archive_files(directory):
+                return [directory]
+            day_directories = sub_directories
+        return sorted(day_directories, key = day_sort_key, reverse = True)
+
+    # Method is used to select the articles of news sources.
+    def select(self, news_sources = None, sort_by_var = None):
+        """This method returns an ArchiveSelection of the articles of the news sources and sort across every day,
+           every news source and sort is selected if they are not given."""
+
+        return ArchiveSelection([(day_index, first_row, count) for day_index in self.days
+                                 for first_row, count in day_index.source_rows(news_sources, sort_by_var)])
+
+    # Method is used to close the archive index.
+    def close(self):
+        """This method unmaps the index of every day."""
+
+        for day_index in self.days:
+            day_index.close()
+        self.days = []
@@ -0,0 +1,185 @@
+
+# Importing the Python modules, the dependencies of the article store.
+import os
+import threading
+import ArchiveFormat
+
+# Class for a single news article.
+class Article:
+    """The Article class is the compact record of a single news article held by the ArticleStore."""
+
+    __slots__ = ("id", "title", "description", "author", "published", "url", "source")
+
+    def __init__(self, id, title, description, author, published, url, source = None):
+        """The initiation/constructor method for the Article class."""
+
+        self.id = id
+        self.title = title
+        self.description = description
+        self.author = author
+        self.published = published
+        self.url = url
+        self.source = source
+
+    # Method is used to create an article from a record of a JSON file.
+    @classmethod
+    def from_record(cls, record, source = None):
+        """This method creates an article from a record stored in the JSON files of the archive."""
+
+        return cls(record["ID"], record["Title"], record["Description"], record["Author"], record["Published"], record["URL"], source)
+
+    # Method is used to convert an article to a record of a JSON file.
+    def to_record(self):
+        """This method returns the record of the article as it is stored in the JSON files of the archive."""
+
+        return {"ID": (self.id), "Title": (self.title), "Description": (self.description), "Author": (self.author),
+                "Published": (self.published), "URL": (self.url)}
+
+# Class for the article store.
+class ArticleStore:
+    """The ArticleStore keeps the news articles of the files of the archive in memory. Each file is only read
+       again once its modification time or size has changed, so redisplaying and filtering articles does not
+       need to read the files again. Files in every format of ArchiveFormat are read. If the store is given an
+       ArchiveDatabase, the articles of Archive/<date>/<source>-<sort>.json are read from the database instead
+       of the file."""
+
+    def __init__(self, database = None):
+        """The initiation/constructor method for the ArticleStore class."""
+
+        self.database = database
+
+        # The articles of each file are kept with the modification time and size of the file.
+        self.files = {}
+
+        # The articles are kept by ID.
+        self.articles = {}
+
+        # The articles of the most recent call to load, in the order they are displayed.
+        self.current_articles = []
+
+        self.lock = threading.RLock()
+
+    # Method is used to split the name of a file in the archive.
+    def split_file_name(self, file_name):
+        """This method returns the date, news source and sort of a file in the archive, Archive/<date>/<source>-<sort>.json."""
+
+        return ArchiveFormat.split_source_file_name(file_name)
+
+    # Method is used to find the signature of a file.
+    def file_signature(self, file_name):
+        """This method returns the signature of a file, which changes whenever the file changes. An OSError is
+           raised if the file does not exist."""
+
+        if self.database is not None:
+            signature = self.database.source_signature(*self.split_file_name(file_name))
+            if signature is None:
+                raise OSError("Not In Database: " + file_name)
+            return signature
+
+        status = os.stat(file_name)
+        return (status.st_mtime_ns, status.st_size)
+
+    # Method is used to read the records of a file.
+    def read_records(self, file_name):
+        """This method returns the records of a file, the records of a line-delimited file are read one at a time."""
+
+        if self.database is not None:
+            return self.database.source_articles(*self.split_file_name(file_name))
+
+        return ArchiveFormat.iter_records(file_name)
+
+    # Method is used to replace the articles of a file.
+    def replace_articles(self, file_name, signature, records, source):
+        """This method replaces the articles kept for a file with the articles of the records and returns them."""
+
+        with self.lock:
+            entry = self.files.get(file_name)
+            articles = [Article.from_record(record, source) for record in records]
+            if entry is not None:
+                for article in entry[1]:
+                    if self.articles.get(article.id) is article:
+                        del self.articles[article.id]
+            for article in articles:
+                self.articles[article.id] = article
+            self.files[file_name] = (signature, articles)
+            return articles
+
+    # Method is used to load the articles of a single file.
+    def load_file(self, file_name, source = None):
+        """This method returns the articles of a file of the archive. The file is only read if it has changed since it
+           was last read. An OSError is raised if the file does not exist."""
+
+        file_name = os.path.abspath(file_name)
+        with self.lock:
+            entry = self.files.get(file_name)
+            signature = self.file_signature(file_name)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+
+            # The file is read and the articles it replaces are removed.
+            return self.replace_articles(file_name, signature, self.read_records(file_name), source)
+
+    # Method is used to add the articles of a file which has just been written.
+    def store_records(self, file_name, records, source = None):
+        """This method keeps the records of a file which has just been written, so the file does not need to be
+           read again. The articles of the records are returned."""
+
+        file_name = os.path.abspath(file_name)
+        with self.lock:
+            return self.replace_articles(file_name, self.file_signature(file_name), records, source)
+
+    # Method is used to list the files of a directory.
+    def list_files(self, directory, recursive = False):
+        """This method returns the names of the files of the archive in the directory, including the sub-directories if
+           recursive is True. If the store has a database, the news sources stored in the database are listed."""
+
+        directory = os.path.abspath(directory)
+        if self.database is not None:
+            if recursive:
+                return [os.path.join(directory, day, source + "-" + sort + ".json") for day, source, sort in self.database.list_sources()]
+            return [os.path.join(directory, source + "-" + sort + ".json")
+                    for day, source, sort in self.database.list_sources(os.path.basename(directory))]
+
+        if recursive:
+            walk = os.walk(directory)
+        else:
+            walk = [(directory, [], os.listdir(directory))] if os.path.isdir(directory) else []
+        return [os.path.join(path, file_name) for path, directories, file_names in walk for file_name in file_names
+                if ArchiveFormat.is_source_file(file_name)]
+
+    # Method is used to load the articles of many news sources.
+    def load(self, directory, news_sources, sort_by_var):
+        """This method loads the articles of each news source in the directory. The articles are returned
+           and kept as the current articles. The names of files which could not be loaded are also returned."""
+
+        articles = []
+        missing_files = []
+        for news_source in news_sources:
+            if self.database is not None:
+                file_name = ArchiveFormat.source_file_name(directory, news_source, sort_by_var)
+            else:
+                file_name = ArchiveFormat.find_source_file(directory, news_source, sort_by_var)
+            try:
+                articles.extend(self.load_file(file_name, news_source))
+            except (OSError, ValueError, KeyError, TypeError):
+                missing_files.append(os.path.basename(file_name))
+
+        with self.lock:
+            self.current_articles = articles
+        return articles, missing_files
+
+    # Method is used to keep articles which do not belong to a loaded file.
+    def add_articles(self, articles):
+        """This method keeps articles read from elsewhere, such as the articles decoded from an archive index, so
+           they can be found by ID."""
+
+        with self.lock:
+            for article in articles:
+                self.articles.setdefault(article.id, article)
+
+    # Method is used to find an article by its ID.
+    def get(self, article_id):
+        """This method returns the article with the ID, None is returned if the article is not in the store."""
+
+        with self.lock:
+            return self.articles.get(article_id)
@@ -0,0 +1,97 @@
+
+# Importing the Python modules, the dependencies of atomic file writes.
+import os
+import threading
+import contextlib
+
+# A lock file is locked with fcntl on POSIX systems and with msvcrt on Windows.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Function is used to open a file which is written atomically.
+@contextlib.contextmanager
+def atomic_writer(file_name):
+    """This function opens a temporary file next to the file for writing bytes, it is renamed over the file
+       once the with block has finished. A reader sees either the old or the new file, never a partially
+       written one, even if the writer is stopped half way. The temporary file is removed if the write fails."""
+
+    directory = os.path.dirname(file_name)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+    temporary_name = file_name + ".tmp" + str(threading.get_ident())
+    try:
+        with open(temporary_name, "wb") as temporary_file:
+            yield temporary_file
+        os.replace(temporary_name, file_name)
+    except BaseException:
+        try:
+            os.remove(temporary_name)
+        except OSError:
+            pass
+        raise
+
+# Function is used to write a file atomically.
+def write_atomic(file_name, data):
+    """This function writes the data, text or bytes, to the file atomically."""
+
+    if not isinstance(data, bytes):
+        data = data.encode("utf-8")
+    with atomic_writer(file_name) as temporary_file:
+        temporary_file.write(data)
+
+# Class for a lock shared by processes.
+class FileLock:
+    """The FileLock is a lock held on a lock file, so it is shared by every process using the same lock file, and
+       by the threads of a process using the same FileLock. It is used with the with statement, the lock is waited
+       for on entry and released on exit."""
+
+    def __init__(self, file_name):
+        """The initiation/constructor method for the FileLock class. The lock file is created if it does not exist."""
+
+        self.file_name = file_name
+        self.lock = threading.Lock()
+        self.lock_file = None
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            directory = os.path.dirname(self.file_name)
+            if directory:
+                os.makedirs(directory, exist_ok = True)
+            self.lock_file = open(self.file_name, "a+b")
+            if fcntl is not None:
+                fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX)
+            elif msvcrt is not None:
+                # The first byte is locked, msvcrt gives up after ten seconds so it is asked again.
+                self.lock_file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+        except BaseException:
+            if self.lock_file is not None:
+                self.lock_file.close()
+                self.lock_file = None
+            self.lock.release()
+            raise
+        return self
+
+    def __exit__(self, *exception):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                self.lock_file.seek(0)
+                msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.lock_file.close()
+            self.lock_file = None
+            self.lock.release()
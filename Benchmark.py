@@ -0,0 +1,240 @@
+
+# Importing the Python modules, the dependencies of the benchmark.
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from MockNewsAPI import MockNewsAPI
+from FetchEngine import FetchEngine
+from ArticleStore import ArticleStore
+from SearchIndex import SearchIndex
+from SaveEngine import SaveEngine, save_modes
+from PageStore import PageStore
+from Instrumentation import metrics
+
+# Main algorithm.
+def main(arguments = None):
+    """The main algorithm of the benchmark. The fetch, save, filter and render paths of the application are
+       run against a local MockNewsAPI for each number of news sources, and the results are written as JSON,
+       for example:
+
+           python -m Benchmark --sources 4 40 140 --latency 0.05 --output benchmark.json
+
+       The save stage is run in each save mode, the modes which parse web pages need BeautifulSoup and the
+       render stage needs PyQt5, they are skipped if these are not installed. Each result contains the throughput, the p50 and p99 latency and the peak RSS of the process.
+       The metrics counted by the instrumentation of the application during the whole run are added to the report.
+
+       The fetch, save and filter stages call the FetchEngine, SaveEngine and SearchIndex that SearchArticlesThread,
+       SaveArticlesThread and the "Filter" button use, without the threads. The QThread start, the signals sent
+       to the GUI and the queued slots are not measured, as they need a running GUI."""
+
+    parser = argparse.ArgumentParser(prog = "Benchmark", description = "Measures NewsFeed against a local mock of News API.")
+    parser.add_argument("--sources", type = int, nargs = "+", default = [4, 40, 140], help = "The numbers of news sources to measure.")
+    parser.add_argument("--latency", type = float, default = 0.05, help = "The latency of the mock server in seconds.")
+    parser.add_argument("--jitter", type = float, default = 0.02, help = "The random variation of the latency in seconds.")
+    parser.add_argument("--articles", type = int, default = 20, help = "The number of articles of each news source.")
+    parser.add_argument("--page-size", type = int, default = 20000, help = "The size of the web page of each article in bytes.")
+    parser.add_argument("--error-rate", type = float, default = 0.0, help = "The fraction of requests answered with an error.")
+    parser.add_argument("--save-articles", type = int, default = 100, help = "The maximum number of articles saved in the save stage.")
+    parser.add_argument("--save-modes", nargs = "+", choices = save_modes, default = list(save_modes), help = "The save modes measured in the save stage.")
+    parser.add_argument("--parse-processes", type = int, default = None, help = "The number of processes parsing web pages, one for each core if none is given.")
+    parser.add_argument("--html-parser", default = None, help = "The parser backend of BeautifulSoup, lxml is used if it is installed.")
+    parser.add_argument("--max-requests", type = int, default = 8, help = "The maximum number of URL requests in flight at once.")
+    parser.add_argument("--output", help = "The file the results are written to, they are printed if none is given.")
+    arguments = parser.parse_args(arguments)
+
+    mock = MockNewsAPI(arguments.latency, arguments.jitter, arguments.articles, arguments.page_size, arguments.error_rate).start()
+    results = []
+    try:
+        for number_of_sources in arguments.sources:
+            results.extend(run_benchmark(mock, number_of_sources, arguments))
+    finally:
+        mock.stop()
+
+    report = {"Settings": vars(arguments), "Python": sys.version.split()[0], "Results": results, "Metrics": metrics.snapshot()}
+    output = json.dumps(report, indent = 4)
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            output_file.write(output)
+    else:
+        print(output)
+    return 0
+
+# Function is used to find the peak memory of the process.
+def peak_rss_kb():
+    """This function returns the peak resident set size of the process in kilobytes, None is returned if it
+       cannot be measured on this system."""
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak = peak // 1024
+    return peak
+
+# Function is used to find a percentile of a list of timings.
+def percentile(timings, fraction):
+    """This function returns the percentile of the timings in milliseconds, None is returned if there are none."""
+
+    if not timings:
+        return None
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return round(ordered[index] * 1000, 3)
+
+# Function is used to create a result.
+def result(stage, number_of_sources, items, seconds, timings, **extra):
+    """This function returns the result of a stage of the benchmark as a dictionary."""
+
+    measurement = {"Stage": (stage), "Sources": (number_of_sources), "Items": (items), "Seconds": (round(seconds, 4)),
+                   "Throughput": (round(items / seconds, 2) if seconds > 0 else None),
+                   "P50 ms": (percentile(timings, 0.50)), "P99 ms": (percentile(timings, 0.99)), "Peak RSS KB": (peak_rss_kb())}
+    measurement.update(extra)
+    return measurement
+
+# Function is used to time each call of a method.
+def timed(function, timings):
+    """This function returns a function which calls the function and appends the time it took to the timings."""
+
+    def timed_function(*arguments, **keyword_arguments):
+        start_time = time.perf_counter()
+        try:
+            return function(*arguments, **keyword_arguments)
+        finally:
+            timings.append(time.perf_counter() - start_time)
+    return timed_function
+
+# Function is used to run the benchmark for a number of news sources.
+def run_benchmark(mock, number_of_sources, arguments):
+    """This function runs every stage of the benchmark for the number of news sources and returns the results."""
+
+    results = []
+    news_sources = ["source-" + str(number) for number in range(number_of_sources)]
+    directory = tempfile.mkdtemp(prefix = "NewsFeedBenchmark")
+    day_directory = os.path.join(directory, "Archive", "28Dec2017")
+    os.makedirs(day_directory)
+
+    try:
+        # Fetch stage, the news sources are collected as by the SearchArticlesThread.
+        fetch_engine = FetchEngine("benchmark", arguments.max_requests, arguments.max_requests, base_url = mock.base_url())
+        request_timings = []
+        fetch_engine.send_request = timed(fetch_engine.send_request, request_timings)
+        articles = []
+        failed = 0
+        start_time = time.perf_counter()
+        for news_source, formatted_articles in fetch_engine.fetch_sources(news_sources, "top", day_directory):
+            if formatted_articles is None:
+                failed = failed + 1
+            else:
+                articles.extend(formatted_articles)
+        results.append(result("fetch", number_of_sources, number_of_sources, time.perf_counter() - start_time, request_timings,
+                              Articles = len(articles), Failed = failed, Requests = len(request_timings)))
+
+        # Save stage, the web pages of the articles are saved as by the SaveArticlesThread.
+        for save_mode in arguments.save_modes:
+            results.append(save_stage(number_of_sources, articles[:arguments.save_articles], directory, save_mode, arguments))
+
+        # Filter stage, the archive is indexed and searched as by the "Filter" button.
+        article_store = ArticleStore()
+        search_index = SearchIndex(article_store)
+        start_time = time.perf_counter()
+        search_index.index_directory(os.path.join(directory, "Archive"), recursive = True)
+        index_seconds = time.perf_counter() - start_time
+        queries = ["markets", "elections OR markets", "\"story 1\"", "source-0 story", "missing"]
+        query_timings = []
+        search = timed(search_index.search, query_timings)
+        start_time = time.perf_counter()
+        for repeat in range(20):
+            for query in queries:
+                search(query)
+        results.append(result("filter", number_of_sources, len(query_timings), time.perf_counter() - start_time, query_timings,
+                              **{"Index Seconds": round(index_seconds, 4), "Indexed Articles": len(search_index.documents)}))
+
+        # Render stage, the articles are displayed as by the display methods of the GUI.
+        results.append(render_stage(number_of_sources, article_store.load(day_directory, news_sources, "top")[0]))
+    finally:
+        shutil.rmtree(directory, ignore_errors = True)
+    return results
+
+# Function is used to measure saving articles offline.
+def save_stage(number_of_sources, articles, directory, save_mode, arguments):
+    """This function saves the articles to a PageStore with the SaveEngine in the save mode and returns the
+       result, with the parse time of each web page, the bytes downloaded, the bytes saved by parsing and the
+       bytes of the compressed blobs the web pages are stored in. The Page Ratio is the size of the saved web
+       pages over the size of the downloaded web pages, it is above 1 if parsing made them larger, as the
+       rewrite mode can. The Bytes Saved are then 0. The stage is skipped if the save mode parses web pages
+       and BeautifulSoup is not installed."""
+
+    try:
+        save_engine = SaveEngine(arguments.max_requests, max_connections_per_host = arguments.max_requests,
+                                 save_mode = save_mode, parser = arguments.html_parser, parse_processes = arguments.parse_processes)
+    except ImportError as error:
+        return {"Stage": "save", "Sources": number_of_sources, "Save Mode": save_mode, "Skipped": str(error)}
+
+    page_store = PageStore(os.path.join(directory, "Pages-" + save_mode))
+    download_timings = []
+    parse_timings = []
+    downloaded = []
+
+    # The size of every downloaded web page is counted.
+    def download(article, download = save_engine.download):
+        web_page = download(article)
+        downloaded.append(len(web_page))
+        return web_page
+    save_engine.download = timed(download, download_timings)
+    save_engine.parse_timings = parse_timings
+
+    failed = 0
+    start_time = time.perf_counter()
+    for article, error in save_engine.save_articles(articles, page_store):
+        if error is not None:
+            failed = failed + 1
+    statistics = page_store.statistics()
+    return result("save", number_of_sources, len(articles), time.perf_counter() - start_time, download_timings, Failed = failed,
+                  **{"Save Mode": save_mode, "Parser": (save_engine.parser if save_mode != "raw" else None),
+                     "Parse Processes": (save_engine.parse_processes if save_engine.use_processes(len(articles)) else 0),
+                     "Parse P50 ms": percentile(parse_timings, 0.50), "Parse P99 ms": percentile(parse_timings, 0.99),
+                     "Downloaded Bytes": sum(downloaded), "Page Bytes": statistics["Page Bytes"],
+                     "Bytes Saved": max(0, sum(downloaded) - statistics["Page Bytes"]),
+                     "Page Ratio": (round(statistics["Page Bytes"] / sum(downloaded), 4) if sum(downloaded) else None), "Blobs": statistics["Blobs"],
+                     "Stored Bytes": statistics["Stored Bytes"]})
+
+# Function is used to measure displaying articles.
+def render_stage(number_of_sources, articles):
+    """This function displays the articles in a QTextBrowser as the GUI does and returns the result. The time
+       to first paint is the time taken by render_articles, the total time includes appending the remaining
+       articles a page at a time. The p50 and p99 are of the first paint and of every page appended, the
+       longest time the GUI thread is blocked. The stage is skipped if PyQt5 is not installed."""
+
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication, QTextBrowser
+        from NewsFeed import MainWindow
+    except ImportError as error:
+        return {"Stage": "render", "Sources": number_of_sources, "Skipped": str(error)}
+
+    application = QApplication.instance() or QApplication([])
+    MainWindow.Textbox = QTextBrowser()
+    append_timings = []
+    append_articles = MainWindow.append_articles
+    MainWindow.append_articles = timed(append_articles, append_timings)
+    try:
+        start_time = time.perf_counter()
+        MainWindow.render_articles(articles)
+        first_paint = time.perf_counter() - start_time
+        while MainWindow.pending_articles:
+            application.processEvents()
+        seconds = time.perf_counter() - start_time
+    finally:
+        MainWindow.append_articles = append_articles
+    return result("render", number_of_sources, len(articles), seconds, [first_paint] + append_timings,
+                  **{"First Paint ms": round(first_paint * 1000, 3), "Pages Appended": len(append_timings),
+                     "Longest Append ms": (round(max(append_timings) * 1000, 3) if append_timings else None)})
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+
+# Importing the Python modules, the dependencies of cooperative cancellation.
+import threading
+
+# Class for the error raised once an operation has been cancelled.
+class CancelledError(Exception):
+    """The CancelledError is raised by work which stops because its cancellation token was cancelled."""
+
+# Class for the cancellation token.
+class CancellationToken:
+    """The CancellationToken is shared by a thread and the work it starts, so the work can be asked to stop
+       instead of being killed. The work checks the token between requests and stops by itself, so files are
+       never left half written. Callbacks added to the token are called once it is cancelled, they are used to
+       interrupt requests in flight."""
+
+    def __init__(self):
+        """The initiation/constructor method for the CancellationToken class."""
+
+        self.event = threading.Event()
+        self.callbacks = []
+        self.lock = threading.Lock()
+
+    # Method is used to cancel the token.
+    def cancel(self):
+        """This method cancels the token and calls its callbacks, it may be called from any thread."""
+
+        with self.lock:
+            if self.event.is_set():
+                return
+            self.event.set()
+            callbacks = list(self.callbacks)
+        for callback in callbacks:
+            callback()
+
+    # Method is used to check if the token has been cancelled.
+    def cancelled(self):
+        """This method returns True if the token has been cancelled."""
+
+        return self.event.is_set()
+
+    # Method is used to stop work once the token has been cancelled.
+    def check(self):
+        """This method raises a CancelledError if the token has been cancelled."""
+
+        if self.event.is_set():
+            raise CancelledError("Cancelled")
+
+    # Method is used to wait without ignoring the token.
+    def sleep(self, seconds):
+        """This method waits for the number of seconds, a CancelledError is raised as soon as the token is cancelled."""
+
+        if self.event.wait(seconds):
+            raise CancelledError("Cancelled")
+
+    # Method is used to add a callback.
+    def add_callback(self, callback):
+        """This method adds a callback which is called once the token is cancelled. The callback is called at
+           once if the token has already been cancelled."""
+
+        with self.lock:
+            if not self.event.is_set():
+                self.callbacks.append(callback)
+                return
+        callback()
+
+    # Method is used to remove a callback.
+    def remove_callback(self, callback):
+        """This method removes a callback added to the token."""
+
+        with self.lock:
+            if callback in self.callbacks:
+                self.callbacks.remove(callback)
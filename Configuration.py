@@ -0,0 +1,235 @@
+
+# Importing the Python modules, the dependencies of the configuration.
+import os
+import ast
+import json
+import threading
+from AtomicFile import write_atomic
+import ArchiveFormat
+
+# The tomllib module is part of the standard library from Python 3.11, the tomli module is used before then if it is
+# installed. TOML configuration files can only be read if one of them is.
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+"""The modes web pages are saved in: as downloaded ("raw"), rewritten by BeautifulSoup ("rewrite"), or with only
+   the headline, byline, main images and main text of the article extracted ("extract"). They are kept here rather
+   than in SaveEngine, so loading the configuration does not import BeautifulSoup and multiprocessing."""
+save_modes = ("raw", "rewrite", "extract")
+
+"""The names of the configuration file in the order they are looked for in the working directory."""
+configuration_file_names = ["Config.toml", "Config.json", "Config.txt"]
+
+"""The names of the types of the settings, as they are shown in errors."""
+type_names = {str: "A String", int: "An Integer", float: "A Number", bool: "True Or False", list: "A List"}
+
+# Class for the error raised when a configuration file cannot be used.
+class ConfigurationError(ValueError):
+    """The ConfigurationError is raised when a configuration file cannot be read or a setting of it is not valid.
+       The message lists every setting which is not valid."""
+
+# Class for a setting of the configuration file.
+class Setting:
+    """A Setting is a key of the configuration file with its type and default value. A number may be limited
+       to a minimum and maximum, and a value to a list of choices. A setting which is optional may be None."""
+
+    def __init__(self, value_type, default, minimum = None, maximum = None, choices = None, optional = False):
+        """The initiation/constructor method for the Setting class."""
+
+        self.value_type = value_type
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.choices = choices
+        self.optional = optional
+
+    # Method is used to check the value of a setting.
+    def check(self, key, value):
+        """This method returns the value of the setting, an integer is accepted for a float. A ConfigurationError
+           is raised if the value is not valid."""
+
+        if value is None and self.optional:
+            return None
+        if self.value_type is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, self.value_type) or (isinstance(value, bool) and self.value_type is not bool):
+            raise ConfigurationError(key + " Must Be " + type_names[self.value_type] + ("" if not self.optional else " Or None") + ", Not " + repr(value))
+        if self.minimum is not None and value < self.minimum:
+            raise ConfigurationError(key + " Must Be At Least " + str(self.minimum) + ", Not " + repr(value))
+        if self.maximum is not None and value > self.maximum:
+            raise ConfigurationError(key + " Must Be At Most " + str(self.maximum) + ", Not " + repr(value))
+        if self.choices is not None and value not in self.choices:
+            raise ConfigurationError(key + " Must Be One Of " + ", ".join(self.choices) + ", Not " + repr(value))
+        if self.value_type is list and not all(isinstance(item, str) for item in value):
+            raise ConfigurationError(key + " Must Be A List Of Strings")
+        return value
+
+"""The settings of the configuration file. The performance settings may be changed while the application is
+   running, the configuration file is watched and loaded again once it has changed."""
+settings = {"APIKEY": (Setting(str, "")),
+            "Sources": (Setting(list, ["bbc-news", "daily-mail", "cnn", "mirror"])),
+            "MaxConcurrentRequests": (Setting(int, 8, 1, 256)),
+            "MaxRequestsPerHost": (Setting(int, 8, 1, 256)),
+            "SourcesPerRequest": (Setting(int, 20, 1, 20)),
+            "ArticlesPerSource": (Setting(int, 20, 1, 100)),
+            "IncrementalLatest": (Setting(bool, True)),
+            "IncrementalDisplay": (Setting(bool, True)),
+            "MaxParsers": (Setting(int, 2, 1, 64)),
+            "ParseProcesses": (Setting(int, None, 0, 64, optional = True)),
+            "SaveMode": (Setting(str, "raw", choices = list(save_modes))),
+            "HtmlParser": (Setting(str, None, optional = True)),
+            "CacheSize": (Setting(int, 256 * 1024 * 1024, 0)),
+            "StorageBackend": (Setting(str, "json", choices = ["json", "sqlite"])),
+            "ArchiveFormat": (Setting(str, "json", choices = sorted(ArchiveFormat.archive_formats))),
+            "ConnectTimeout": (Setting(float, 5.0, 0.1)),
+            "ReadTimeout": (Setting(float, 20.0, 0.1)),
+            "MaxAttempts": (Setting(int, 3, 1, 20)),
+            "RequestsPerSecond": (Setting(float, 5.0, 0.01)),
+            "RequestBurst": (Setting(int, 10, 1)),
+            "DailyQuota": (Setting(int, 1000, 0, optional = True)),
+            "SourceCatalogueTTL": (Setting(float, 7 * 24 * 60 * 60.0, 0)),
+            "PollInterval": (Setting(float, 0.0, 0)),
+            "ReloadInterval": (Setting(float, 2.0, 0.1)),
+            "TraceFile": (Setting(str, None, optional = True)),
+            "MetricsPort": (Setting(int, None, 1, 65535, optional = True))}
+
+# Function is used to find the configuration file.
+def configuration_file(directory):
+    """This function returns the name of the configuration file in the directory, the first of Config.toml,
+       Config.json and Config.txt which exists. Config.txt is returned if there is none."""
+
+    for file_name in configuration_file_names:
+        if os.path.exists(os.path.join(directory, file_name)):
+            return os.path.join(directory, file_name)
+    return os.path.join(directory, configuration_file_names[-1])
+
+# Function is used to read a configuration file.
+def read_configuration_file(file_name):
+    """This function reads the settings of a configuration file as a dictionary. A .toml file is read as TOML
+       and a .json file as JSON. Config.txt is read as JSON, or as a Python literal as it was written by older
+       versions, its contents are never run as code. A ConfigurationError is raised if the file cannot be read."""
+
+    try:
+        with open(file_name, "rb") as configuration_file:
+            data = configuration_file.read()
+    except OSError as error:
+        raise ConfigurationError("Configuration File Not Read: " + str(error))
+
+    try:
+        if file_name.endswith(".toml"):
+            if tomllib is None:
+                raise ConfigurationError("Python 3.11 Or tomli Is Needed To Read " + os.path.basename(file_name))
+            file_data = tomllib.loads(data.decode("utf-8"))
+        elif file_name.endswith(".json"):
+            file_data = json.loads(data.decode("utf-8"))
+        else:
+            try:
+                file_data = json.loads(data.decode("utf-8"))
+            except ValueError:
+                file_data = ast.literal_eval(data.decode("utf-8"))
+    except ConfigurationError:
+        raise
+    except (ValueError, SyntaxError, MemoryError, RecursionError) as error:
+        raise ConfigurationError("Configuration File Not Valid: " + os.path.basename(file_name) + ": " + str(error))
+
+    if not isinstance(file_data, dict):
+        raise ConfigurationError("Configuration File Not Valid: " + os.path.basename(file_name) + " Must Contain A Dictionary")
+    return file_data
+
+# Function is used to check the settings of a configuration file.
+def validate_configuration(file_data):
+    """This function returns the settings of the configuration file with the default value of every setting
+       which is not given. A ConfigurationError listing every unknown or invalid setting is raised if any are."""
+
+    configuration = {}
+    errors = []
+    for key in file_data:
+        if key not in settings:
+            errors.append("Unknown Setting: " + str(key))
+    for key, setting in settings.items():
+        try:
+            configuration[key] = setting.check(key, file_data.get(key, setting.default))
+        except ConfigurationError as error:
+            errors.append(str(error))
+    if errors:
+        raise ConfigurationError("; ".join(errors))
+    return configuration
+
+# Function is used to load a configuration file.
+def load_configuration(file_name):
+    """This function reads and checks the configuration file and returns its settings, with the default value
+       of every setting which is not given. A ConfigurationError is raised if it cannot be used."""
+
+    return validate_configuration(read_configuration_file(file_name))
+
+# Function is used to create a configuration file.
+def create_configuration_file(file_name):
+    """This function writes a configuration file with the default news sources and no API key as JSON."""
+
+    write_atomic(file_name, json.dumps({"APIKEY": (""), "Sources": (settings["Sources"].default)}, indent = 4))
+
+# Class for the watcher of the configuration file.
+class ConfigurationWatcher:
+    """The ConfigurationWatcher notices when the configuration file has been changed, by the time it was
+       modified and its size, so it can be loaded again while the application is running. A configuration
+       file added to the directory with a name looked for before the current one is used from then on."""
+
+    def __init__(self, directory, interval = 2.0):
+        """The initiation/constructor method for the ConfigurationWatcher class. The file is checked every
+           interval seconds once watching has started."""
+
+        self.directory = directory
+        self.interval = interval
+        self.file_name = configuration_file(directory)
+        self.signature = self.file_signature()
+
+    # Method is used to find the signature of the configuration file.
+    def file_signature(self):
+        """This method returns the name, modification time and size of the configuration file, None is
+           returned if it does not exist."""
+
+        try:
+            status = os.stat(self.file_name)
+        except OSError:
+            return None
+        return (self.file_name, status.st_mtime_ns, status.st_size)
+
+    # Method is used to check if the configuration file has changed.
+    def poll(self):
+        """This method returns the settings of the configuration file if it has changed since it was last
+           polled, None is returned if it has not. A ConfigurationError is raised if it has changed and cannot
+           be used, the file is not loaded again until it changes once more."""
+
+        self.file_name = configuration_file(self.directory)
+        signature = self.file_signature()
+        if signature == self.signature or signature is None:
+            return None
+        self.signature = signature
+        return load_configuration(self.file_name)
+
+    # Method is used to watch the configuration file in a thread.
+    def start(self, callback, error_callback = None):
+        """This method starts a daemon thread which calls callback with the settings every time the
+           configuration file has changed, and error_callback with the ConfigurationError if it cannot be
+           used. The event returned stops the thread once it is set."""
+
+        stop_event = threading.Event()
+
+        def watch():
+            while not stop_event.wait(self.interval):
+                try:
+                    configuration = self.poll()
+                except ConfigurationError as error:
+                    if error_callback is not None:
+                        error_callback(error)
+                    continue
+                if configuration is not None:
+                    callback(configuration)
+
+        threading.Thread(target = watch, name = "ConfigurationWatcher", daemon = True).start()
+        return stop_event
@@ -0,0 +1,232 @@
+
+# Importing the Python modules, the dependencies of the connection pool.
+import ssl
+import time
+import socket
+import threading
+import http.client
+import urllib.parse
+
+# Class for the error raised once the connectivity check has failed.
+class NotConnectedError(ConnectionError):
+    """The NotConnectedError is raised instead of making a request once the first request has failed to reach the server."""
+
+# Class for the pool of keep-alive connections.
+class ConnectionPool:
+    """The ConnectionPool keeps HTTP connections open once a request has finished, so that the next request
+       to the same host reuses the connection instead of making a new TCP and TLS handshake."""
+
+    """The number of redirects followed before a request is abandoned."""
+    max_redirects = 5
+
+    def __init__(self, max_connections_per_host = 4, timeout = 30, connect_timeout = None):
+        """The initiation/constructor method for the ConnectionPool class. The timeout is the number of seconds
+           to wait for the server to send data, the connect_timeout is the number of seconds to wait for a new
+           connection to be made and is the same as the timeout if it is not given."""
+
+        self.max_connections_per_host = max(1, int(max_connections_per_host))
+        self.timeout = timeout
+        self.connect_timeout = (connect_timeout if connect_timeout is not None else timeout)
+
+        # Idle connections and the semaphores limiting connections are kept for every host.
+        self.idle_connections = {}
+        self.host_semaphores = {}
+        self.lock = threading.Lock()
+
+        # Connections with a request in flight, so the requests can be interrupted.
+        self.active_connections = set()
+
+        # The first request made is the connectivity check, None until it has finished.
+        self.connected = None
+
+        # The TLS context of HTTPS connections, the TLS handshake is made by the pool so it can be timed.
+        self.ssl_context = ssl.create_default_context()
+        self.ssl_context.set_alpn_protocols(["http/1.1"])
+
+    # Method is used to find the semaphore of a host.
+    def host_semaphore(self, key):
+        """This method returns the semaphore which limits the number of connections open to a host."""
+
+        with self.lock:
+            if key not in self.host_semaphores:
+                self.host_semaphores[key] = threading.BoundedSemaphore(self.max_connections_per_host)
+            return self.host_semaphores[key]
+
+    # Method is used to take a connection from the pool.
+    def get_connection(self, key, timings = None):
+        """This method returns an idle connection to the host, a new connection is made if there are none.
+           The second value returned is True if the connection has been used before. The seconds taken to look
+           up the address of the host, to connect and to make the TLS handshake of a new connection are added to
+           timings as "DNS", "Connect" and "TLS" if it is a dictionary."""
+
+        with self.lock:
+            idle = self.idle_connections.get(key)
+            if idle:
+                return idle.pop(), True
+
+        # The connection is made with the connect timeout, afterwards the read timeout is used.
+        scheme, host = key
+        if scheme == "https":
+            connection = http.client.HTTPSConnection(host, timeout = self.connect_timeout, context = self.ssl_context)
+        else:
+            connection = http.client.HTTPConnection(host, timeout = self.connect_timeout)
+        timings = (timings if timings is not None else {})
+        start_time = time.perf_counter()
+        addresses = socket.getaddrinfo(connection.host, connection.port, 0, socket.SOCK_STREAM)
+        timings["DNS"] = time.perf_counter() - start_time
+
+        # Every address of the host is tried in turn, as by socket.create_connection.
+        start_time = time.perf_counter()
+        sock = None
+        error = OSError("No Address Found For " + host)
+        for family, socket_type, protocol, canonical_name, address in addresses:
+            try:
+                sock = socket.socket(family, socket_type, protocol)
+                sock.settimeout(self.connect_timeout)
+                sock.connect(address)
+                break
+            except OSError as connect_error:
+                error = connect_error
+                if sock is not None:
+                    sock.close()
+                sock = None
+        if sock is None:
+            raise error
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        timings["Connect"] = time.perf_counter() - start_time
+
+        if scheme == "https":
+            start_time = time.perf_counter()
+            try:
+                sock = self.ssl_context.wrap_socket(sock, server_hostname = connection.host)
+            except OSError:
+                sock.close()
+                raise
+            timings["TLS"] = time.perf_counter() - start_time
+        sock.settimeout(self.timeout)
+        connection.sock = sock
+        return connection, False
+
+    # Method is used to return a connection to the pool.
+    def put_connection(self, key, connection):
+        """This method returns a connection to the pool so it can be reused."""
+
+        with self.lock:
+            self.idle_connections.setdefault(key, []).append(connection)
+
+    # Method is used to send a request over a connection and read the response.
+    def send(self, connection, path, headers, timings = None):
+        """This method sends a GET request for the path over the connection and returns the server response and
+           its body. The connection is active while the request is in flight, so abort can interrupt it. The
+           seconds until the first byte of the server response and to download its body, and the size of the
+           body, are added to timings as "TTFB", "Download" and "Bytes" if it is a dictionary."""
+
+        timings = (timings if timings is not None else {})
+        with self.lock:
+            self.active_connections.add(connection)
+        try:
+            start_time = time.perf_counter()
+            connection.request("GET", path, headers = headers)
+            server_response = connection.getresponse()
+            timings["TTFB"] = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            body = server_response.read()
+            timings["Download"] = time.perf_counter() - start_time
+            timings["Bytes"] = timings.get("Bytes", 0) + len(body)
+            return server_response, body
+        finally:
+            with self.lock:
+                self.active_connections.discard(connection)
+
+    # Method is used to make a single request over a pooled connection.
+    def request_once(self, url, headers, timings = None):
+        """This method makes a single GET request to the URL. The status, headers and body of the server
+           response are returned. The time taken by each phase of the request is added to timings."""
+
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+
+        with self.host_semaphore(key):
+            connection, reused = self.get_connection(key, timings)
+            try:
+                server_response, body = self.send(connection, path, headers, timings)
+            except (http.client.HTTPException, OSError):
+                connection.close()
+
+                # A reused connection may have been closed by the server while idle, the request is made again.
+                if not reused or getattr(connection, "aborted", False):
+                    raise
+                connection, reused = self.get_connection(key, timings)
+                try:
+                    server_response, body = self.send(connection, path, headers, timings)
+                except (http.client.HTTPException, OSError):
+                    connection.close()
+                    raise
+
+            if server_response.will_close:
+                connection.close()
+            else:
+                self.put_connection(key, connection)
+        return server_response.status, server_response.headers, body
+
+    # Method is used to make a request, following redirects.
+    def request_response(self, url, headers = None, timings = None):
+        """This method makes a GET request to the URL, following any redirects. The status, headers and body
+           of the final server response are returned. If the first request made through the pool fails to
+           reach the server, connected is set to False, it is set to True once any server has answered. If
+           timings is a dictionary, the seconds taken to look up the host ("DNS"), connect ("Connect"), make the
+           TLS handshake ("TLS"), receive the first byte ("TTFB") and download the body ("Download") of the last
+           request are added to it, with the bytes downloaded by all requests ("Bytes"). A reused connection
+           has no DNS, Connect or TLS timings."""
+
+        headers = dict(headers or {})
+        headers.setdefault("User-Agent", "NewsFeed/1.0")
+        for redirects in range(ConnectionPool.max_redirects + 1):
+            try:
+                status, response_headers, body = self.request_once(url, headers, timings)
+            except OSError:
+                if self.connected is None:
+                    self.connected = False
+                raise
+            self.connected = True
+            if status in (301, 302, 303, 307, 308) and response_headers.get("Location"):
+                url = urllib.parse.urljoin(url, response_headers["Location"])
+                continue
+            return status, response_headers, body
+        raise OSError("Too Many Redirects: " + url)
+
+    # Method is used to make a request, following redirects.
+    def request(self, url, headers = None):
+        """This method makes a GET request to the URL, following any redirects. The body of the server
+           response is returned. An OSError is raised if the request was not successful."""
+
+        status, response_headers, body = self.request_response(url, headers)
+        if status >= 400:
+            raise OSError("HTTP Error " + str(status) + ": " + url)
+        return body
+
+    # Method is used to interrupt the requests in flight.
+    def abort(self):
+        """This method shuts down the sockets of the connections with a request in flight, so threads waiting
+           for a server response stop waiting at once with an OSError. It may be called from any thread."""
+
+        with self.lock:
+            connections = list(self.active_connections)
+        for connection in connections:
+            connection.aborted = True
+            try:
+                if connection.sock is not None:
+                    connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    # Method is used to close all idle connections.
+    def close(self):
+        """This method closes all idle connections in the pool."""
+
+        with self.lock:
+            for connections in self.idle_connections.values():
+                for connection in connections:
+                    connection.close()
+            self.idle_connections = {}
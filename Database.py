@@ -0,0 +1,158 @@
+
+# Importing the Python modules, the dependencies of the archive database.
+import os
+import sqlite3
+import threading
+import ArchiveFormat
+
+# Class for the SQLite archive.
+class ArchiveDatabase:
+    """The ArchiveDatabase stores the archive in a single SQLite database instead of a directory of JSON files
+       for each date. The articles of a news source are stored under the same date, news source and sort as
+       the JSON file they replace, so the rest of the application can still refer to Archive/<date>/<source>-<sort>.
+       The database is opened in WAL mode, so readers on other threads are not blocked by the thread writing
+       new articles. Every thread uses its own connection."""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS articles (
+            day TEXT NOT NULL,
+            source TEXT NOT NULL,
+            sort TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            id TEXT NOT NULL,
+            title TEXT,
+            description TEXT,
+            author TEXT,
+            published TEXT,
+            url TEXT,
+            PRIMARY KEY (day, source, sort, id)
+        );
+        CREATE INDEX IF NOT EXISTS articles_by_source ON articles (source, sort, day);
+        CREATE INDEX IF NOT EXISTS articles_by_published ON articles (published);
+        CREATE INDEX IF NOT EXISTS articles_by_id ON articles (id);
+        CREATE TABLE IF NOT EXISTS sources (
+            day TEXT NOT NULL,
+            source TEXT NOT NULL,
+            sort TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, source, sort)
+        );
+    """
+
+    def __init__(self, file_name):
+        """The initiation/constructor method for the ArchiveDatabase class. The database is created if it does
+           not exist."""
+
+        self.file_name = file_name
+        directory = os.path.dirname(file_name)
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+        self.local = threading.local()
+        self.connection().executescript(ArchiveDatabase.schema)
+
+    # Method is used to find the connection of the current thread.
+    def connection(self):
+        """This method returns the connection to the database of the current thread, it is opened if the
+           thread has no connection."""
+
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.file_name, timeout = 30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    # Method is used to close the connection of the current thread.
+    def close(self):
+        """This method closes the connection to the database of the current thread."""
+
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    # Method is used to convert articles to rows of the database.
+    def rows(self, day, source, sort, formatted_articles, first_position = 0):
+        """This method returns the rows of the database for the formatted articles of a news source."""
+
+        return [(day, source, sort, first_position + position, article["ID"], article["Title"], article["Description"],
+                 article["Author"], article["Published"], article["URL"]) for position, article in enumerate(formatted_articles)]
+
+    # Method is used to store the articles of a news source.
+    def replace_source(self, day, source, sort, formatted_articles):
+        """This method stores the formatted articles of a news source for the date, replacing any articles
+           stored before. All articles are inserted in a single transaction."""
+
+        connection = self.connection()
+        with connection:
+            connection.execute("DELETE FROM articles WHERE day = ? AND source = ? AND sort = ?", (day, source, sort))
+            connection.executemany("INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   self.rows(day, source, sort, formatted_articles))
+            connection.execute("INSERT INTO sources VALUES (?, ?, ?, 1, ?) ON CONFLICT (day, source, sort) DO UPDATE SET "
+                               "version = version + 1, count = excluded.count", (day, source, sort, len(formatted_articles)))
+
+    # Method is used to find the articles of a news source.
+    def source_articles(self, day, source, sort):
+        """This method returns the formatted articles of a news source for the date, in the order they were stored."""
+
+        cursor = self.connection().execute("SELECT id, title, description, author, published, url FROM articles "
+                                           "WHERE day = ? AND source = ? AND sort = ? ORDER BY position", (day, source, sort))
+        return [{"ID": (row[0]), "Title": (row[1]), "Description": (row[2]), "Author": (row[3]), "Published": (row[4]), "URL": (row[5])}
+                for row in cursor]
+
+    # Method is used to find the version of the articles of a news source.
+    def source_signature(self, day, source, sort):
+        """This method returns a value which changes every time the articles of a news source are stored for the
+           date. None is returned if no articles have been stored."""
+
+        row = self.connection().execute("SELECT version, count FROM sources WHERE day = ? AND source = ? AND sort = ?",
+                                        (day, source, sort)).fetchone()
+        return tuple(row) if row is not None else None
+
+    # Method is used to list the news sources stored.
+    def list_sources(self, day = None):
+        """This method returns a list of tuples of the date, news source and sort of everything stored, only for
+           the date if one is given."""
+
+        if day is None:
+            cursor = self.connection().execute("SELECT day, source, sort FROM sources ORDER BY day, source, sort")
+        else:
+            cursor = self.connection().execute("SELECT day, source, sort FROM sources WHERE day = ? ORDER BY source, sort", (day,))
+        return [tuple(row) for row in cursor]
+
+    # Method is used to find all articles of a news source.
+    def articles_by_source(self, source, published_since = None):
+        """This method returns the formatted articles of a news source across all dates, newest first. Only
+           articles published since the ISO 8601 time published_since are returned if it is given."""
+
+        query = "SELECT id, title, description, author, published, url FROM articles WHERE source = ?"
+        parameters = [source]
+        if published_since is not None:
+            query = query + " AND published >= ?"
+            parameters.append(published_since)
+        cursor = self.connection().execute(query + " ORDER BY published DESC", parameters)
+        return [{"ID": (row[0]), "Title": (row[1]), "Description": (row[2]), "Author": (row[3]), "Published": (row[4]), "URL": (row[5])}
+                for row in cursor]
+
+    # Method is used to import an archive of JSON files.
+    def import_json_archive(self, archive_directory):
+        """This method stores the articles of every <source>-<sort> file in the date directories of an archive
+           of files, in any format of ArchiveFormat. The number of files imported is returned."""
+
+        imported = 0
+        for day in sorted(os.listdir(archive_directory)):
+            day_directory = os.path.join(archive_directory, day)
+            if not os.path.isdir(day_directory):
+                continue
+            for file_name in sorted(os.listdir(day_directory)):
+                day, source, sort = ArchiveFormat.split_source_file_name(os.path.join(day_directory, file_name))
+                if not ArchiveFormat.is_source_file(file_name):
+                    continue
+                try:
+                    self.replace_source(day, source, sort, ArchiveFormat.read_records(os.path.join(day_directory, file_name)))
+                    imported = imported + 1
+                except (OSError, ValueError, KeyError, TypeError):
+                    print("<Database Process: Error: Could Not Import " + os.path.join(day, file_name) + ">")
+        return imported
@@ -0,0 +1,163 @@
+
+# Importing the Python modules, the dependencies of article deduplication.
+import os
+import json
+import hashlib
+import threading
+import urllib.parse
+from AtomicFile import write_atomic
+
+"""Query parameters which only track where a reader came from, they are removed before the ID of an article is made."""
+tracking_parameters = ("fbclid", "gclid", "ocid", "cmpid", "ito", "ns_mchannel", "ns_source", "ns_campaign", "ns_linkname", "ref", "src")
+
+# Function is used to normalize the URL of an article.
+def normalize_url(url):
+    """This function returns the URL of an article in a normal form, so that the same article reached through
+       slightly different URLs has the same ID. The scheme, case of the host, "www.", default ports, fragments,
+       tracking parameters, the order of the query parameters and trailing slashes are ignored."""
+
+    parts = urllib.parse.urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = host + ":" + str(parts.port)
+
+    query = [(name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values = True)
+             if not name.lower().startswith("utm_") and name.lower() not in tracking_parameters]
+    query.sort()
+
+    path = parts.path.rstrip("/") or "/"
+    return urllib.parse.urlunsplit(("https", host, path, urllib.parse.urlencode(query), ""))
+
+# Function is used to create the ID of an article.
+def create_article_id(url, title = None):
+    """This function creates the ID of an article from its normalized URL, the same article always has the
+       same ID. The title is used if the article has no URL."""
+
+    if url:
+        key = normalize_url(url)
+    else:
+        key = "title:" + (title or "")
+    return hashlib.blake2b(key.encode("utf-8"), digest_size = 8).hexdigest()
+
+# Class for the persistent set of article ID's.
+class SeenIndex:
+    """The SeenIndex is a set of article ID's which is kept on disk, one ID per line. It is used to remember
+       which articles have already been archived or saved across runs of the application. New ID's are
+       appended to the file, so the file is never written again from the start."""
+
+    def __init__(self, file_name):
+        """The initiation/constructor method for the SeenIndex class. The ID's in the file are loaded."""
+
+        self.file_name = file_name
+        self.ids = set()
+        self.lock = threading.Lock()
+
+        try:
+            with open(self.file_name, "r") as seen_file:
+                for line in seen_file:
+                    line = line.strip()
+                    if line:
+                        self.ids.add(line)
+        except OSError:
+            pass
+
+    def __contains__(self, article_id):
+        return article_id in self.ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Method is used to add ID's to the index.
+    def add(self, article_ids):
+        """This method adds the ID's to the index and appends the new ID's to the file. The ID's which were
+           not in the index before are returned."""
+
+        with self.lock:
+            new_ids = []
+            for article_id in article_ids:
+                if article_id not in self.ids:
+                    self.ids.add(article_id)
+                    new_ids.append(article_id)
+
+            if new_ids:
+                directory = os.path.dirname(self.file_name)
+                if directory:
+                    os.makedirs(directory, exist_ok = True)
+                with open(self.file_name, "a") as seen_file:
+                    seen_file.write("".join(article_id + "\n" for article_id in new_ids))
+        return new_ids
+
+# Class for the persistent high-water marks of the news sources.
+class HighWaterMarks:
+    """The HighWaterMarks remember the published time of the newest article collected from each news source,
+       so a news source can be polled for the articles published since it was last collected. The published
+       times are ISO 8601 times as sent by News API, such as 2017-12-28T10:00:00Z, and are compared by their
+       first 19 characters. The marks are saved to a file, so they are kept across runs."""
+
+    def __init__(self, file_name = None):
+        """The initiation/constructor method for the HighWaterMarks class. The marks are not saved if no file
+           name is given."""
+
+        self.file_name = file_name
+        self.lock = threading.Lock()
+        self.marks = {}
+        self.load()
+
+    # Method is used to load the marks.
+    def load(self):
+        """This method reads the marks from the file. A mark is kept if the file has an older one, so the marks
+           moved forward by another process using the same archive are merged with those of this process."""
+
+        with self.lock:
+            self.merge_file()
+
+    # Method is used to merge the marks saved in the file.
+    def merge_file(self):
+        """This method merges the marks saved in the file into those of this process, the lock must be held."""
+
+        if self.file_name is None:
+            return
+        try:
+            with open(self.file_name, "r") as marks_file:
+                saved_marks = json.load(marks_file)
+        except (OSError, ValueError):
+            return
+        for news_source, mark in saved_marks.items():
+            if news_source not in self.marks or str(mark)[:19] > self.marks[news_source][:19]:
+                self.marks[news_source] = str(mark)
+
+    # Method is used to find the mark of a news source.
+    def get(self, news_source):
+        """This method returns the published time of the newest article collected from the news source, None
+           is returned if it has not been collected before."""
+
+        with self.lock:
+            return self.marks.get(news_source)
+
+    # Method is used to check if an article is newer than the mark of its news source.
+    def is_new(self, news_source, published):
+        """This method returns True if the article published at the time is not older than the mark of the news
+           source. Articles published in the same second as the mark may not have been collected yet, they are
+           new unless their ID has been seen before. Articles without a published time are always new."""
+
+        mark = self.get(news_source)
+        return mark is None or not published or str(published)[:19] >= mark[:19]
+
+    # Method is used to move the mark of a news source forward.
+    def advance(self, news_source, published_times):
+        """This method moves the mark of the news source forward to the newest of the published times and saves
+           the marks. A mark is never moved back."""
+
+        with self.lock:
+            newest = self.marks.get(news_source)
+            for published in published_times:
+                if published and (newest is None or str(published)[:19] > newest[:19]):
+                    newest = str(published)
+            if newest is None or newest == self.marks.get(news_source):
+                return
+            self.marks[news_source] = newest
+            if self.file_name is not None:
+                self.merge_file()
+                write_atomic(self.file_name, json.dumps(self.marks, indent = 4, sort_keys = True))
@@ -0,0 +1,176 @@
+
+# Importing the Python modules, the dependencies of the article extraction.
+import re
+import html
+import urllib.parse
+
+# BeautifulSoup is optional, articles can only be extracted if it is installed.
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+# The lxml module is optional, it is used as the faster parser backend of BeautifulSoup if it is installed.
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+"""Elements which are never part of the text of an article."""
+removed_tags = ["script", "style", "noscript", "iframe", "form", "nav", "header", "footer", "aside", "button", "input",
+                "select", "svg", "canvas", "template", "object", "embed"]
+
+"""Patterns of the class and ID of elements which are unlikely or likely to hold the text of an article."""
+unlikely_pattern = re.compile(r"comment|sidebar|footer|menu|share|social|promo|advert|banner|sponsor|related|subscribe|newsletter|cookie|popup|modal|\bads?\b|\bad-", re.I)
+likely_pattern = re.compile(r"article|body|content|entry|main|post|story|text", re.I)
+
+"""Elements copied from the text of an article to the extracted document."""
+content_tags = ["h2", "h3", "h4", "p", "blockquote", "pre", "ul", "ol", "img"]
+
+# Function is used to find the parser backend.
+def parser_backend(parser = None):
+    """This function returns the parser backend of BeautifulSoup, lxml if it is installed, otherwise the
+       parser of the Python standard library. A parser may be asked for by its name."""
+
+    if parser:
+        return parser
+    return "lxml" if lxml is not None else "html.parser"
+
+# Function is used to find the weight of the class and ID of an element.
+def class_weight(element):
+    """This function returns the weight of an element given by its class and ID, positive if they are likely to
+       hold the text of an article and negative if they are unlikely to."""
+
+    names = " ".join(element.get("class") or []) + " " + (element.get("id") or "")
+    weight = 0
+    if unlikely_pattern.search(names):
+        weight = weight - 25
+    if likely_pattern.search(names):
+        weight = weight + 25
+    return weight
+
+# Function is used to find the share of the text of an element which is made of links.
+def link_density(element):
+    """This function returns the share of the text of an element which is the text of links, from 0 to 1."""
+
+    text_length = len(element.get_text())
+    if text_length == 0:
+        return 0.0
+    return sum(len(link.get_text()) for link in element.find_all("a")) / text_length
+
+# Function is used to find the element holding the text of an article.
+def main_element(soup):
+    """This function returns the element holding the text of an article, the element scoring the most in the
+       manner of Readability. Every paragraph adds to the score of its parent and, by half, of its grandparent,
+       more for longer paragraphs with more commas. Scores are weighted by the class and ID of the element and
+       reduced by the share of its text made of links."""
+
+    scores = {}
+    elements = {}
+    for paragraph in soup.find_all(["p", "pre", "td"]):
+        text = paragraph.get_text(" ", strip = True)
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(3, len(text) // 100)
+        for ancestor, share in ((paragraph.parent, 1.0), (paragraph.parent.parent if paragraph.parent else None, 0.5)):
+            if ancestor is None or ancestor.name in (None, "[document]"):
+                continue
+            if id(ancestor) not in scores:
+                elements[id(ancestor)] = ancestor
+                scores[id(ancestor)] = float(class_weight(ancestor))
+                if ancestor.name in ("article", "main"):
+                    scores[id(ancestor)] = scores[id(ancestor)] + 10
+            scores[id(ancestor)] = scores[id(ancestor)] + score * share
+
+    if not scores:
+        return soup.body or soup
+    best = max(scores, key = lambda key: scores[key] * (1 - link_density(elements[key])))
+    return elements[best]
+
+# Function is used to read a meta tag.
+def meta_content(soup, *names):
+    """This function returns the content of the first meta tag with one of the names or properties, None is
+       returned if there is none."""
+
+    for name in names:
+        tag = soup.find("meta", attrs = {"property": name}) or soup.find("meta", attrs = {"name": name})
+        if tag is not None and tag.get("content", "").strip():
+            return tag["content"].strip()
+    return None
+
+# Function is used to find the byline of an article.
+def find_byline(soup):
+    """This function returns the byline of an article, from its meta tags or from an element marked as the
+       author or byline. None is returned if there is none."""
+
+    byline = meta_content(soup, "author", "article:author")
+    if byline is not None and not byline.startswith("http"):
+        return byline
+    element = (soup.find(attrs = {"rel": "author"}) or soup.find(attrs = {"itemprop": "author"})
+               or soup.find(class_ = re.compile(r"byline|author", re.I)))
+    if element is not None:
+        text = element.get_text(" ", strip = True)
+        if 0 < len(text) < 100:
+            return text
+    return None
+
+# Function is used to extract the article of a web page.
+def extract_article(web_page, url = None, parser = None):
+    """This function keeps only the headline, byline, main images and main text of the web page of an article
+       and returns them as a small HTML document in bytes. Scripts, styles, navigation, adverts and other
+       boilerplate are dropped. Links of images are made absolute with the url of the web page. The web page
+       is parsed with lxml if it is installed, unless another parser backend is given. An ImportError is raised
+       if BeautifulSoup is not installed."""
+
+    if BeautifulSoup is None:
+        raise ImportError("BeautifulSoup Is Needed To Extract Articles")
+    soup = BeautifulSoup(web_page, parser_backend(parser))
+
+    headline = meta_content(soup, "og:title", "twitter:title")
+    if headline is None:
+        heading = soup.find("h1")
+        headline = heading.get_text(" ", strip = True) if heading is not None else (soup.title.get_text(strip = True) if soup.title else "")
+    byline = find_byline(soup)
+    lead_image = meta_content(soup, "og:image", "twitter:image")
+
+    # Boilerplate is removed before the main element is found.
+    for element in soup.find_all(removed_tags):
+        element.decompose()
+    for element in soup.find_all(True):
+        if not element.decomposed and element.name not in ("html", "body", "article", "main") and class_weight(element) < 0:
+            element.decompose()
+
+    parts = ["<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>" + html.escape(headline) + "</title>"]
+    if url:
+        parts.append("<base href=\"" + html.escape(url) + "\">")
+    parts.append("</head><body><article><h1>" + html.escape(headline) + "</h1>")
+    if byline:
+        parts.append("<p class=\"byline\">" + html.escape(byline) + "</p>")
+    if lead_image:
+        parts.append("<img src=\"" + html.escape(urllib.parse.urljoin(url or "", lead_image)) + "\">")
+
+    # Nested elements are only copied once, with their parent, only the images of a paragraph are copied on their own.
+    copied = set()
+    for element in main_element(soup).find_all(content_tags):
+        if element.name != "img":
+            if any(id(parent) in copied for parent in element.parents):
+                continue
+            copied.add(id(element))
+        else:
+            source = element.get("src") or element.get("data-src")
+            if source and urllib.parse.urljoin(url or "", source) != urllib.parse.urljoin(url or "", lead_image or ""):
+                parts.append("<img src=\"" + html.escape(urllib.parse.urljoin(url or "", source)) + "\"" +
+                             (" alt=\"" + html.escape(element["alt"]) + "\"" if element.get("alt") else "") + ">")
+            continue
+        # The byline is only copied once, above the text.
+        if class_weight(element) == 0 and re.search(r"byline|author", " ".join(element.get("class") or []), re.I):
+            continue
+        if element.name in ("ul", "ol"):
+            items = [item.get_text(" ", strip = True) for item in element.find_all("li")]
+            text = "".join("<li>" + html.escape(item) + "</li>" for item in items if item)
+        else:
+            text = html.escape(element.get_text(" ", strip = True))
+        if text:
+            parts.append("<" + element.name + ">" + text + "</" + element.name + ">")
+    parts.append("</article></body></html>")
+    return "".join(parts).encode("utf-8")
@@ -0,0 +1,567 @@
+
+# Importing the Python modules, the dependencies of the fetch engine.
+import os
+import json
+import time
+import sqlite3
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from Deduplication import create_article_id
+from ConnectionPool import ConnectionPool, NotConnectedError
+from Resilience import RetryPolicy, CircuitBreaker, CircuitOpenError
+from RateLimiter import QuotaExceededError, USER_PRIORITY
+from Cancellation import CancellationToken
+from Instrumentation import metrics, tracer, stage
+import ArchiveFormat
+
+# Function is used to find the directory of the archive for the current date.
+def archive_directory(working_directory):
+    """This function returns the directory of the archive for the current date, Archive/<ddMonYYYY> in the
+       working directory. The directory is created if it does not exist."""
+
+    # Find the date.
+    raw_time = time.asctime()
+    raw_time = raw_time.split()
+    day = raw_time[2]
+    month = raw_time[1]
+    year = raw_time[4]
+    date = str(day + month + year)
+
+    directory = os.path.join(working_directory, "Archive", date)
+    os.makedirs(directory, exist_ok = True)
+    return directory
+
+# Class for the concurrent fetch engine.
+class FetchEngine:
+    """The FetchEngine collects news articles from many news sources at once. A bounded pool of worker
+       threads makes the URL requests to https://newsapi.org/, so the time taken to collect the articles
+       of a category is roughly that of the slowest request rather than the sum of all of them. News API
+       accepts up to 20 comma-separated news sources in a request, so the news sources are grouped into
+       batches. The pages of a batch are requested one after another, up to four for a full batch of 20 articles
+       for each news source, one if each keeps only 5, and the articles are split back into the news sources by
+       their source ID. The engine does not depend on PyQt5
+       and can be pointed at a local HTTP server through base_url."""
+
+    """The URL which all requests to News API are made to."""
+    default_base_url = "https://newsapi.org/v2/"
+
+    """The largest number of news sources News API accepts in a request, and the largest number of articles on a page."""
+    max_sources_per_request = 20
+    max_page_size = 100
+
+    """The number of articles collected for each news source of a batch at most, unless another is given. It is
+       the number of articles News API returns for a single news source when no page size is asked for."""
+    articles_per_source = 20
+
+    def __init__(self, api_key, max_workers = 8, max_requests_per_host = 8, timeout = 30, base_url = None, http_cache = None, database = None,
+                 connect_timeout = 5, retry_policy = None, circuit_breaker = None, rate_limiter = None, priority = USER_PRIORITY,
+                 archive_format = "json", sources_per_request = None, high_water_marks = None, articles_per_source = None):
+        """The initiation/constructor method for the FetchEngine class. The maximum number of requests in flight
+           is set by max_workers, the maximum number of requests in flight to a single host is set by
+           max_requests_per_host. The timeout is the number of seconds to wait for News API to send data and
+           the connect_timeout the number of seconds to wait for a connection. Requests are made through the
+           http_cache if one is given. The articles are stored in the database if one is given, otherwise they
+           are saved as JSON files. Failed requests are made again as decided by the retry_policy, and no
+           requests are made to news sources whose circuit is open in the circuit_breaker. Every request waits for
+           the rate_limiter if one is given, with the priority of the engine. The articles of each news source
+           are saved in the archive_format, one of the formats of ArchiveFormat. At most sources_per_request news
+           sources are collected by a request, 20 if it is None. Each news source keeps at most articles_per_source
+           articles, 20 if it is None, fewer articles need fewer pages for a batch. If high_water_marks are given,
+           the latest articles are collected incrementally, only the articles published since a news source was
+           last collected are requested and they are added to its file for the day."""
+
+        self.api_key = api_key
+        self.max_workers = max(1, int(max_workers))
+        self.max_requests_per_host = max(1, int(max_requests_per_host))
+        self.timeout = timeout
+        self.base_url = (base_url or FetchEngine.default_base_url)
+        self.http_cache = http_cache
+        self.database = database
+        self.retry_policy = (retry_policy or RetryPolicy())
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.priority = priority
+        ArchiveFormat.check_format(archive_format)
+        self.archive_format = archive_format
+        self.high_water_marks = high_water_marks
+        self.sources_per_request = min(FetchEngine.max_sources_per_request, max(1, int(sources_per_request or FetchEngine.max_sources_per_request)))
+        self.articles_per_source = min(FetchEngine.max_page_size, max(1, int(articles_per_source or FetchEngine.articles_per_source)))
+
+        # The cancellation token of the call to fetch_sources in progress.
+        self.cancel_token = CancellationToken()
+
+        # Connections to News API are kept open between requests.
+        self.connection_pool = ConnectionPool(self.max_requests_per_host, timeout, connect_timeout)
+
+        # The ID's of the articles collected by a call to fetch_sources are claimed under this lock.
+        self.claim_lock = threading.Lock()
+
+        # One semaphore is kept for every host, they are created when a host is first requested.
+        self.host_semaphores = {}
+        self.host_semaphores_lock = threading.Lock()
+
+    # Method is used to change the limits of the engine.
+    def configure(self, max_workers, max_requests_per_host, timeout, connect_timeout, max_attempts, sources_per_request, articles_per_source = None):
+        """This method changes the number of requests in flight, the timeouts, the number of attempts of a request,
+           the number of news sources collected by a request and the number of articles kept for each. Requests in
+           flight keep the limits they were started with, the next call to fetch_sources uses the new ones."""
+
+        self.max_workers = max(1, int(max_workers))
+        self.max_requests_per_host = max(1, int(max_requests_per_host))
+        self.timeout = timeout
+        self.connection_pool.timeout = timeout
+        self.connection_pool.connect_timeout = connect_timeout
+        self.retry_policy.max_attempts = max(1, int(max_attempts))
+        self.sources_per_request = min(FetchEngine.max_sources_per_request, max(1, int(sources_per_request or FetchEngine.max_sources_per_request)))
+        self.articles_per_source = min(FetchEngine.max_page_size, max(1, int(articles_per_source or FetchEngine.articles_per_source)))
+        with self.host_semaphores_lock:
+            self.host_semaphores = {}
+
+    # Method is used to create the URL request for news sources.
+    def build_url(self, news_sources, sort_by_var, page = None, page_size = None, published_from = None):
+        """This method returns the URL request for a news source or a list of news sources. The sort_by_var
+           decides if whether the top-headlines or the everything endpoint of News API is requested. The page
+           and page size are only asked for if they are given. If a published_from time is given, only the
+           articles of the everything endpoint published since then are asked for, newest first."""
+
+        if sort_by_var == "latest":
+            sort_by = "everything?"
+        else:
+            sort_by = "top-headlines?"
+        if not isinstance(news_sources, str):
+            news_sources = ",".join(news_sources)
+        url = self.base_url + sort_by + "sources=" + news_sources
+        if page_size is not None:
+            url = url + "&pageSize=" + str(page_size)
+        if page is not None:
+            url = url + "&page=" + str(page)
+        if published_from is not None and sort_by_var == "latest":
+            url = url + "&sortBy=publishedAt&from=" + urllib.parse.quote(str(published_from)[:19])
+        return (url + "&apiKey=" + self.api_key)
+
+    # Method is used to check if the articles of a sort are collected incrementally.
+    def incremental(self, sort_by_var):
+        """This method returns True if the articles of the sort are collected incrementally, the latest articles
+           are if the engine has high-water marks. Incremental articles are added to the file of a news source
+           for the day instead of replacing it."""
+
+        return sort_by_var == "latest" and self.high_water_marks is not None
+
+    # Method is used to group the news sources into the batches collected by a single request.
+    def plan_requests(self, news_sources):
+        """This method returns the news sources grouped into batches of at most sources_per_request news
+           sources, in their order. A news source listed more than once is only collected once."""
+
+        news_sources = list(dict.fromkeys(news_sources))
+        return [news_sources[start:start + self.sources_per_request] for start in range(0, len(news_sources), self.sources_per_request)]
+
+    # Method is used to find the semaphore of a host.
+    def host_semaphore(self, url):
+        """This method returns the semaphore which limits the number of requests in flight to the host of the URL."""
+
+        host = urllib.parse.urlsplit(url).netloc
+        with self.host_semaphores_lock:
+            if host not in self.host_semaphores:
+                self.host_semaphores[host] = threading.BoundedSemaphore(self.max_requests_per_host)
+            return self.host_semaphores[host]
+
+    # Method is used to make a URL request.
+    def send_request(self, url, headers = None, news_sources = None):
+        """This method makes a single request to the URL with the request headers and returns the status,
+           headers and body of the server response. HTTP error responses are returned rather than raised. Once
+           the first request has failed to reach News API no more requests are made, they fail at once. The
+           time taken by each phase of the request and the bytes downloaded are counted in the metrics of every
+           news source of the request, each news source of a batch waited for the whole request."""
+
+        self.cancel_token.check()
+        if self.connection_pool.connected is False:
+            raise NotConnectedError("No Connection To News API")
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self.priority, self.cancel_token)
+        timings = {}
+        source_labels = ([{"source": news_source} for news_source in news_sources] if news_sources else [{}])
+        with self.host_semaphore(url):
+            try:
+                status, response_headers, body = self.connection_pool.request_response(url, headers, timings)
+            finally:
+                for labels in source_labels:
+                    for phase in ("DNS", "Connect", "TLS", "TTFB", "Download"):
+                        if phase in timings:
+                            metrics.observe("newsfeed_fetch_" + phase.lower() + "_seconds", timings[phase], **labels)
+                    metrics.count("newsfeed_fetch_bytes_total", timings.get("Bytes", 0), **labels)
+        for labels in source_labels:
+            metrics.count("newsfeed_fetch_requests_total", status = status, **labels)
+        return status, response_headers, body
+
+    # Method is used to find the key of the circuit of a request.
+    def circuit_key(self, news_sources):
+        """This method returns the key of the circuit breaker for a request for the news sources. A request for a
+           single news source is recorded against the news source. A failed request for a batch says nothing about
+           which of its news sources failed, so it is recorded against the batch. None is returned if the request
+           is not for news sources."""
+
+        if not news_sources:
+            return None
+        if len(news_sources) == 1:
+            return news_sources[0]
+        return "batch:" + ",".join(news_sources)
+
+    # Method is used to make a URL request for news sources, with retries and the circuit breaker.
+    def send_source_request(self, news_sources, url, headers = None):
+        """This method makes the request for a list of news sources, making it again after failures as decided
+           by the retry policy. A failure is recorded by the circuit breaker against the circuit_key of the
+           request, a single news source or the batch. A success closes the circuit of the request and of every
+           news source of it. Neither is recorded if the request was rate limited, refused by the daily quota or
+           refused as an invalid request (4xx). The circuits are checked by the caller, before the request is planned."""
+
+        circuit_breaker = self.circuit_breaker
+        key = self.circuit_key(news_sources)
+
+        # The requests made after the first are counted as retries of every news source.
+        attempts = [0]
+        def send(url, headers = None):
+            attempts[0] = attempts[0] + 1
+            return self.send_request(url, headers, news_sources)
+
+        try:
+            status, response_headers, body = self.retry_policy.call(send, url, headers, self.cancel_token.sleep)
+        except (CircuitOpenError, QuotaExceededError):
+            raise
+        except OSError:
+
+            # Without a connection to News API every news source fails, the news source is not blamed.
+            if circuit_breaker is not None and key is not None and self.connection_pool.connected:
+                circuit_breaker.record_failure(key)
+            raise
+        finally:
+            if attempts[0] > 1:
+                for news_source in news_sources:
+                    metrics.count("newsfeed_fetch_retries_total", attempts[0] - 1, source = news_source)
+
+        # A rate limited request (429) says nothing about the news sources, the limit is on the API key, nor
+        # does a request refused as invalid, such as one with a wrong API key or parameter.
+        if circuit_breaker is not None and key is not None:
+            if status in RetryPolicy.retry_statuses and status not in CircuitBreaker.ignored_statuses:
+                circuit_breaker.record_failure(key)
+            elif status < 400:
+                for success_key in dict.fromkeys([key] + list(news_sources)):
+                    circuit_breaker.record_success(success_key)
+        return status, response_headers, body
+
+    # Method is used to make a URL request and load the returned JSON data.
+    def request_json(self, url, news_sources = None):
+        """This method opens the URL and returns the JSON data from the server response. The request is made
+           through the HTTP cache if the engine has one, so a stored response is used if the request fails. The
+           outcome is recorded by the circuit breaker for the list of news_sources."""
+
+        def send(url, headers = None):
+            return self.send_source_request(news_sources or [], url, headers)
+
+        if self.http_cache is not None:
+            body = self.http_cache.request(url, send)
+        else:
+            status, headers, body = send(url)
+            if status >= 400:
+                raise OSError("HTTP Error " + str(status))
+        with stage("json_decode"):
+            return json.loads(body)
+
+    # Method is used to collect the catalogue of news sources offered by News API.
+    def request_sources(self):
+        """This method requests the /v2/sources endpoint of News API and returns the list of news sources it
+           offers, each a dictionary with the ID, name, category, language and country of the news source."""
+
+        return self.request_json(self.base_url + "sources?apiKey=" + self.api_key)["sources"]
+
+    # Method is used to format the news articles returned by News API.
+    def format_articles(self, server_response):
+        """This method formats the news articles from News API into the records stored in the JSON files
+           of the archive. Each record is given an ID made from its URL, so the same article always has the same ID."""
+
+        formatted_articles = []
+        for article in server_response["articles"]:
+            formatted_article = {"ID": (create_article_id(article["url"], article["title"])), "Title": (article["title"]),
+                                 "Description": (article["description"]), "Author": (article["author"]),
+                                 "Published": (article["publishedAt"]), "URL": (article["url"])}
+            formatted_articles.append(formatted_article)
+        return formatted_articles
+
+    # Method is used to load the news articles of a news source already in the archive.
+    def read_source(self, directory, news_source, sort_by_var):
+        """This method returns the news articles of a news source already saved to the directory, an empty list
+           is returned if there are none."""
+
+        if self.database is not None:
+            return self.database.source_articles(os.path.basename(directory), news_source, sort_by_var)
+
+        try:
+            return ArchiveFormat.read_records(ArchiveFormat.find_source_file(directory, news_source, sort_by_var, self.archive_format))
+        except (OSError, ValueError):
+            return []
+
+    # Method is used to find the file of a news source.
+    def source_file_name(self, directory, news_source, sort_by_var):
+        """This method returns the name of the file the news articles of a news source are saved to."""
+
+        return ArchiveFormat.source_file_name(directory, news_source, sort_by_var, self.archive_format)
+
+    # Method is used to save the news articles of a news source.
+    def write_source(self, directory, news_source, sort_by_var, formatted_articles):
+        """This method saves the file containing the news articles of a news source to the directory, in the
+           archive format of the engine. If the engine has a database the news articles are stored in it instead,
+           under the date of the directory."""
+
+        if self.database is not None:
+            self.database.replace_source(os.path.basename(directory), news_source, sort_by_var, formatted_articles)
+            return
+
+        # The file is written atomically, so a cancelled or failed write never leaves a truncated file.
+        ArchiveFormat.write_source_file(directory, news_source, sort_by_var, formatted_articles, self.archive_format)
+
+    # Method is used to remove articles which have already been collected.
+    def claim_articles(self, formatted_articles, fetched_ids, seen_index):
+        """This method returns the articles which have not already been collected from another news source
+           by the same call to fetch_sources, or archived before if a seen_index is given."""
+
+        new_articles = []
+        with self.claim_lock:
+            for formatted_article in formatted_articles:
+                article_id = formatted_article["ID"]
+                if article_id in fetched_ids or (seen_index is not None and article_id in seen_index):
+                    continue
+                fetched_ids.add(article_id)
+                new_articles.append(formatted_article)
+        return new_articles
+
+    # Method is used to find the page size of the requests for a batch of news sources.
+    def page_size(self, news_sources):
+        """This method returns the number of articles asked for on each page of the requests for a batch of
+           news sources, articles_per_source for every news source up to the largest page News API returns."""
+
+        return min(FetchEngine.max_page_size, self.articles_per_source * len(news_sources))
+
+    # Method is used to collect the pages of the news articles of a batch of news sources.
+    def request_pages(self, news_sources, sort_by_var, published_from = None):
+        """This method requests the pages of the news articles of a batch of news sources one after another and
+           returns a dictionary of the articles of every news source, as returned by News API, and True if every
+           article was collected. No more pages are requested once every news source has articles_per_source
+           articles, and at most enough pages for articles_per_source articles of every news source are
+           requested. An error is raised if the first page could not be collected, the articles of the pages
+           collected are kept if a later page fails."""
+
+        page_size = self.page_size(news_sources)
+        max_pages = -(-self.articles_per_source * len(news_sources) // page_size)
+        source_articles = {news_source: [] for news_source in news_sources}
+        collected = 0
+        for page in range(1, max_pages + 1):
+            try:
+                server_response = self.request_json(self.build_url(news_sources, sort_by_var, page, page_size, published_from), news_sources)
+            except Exception:
+                if page == 1 or self.cancel_token.cancelled():
+                    raise
+                return source_articles, False
+
+            # The articles are split into their news sources by their source ID.
+            articles = server_response["articles"]
+            for article in articles:
+                source_id = (article.get("source") or {}).get("id")
+                if source_id in source_articles:
+                    source_articles[source_id].append(article)
+            collected = collected + len(articles)
+
+            if len(articles) < page_size or collected >= server_response.get("totalResults", collected):
+                return source_articles, True
+            if all(len(found) >= self.articles_per_source for found in source_articles.values()):
+                break
+        return source_articles, False
+
+    # Method is used to collect the news articles of a batch of news sources.
+    def request_batch(self, news_sources, sort_by_var):
+        """This method collects the news articles of a batch of news sources. A dictionary of the articles of
+           every news source, as returned by News API, and the set of news sources whose articles were all
+           collected are returned. The articles of a news source are None if they could not be collected.
+           If the pages of the batch did not hold every article, the news sources left with fewer than
+           articles_per_source articles are requested again as a smaller batch, a single news source by a
+           request of its own, so a busy news source cannot crowd the others out of the batch. Each news source
+           keeps at most articles_per_source articles, unless the articles are collected incrementally. Then
+           only the articles published since the oldest high-water mark of the batch are asked for, and every
+           news source of the batch must have been collected before. An error is raised if the first page of
+           the batch could not be collected."""
+
+        incremental = self.incremental(sort_by_var)
+        published_from = None
+        if incremental:
+            marks = [self.high_water_marks.get(news_source) for news_source in news_sources]
+            if None not in marks:
+                published_from = min(marks)
+        source_articles, complete = self.request_pages(news_sources, sort_by_var, published_from)
+        if complete:
+            complete_sources = set(news_sources)
+        else:
+            complete_sources = set()
+            starved_sources = [news_source for news_source in news_sources if len(source_articles[news_source]) < self.articles_per_source]
+            if (starved_sources and len(starved_sources) < len(news_sources) and
+                    (self.circuit_breaker is None or self.circuit_breaker.allow(self.circuit_key(starved_sources)))):
+                try:
+                    starved_articles, complete_sources = self.request_batch(starved_sources, sort_by_var)
+                except Exception:
+                    if self.cancel_token.cancelled():
+                        raise
+                    starved_articles = {}
+                for news_source, articles in starved_articles.items():
+                    if articles is not None:
+                        source_articles[news_source] = articles
+
+            # A news source without articles from a batch which was cut short is not known to have none.
+            for news_source in news_sources:
+                if not source_articles[news_source] and news_source not in complete_sources:
+                    source_articles[news_source] = None
+
+        if not incremental:
+            for news_source, articles in source_articles.items():
+                if articles is not None:
+                    source_articles[news_source] = articles[:self.articles_per_source]
+        return source_articles, complete_sources
+
+    # Method is used to find the news articles of skipped news sources in the HTTP cache.
+    def cached_batch(self, news_sources, skipped_sources, sort_by_var):
+        """This method returns a dictionary of the articles of the skipped news sources of a batch, as returned
+           by News API, taken from the responses stored by the HTTP cache when the whole batch was last collected.
+           No request is made, a skipped news source is left out if it has no stored articles."""
+
+        def refuse(url, headers = None):
+            raise CircuitOpenError("Circuit Open: " + ",".join(skipped_sources))
+
+        page_size = self.page_size(news_sources)
+        max_pages = -(-self.articles_per_source * len(news_sources) // page_size)
+        source_articles = {}
+        for page in range(1, max_pages + 1):
+            try:
+                server_response = json.loads(self.http_cache.request(self.build_url(news_sources, sort_by_var, page, page_size), refuse))
+            except (OSError, ValueError):
+                break
+            for article in server_response["articles"]:
+                source_id = (article.get("source") or {}).get("id")
+                if source_id in skipped_sources:
+                    source_articles.setdefault(source_id, []).append(article)
+        return {news_source: articles[:self.articles_per_source] for news_source, articles in source_articles.items()}
+
+    # Method is used to collect and save the news articles of a batch of news sources.
+    def fetch_batch(self, news_sources, sort_by_var, directory, seen_index = None, fetched_ids = None):
+        """This method collects the news articles of a batch of news sources and saves the articles of every
+           news source to the directory. Articles already collected from another news source by the same call
+           to fetch_sources are left out. If a seen_index is given, or the articles are collected incrementally,
+           articles which have been archived before are also left out and the new articles are added to the
+           news source's file instead of replacing it. The high-water mark of every news source collected
+           incrementally is moved forward, unless the pages of its batch did not hold all of the articles
+           published since its mark.
+           A list of tuples of every news source and its new formatted news articles is returned, the articles
+           are None if the news source could not be collected. News sources whose circuit is open are not
+           requested, nor is the batch if its own circuit is open, their articles are taken from the stored
+           responses of the HTTP cache if there are any."""
+
+        if fetched_ids is None:
+            fetched_ids = set()
+        if self.cancel_token.cancelled():
+            return [(news_source, None) for news_source in news_sources]
+        start_time = time.perf_counter()
+        with tracer.span("fetch_batch", sources = ",".join(news_sources)), metrics.timer("newsfeed_fetch_batch_seconds"):
+            fetched = self.fetch_batch_sources(news_sources, sort_by_var, directory, seen_index, fetched_ids)
+
+        # The time taken by the batch and the articles collected are counted for every news source.
+        seconds = time.perf_counter() - start_time
+        for news_source in news_sources:
+            metrics.observe("newsfeed_fetch_source_seconds", seconds, source = news_source)
+            if fetched[news_source] is None:
+                metrics.count("newsfeed_fetch_failures_total", source = news_source)
+            else:
+                metrics.count("newsfeed_articles_total", len(fetched[news_source]), source = news_source)
+        return [(news_source, fetched[news_source]) for news_source in news_sources]
+
+    # Method is used to collect and save the news articles of a batch of news sources.
+    def fetch_batch_sources(self, news_sources, sort_by_var, directory, seen_index, fetched_ids):
+        """This method collects and saves the news articles of a batch of news sources for fetch_batch, and
+           returns a dictionary of the new formatted news articles of every news source, None if the news source
+           could not be collected."""
+
+        requested_sources = news_sources
+        if self.circuit_breaker is not None:
+            requested_sources = [news_source for news_source in news_sources if self.circuit_breaker.allow(news_source)]
+            if len(requested_sources) > 1 and not self.circuit_breaker.allow(self.circuit_key(requested_sources)):
+                requested_sources = []
+        fetched = {news_source: None for news_source in news_sources}
+        try:
+            if requested_sources:
+                source_articles, complete_sources = self.request_batch(requested_sources, sort_by_var)
+            else:
+                source_articles, complete_sources = {}, set()
+        except Exception:
+            source_articles, complete_sources = {}, set()
+
+        # The news sources whose circuit is open are answered from the HTTP cache, as if their request had failed.
+        incremental = self.incremental(sort_by_var)
+        skipped_sources = [news_source for news_source in news_sources if news_source not in requested_sources]
+        if skipped_sources and self.http_cache is not None and not incremental:
+            source_articles.update(self.cached_batch(news_sources, skipped_sources, sort_by_var))
+
+        # A news source whose articles could not be collected keeps the file it has.
+        for news_source, articles in source_articles.items():
+            if articles is None:
+                continue
+            if incremental:
+                articles = [article for article in articles if self.high_water_marks.is_new(news_source, article.get("publishedAt"))]
+            try:
+                formatted_articles = self.claim_articles(self.format_articles({"articles": articles}), fetched_ids, seen_index)
+                if seen_index is None and not incremental:
+                    self.write_source(directory, news_source, sort_by_var, formatted_articles)
+                else:
+                    # The new articles are merged into the file of the day, which is only written again if there are any.
+                    archived_articles = self.read_source(directory, news_source, sort_by_var)
+                    archived_ids = set(archived_article["ID"] for archived_article in archived_articles)
+                    formatted_articles = [formatted_article for formatted_article in formatted_articles if formatted_article["ID"] not in archived_ids]
+                    if formatted_articles or not archived_articles:
+                        self.write_source(directory, news_source, sort_by_var, archived_articles + formatted_articles)
+                    if seen_index is not None:
+                        seen_index.add([formatted_article["ID"] for formatted_article in formatted_articles])
+                # The mark is only moved past articles which were not collected if the news source has no mark yet.
+                if incremental and (news_source in complete_sources or self.high_water_marks.get(news_source) is None):
+                    self.high_water_marks.advance(news_source, [article.get("publishedAt") for article in articles])
+            except (OSError, ValueError, sqlite3.Error) as error:
+                print("<Fetch Engine Process: Error: Could Not Archive " + news_source + "-" + sort_by_var + ": " + str(error) + ">")
+                metrics.count("newsfeed_archive_errors_total", source = news_source)
+                continue
+            fetched[news_source] = formatted_articles
+        return fetched
+
+    # Method is used to collect the news articles of many news sources at once.
+    def fetch_sources(self, news_sources, sort_by_var, directory, seen_index = None, cancel_token = None):
+        """This method collects the news articles of all news sources using the pool of worker threads, a
+           request for each batch of news sources. It is a generator, a tuple of the news source and its
+           formatted news articles is yielded for every news source of a batch as soon as the batch is
+           finished, in the order they finish. The formatted news articles are None if the news
+           source could not be collected. An article found in more than one news source is only kept once.
+           Once the cancel_token is cancelled, requests in flight are interrupted, news sources not yet started
+           are skipped and the generator returns without yielding the remaining news sources."""
+
+        # The first request of every call is the connectivity check.
+        self.connection_pool.connected = None
+        self.cancel_token = (cancel_token or CancellationToken())
+        self.cancel_token.add_callback(self.connection_pool.abort)
+        fetched_ids = set()
+
+        # The high-water marks moved forward by another process using the same archive are read.
+        if self.high_water_marks is not None:
+            self.high_water_marks.load()
+        try:
+            with ThreadPoolExecutor(max_workers = self.max_workers) as executor:
+                futures = [executor.submit(self.fetch_batch, batch, sort_by_var, directory, seen_index, fetched_ids)
+                           for batch in self.plan_requests(news_sources)]
+
+                for future in as_completed(futures):
+                    if self.cancel_token.cancelled():
+                        executor.shutdown(cancel_futures = True)
+                        return
+                    yield from future.result()
+        finally:
+            self.cancel_token.remove_callback(self.connection_pool.abort)
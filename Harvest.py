@@ -0,0 +1,423 @@
+
+# Importing the Python modules, the dependencies of the headless harvester.
+import os
+import sys
+import time
+import heapq
+import signal
+import argparse
+from FetchEngine import FetchEngine, archive_directory
+from HttpCache import HttpCache
+from Deduplication import SeenIndex, HighWaterMarks
+from Database import ArchiveDatabase
+from PageStore import PageStore
+from SaveEngine import SaveEngine, save_modes
+from SourceCatalogue import SourceCatalogue
+from Resilience import RetryPolicy, CircuitBreaker
+from RateLimiter import RateLimiter, SCHEDULED_PRIORITY
+from Cancellation import CancellationToken, CancelledError
+from Instrumentation import MetricsServer, tracer, stage
+from Configuration import ConfigurationError, ConfigurationWatcher, configuration_file, load_configuration, validate_configuration
+import ArchiveFormat
+
+# Main algorithm.
+def main(arguments = None):
+    """The main algorithm of the headless harvester. News articles are collected into the archive without the
+       GUI, so PyQt5 is never imported. The harvester is started from the command line, for example:
+
+           python -m Harvest harvest --sources bbc-news cnn:60 --sort top --interval 300
+
+       The news sources of a category, country or language of the source catalogue are collected with:
+
+           python -m Harvest harvest --category technology --country gb
+
+       An archive of JSON files is imported into the SQLite archive with:
+
+           python -m Harvest import-archive
+
+       The files of the archive are converted to line-delimited JSON compressed with gzip with:
+
+           python -m Harvest convert-archive --format ndjson.gz
+
+       The web pages saved offline are written as HTML files named after their titles with:
+
+           python -m Harvest export-pages --output Pages
+
+       The number of requests to News API left today is shown with:
+
+           python -m Harvest quota
+
+       The metrics of a harvester are served on localhost in the Prometheus text format with:
+
+           python -m Harvest harvest --interval 300 --metrics-port 9464
+
+       Each news source is collected again once its interval has passed, a news source may be given its own
+       interval in seconds after a colon. The news sources are collected once if the interval is 0. While the
+       harvester runs, the performance settings of the configuration file are loaded again once it changes,
+       settings given on the command line are kept."""
+
+    parser = argparse.ArgumentParser(prog = "Harvest", description = "Collects news articles from News API without the GUI.")
+    commands = parser.add_subparsers(dest = "command")
+    commands.required = True
+    harvest_parser = commands.add_parser("harvest", help = "Collects news articles into the archive.")
+    harvest_parser.add_argument("--sources", nargs = "+", help = "The news sources, the sources of the configuration file are used if none are given.")
+    harvest_parser.add_argument("--category", help = "Collects the news sources of the category in the source catalogue, unless --sources are given.")
+    harvest_parser.add_argument("--country", help = "Collects the news sources of the country code in the source catalogue, unless --sources are given.")
+    harvest_parser.add_argument("--language", help = "Collects the news sources of the language code in the source catalogue, unless --sources are given.")
+    harvest_parser.add_argument("--sort", choices = ["top", "latest"], default = "top", help = "Collects the top or the latest news articles.")
+    harvest_parser.add_argument("--interval", type = float, default = None,
+                                help = "The number of seconds between collections, 0 collects once, the PollInterval of the configuration file is used if none is given.")
+    harvest_parser.add_argument("--directory", default = os.getcwd(), help = "The working directory containing the configuration file and the archive.")
+    harvest_parser.add_argument("--api-key", help = "The News API key, the key of the configuration file is used if none is given.")
+    harvest_parser.add_argument("--max-requests", type = int, default = None,
+                                help = "The maximum number of URL requests in flight at once, the MaxConcurrentRequests of the configuration file is used if none is given.")
+    harvest_parser.add_argument("--sources-per-request", type = int, default = None,
+                                help = "The number of news sources collected by a request, at most 20, the SourcesPerRequest of the configuration file is used if none is given.")
+    harvest_parser.add_argument("--articles-per-source", type = int, default = None,
+                                help = "The number of articles kept for each news source, fewer need fewer requests, the ArticlesPerSource of the configuration file is used if none is given.")
+    harvest_parser.add_argument("--save", action = "store_true", help = "Also saves the web page of every collected article offline.")
+    harvest_parser.add_argument("--save-mode", choices = save_modes, default = None,
+                                help = "Saves web pages as downloaded, rewritten or with only the article extracted, the SaveMode of the configuration file is used if none is given.")
+    harvest_parser.add_argument("--parse-processes", type = int, default = None,
+                                help = "The number of processes parsing saved web pages, the ParseProcesses of the configuration file or one for each core is used if none is given.")
+    harvest_parser.add_argument("--html-parser", default = None, help = "The parser backend of BeautifulSoup, lxml is used if it is installed.")
+    harvest_parser.add_argument("--cache-size", type = int, default = None, help = "The maximum size of the HTTP cache in bytes.")
+    harvest_parser.add_argument("--offline", action = "store_true", help = "Only uses responses stored in the HTTP cache.")
+    harvest_parser.add_argument("--connect-timeout", type = float, default = None, help = "The number of seconds to wait for a connection.")
+    harvest_parser.add_argument("--read-timeout", type = float, default = None, help = "The number of seconds to wait for data from a server.")
+    harvest_parser.add_argument("--max-attempts", type = int, default = None, help = "The number of times a failed request is made.")
+    harvest_parser.add_argument("--requests-per-second", type = float, default = None, help = "The maximum rate of requests to News API.")
+    harvest_parser.add_argument("--daily-quota", type = int, default = None, help = "The maximum number of requests to News API a day.")
+    harvest_parser.add_argument("--archive-format", choices = sorted(ArchiveFormat.archive_formats), default = None,
+                                help = "The format of the files of the archive, the ArchiveFormat of the configuration file is used if none is given.")
+    harvest_parser.add_argument("--metrics-port", type = int, default = None,
+                                help = "Serves the metrics in the Prometheus text format on this port of localhost, the MetricsPort of the configuration file is used if none is given.")
+    harvest_parser.add_argument("--trace", default = None, help = "Writes a span of every stage to this file, in the format of the Chrome trace viewer.")
+    harvest_parser.add_argument("--storage", choices = ["json", "sqlite"], default = None, help = "Archives articles as JSON files or in a SQLite database.")
+    import_parser = commands.add_parser("import-archive", help = "Imports the files of the archive into the SQLite archive.")
+    import_parser.add_argument("--directory", default = os.getcwd(), help = "The working directory containing the archive.")
+    convert_parser = commands.add_parser("convert-archive", help = "Converts the files of the archive to another format.")
+    convert_parser.add_argument("--directory", default = os.getcwd(), help = "The working directory containing the archive.")
+    convert_parser.add_argument("--format", choices = sorted(ArchiveFormat.archive_formats), required = True, help = "The format to convert the files to.")
+    export_parser = commands.add_parser("export-pages", help = "Writes the web pages saved offline as HTML files.")
+    export_parser.add_argument("--directory", default = os.getcwd(), help = "The working directory containing the archive.")
+    export_parser.add_argument("--output", required = True, help = "The directory the HTML files are written to.")
+    quota_parser = commands.add_parser("quota", help = "Shows the number of requests to News API left today.")
+    quota_parser.add_argument("--directory", default = os.getcwd(), help = "The working directory containing the configuration file and the archive.")
+    quota_parser.add_argument("--daily-quota", type = int, default = None, help = "The maximum number of requests to News API a day.")
+    arguments = parser.parse_args(arguments)
+
+    # The JSON files of the archive are imported into the database.
+    if arguments.command == "import-archive":
+        database = ArchiveDatabase(os.path.join(arguments.directory, "Archive", "Archive.db"))
+        imported = database.import_json_archive(os.path.join(arguments.directory, "Archive"))
+        print("<Harvest Process: " + str(imported) + " File(s) Imported>")
+        return 0
+
+    # The files of the archive are converted to another format.
+    if arguments.command == "convert-archive":
+        try:
+            converted = ArchiveFormat.convert_archive(os.path.join(arguments.directory, "Archive"), arguments.format)
+        except (OSError, ValueError) as error:
+            print("<Harvest Process: Error: " + str(error) + ">")
+            return 1
+        print("<Harvest Process: " + str(converted) + " File(s) Converted>")
+        return 0
+
+    # The web pages saved offline are written as HTML files.
+    if arguments.command == "export-pages":
+        page_store = PageStore(os.path.join(arguments.directory, "Archive", "Pages"))
+        try:
+            os.makedirs(arguments.output, exist_ok = True)
+            exported = page_store.export(arguments.output)
+        except OSError as error:
+            print("<Harvest Process: Error: " + str(error) + ">")
+            return 1
+        print("<Harvest Process: " + str(exported) + " Web Page(s) Exported>")
+        return 0
+
+    # Configuration file is loaded, the settings given on the command line are used instead of those of the file.
+    configuration = load_configuration_file(arguments.directory)
+    if configuration is None:
+        return 1
+    configuration = apply_arguments(configuration, arguments)
+    daily_quota = configuration["DailyQuota"]
+
+    # The number of requests left today is shown.
+    if arguments.command == "quota":
+        rate_limiter = RateLimiter(daily_quota = daily_quota, file_name = os.path.join(arguments.directory, "Archive", "Quota.json"))
+        print("<Harvest Process: " + str(rate_limiter.remaining()) + "/" + str(daily_quota) + " Requests Left Today>")
+        return 0
+
+    # API key is checked.
+    api_key = (arguments.api_key or configuration["APIKEY"])
+    if api_key == "":
+        print("<Harvest Process: Error: API Key Missing>")
+        return 1
+
+    http_cache = HttpCache(os.path.join(arguments.directory, "Archive", "Cache"), configuration["CacheSize"], arguments.offline)
+    database = None
+    if configuration["StorageBackend"] == "sqlite":
+        database = ArchiveDatabase(os.path.join(arguments.directory, "Archive", "Archive.db"))
+    rate_limiter = RateLimiter(configuration["RequestsPerSecond"], configuration["RequestBurst"], daily_quota,
+                               os.path.join(arguments.directory, "Archive", "Quota.json"))
+    archive_format = configuration["ArchiveFormat"]
+    try:
+        ArchiveFormat.check_format(archive_format)
+    except ValueError as error:
+        print("<Harvest Process: Error: " + str(error) + ">")
+        return 1
+    harvester = Harvester(api_key, arguments.directory, arguments.sort, configuration["MaxConcurrentRequests"], arguments.save, http_cache, database,
+                          configuration["ConnectTimeout"], configuration["ReadTimeout"], configuration["MaxAttempts"], rate_limiter, archive_format,
+                          configuration["SaveMode"], configuration["HtmlParser"], configuration["ParseProcesses"],
+                          configuration["SourcesPerRequest"], configuration["IncrementalLatest"], configuration["ArticlesPerSource"])
+    harvester.configure(configuration)
+
+    # News sources are selected from the source catalogue, which is collected again if it is out of date, or taken from the configuration file.
+    news_sources = (arguments.sources or [])
+    if not news_sources and (arguments.category or arguments.country or arguments.language):
+        source_catalogue = SourceCatalogue(os.path.join(arguments.directory, "Archive", "Sources.json"),
+                                           configuration["SourceCatalogueTTL"])
+        if not source_catalogue.refresh(harvester.fetch_engine.request_sources):
+            print("<Harvest Process: Error: Source Catalogue Not Collected, The Catalogue In The Archive Is Used>")
+        news_sources = source_catalogue.select(arguments.category, arguments.country, arguments.language)
+    elif not news_sources:
+        news_sources = configuration["Sources"]
+    if not news_sources:
+        print("<Harvest Process: Error: No News Sources>")
+        return 1
+
+    # Ctrl+C stops the harvester once the requests in flight are interrupted, a second Ctrl+C stops it at once.
+    def stop(signal_number, frame):
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        print("<Harvest Process: Stopping>")
+        harvester.cancel_token.cancel()
+    signal.signal(signal.SIGINT, stop)
+
+    # The configuration file is watched while the harvester runs, the new settings are used from the next collection.
+    def reload(configuration):
+        harvester.configure(apply_arguments(configuration, arguments))
+        print("<Harvest Process: Configuration File Loaded>")
+    def reload_failed(error):
+        print("<Harvest Process: Error: " + str(error) + ", The Previous Settings Are Kept>")
+    stop_watching = ConfigurationWatcher(arguments.directory, configuration["ReloadInterval"]).start(reload, reload_failed)
+
+    # The metrics are served on localhost while the harvester runs.
+    metrics_server = None
+    if configuration["MetricsPort"]:
+        try:
+            metrics_server = MetricsServer(configuration["MetricsPort"]).start()
+            print("<Harvest Process: Metrics Served At " + metrics_server.url() + ">")
+        except OSError as error:
+            print("<Harvest Process: Error: Metrics Not Served: " + str(error) + ">")
+
+    try:
+        harvester.run(parse_sources(news_sources, arguments.interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_watching.set()
+        if metrics_server is not None:
+            metrics_server.stop()
+        rate_limiter.close()
+        tracer.close()
+    if harvester.cancel_token.cancelled():
+        print("<Harvest Process: Stopped>")
+    return 0
+
+# Function is used to load the configuration file.
+def load_configuration_file(directory):
+    """This function loads and checks the configuration file in the directory, Config.toml, Config.json or
+       Config.txt. The default settings are returned if there is none, None is returned if it cannot be used."""
+
+    file_name = configuration_file(directory)
+    if not os.path.exists(file_name):
+        return validate_configuration({})
+    try:
+        return load_configuration(file_name)
+    except ConfigurationError as error:
+        print("<Harvest Process: Error: " + str(error) + ">")
+        return None
+
+# Function is used to apply the settings given on the command line.
+def apply_arguments(configuration, arguments):
+    """This function returns the settings of the configuration file with the settings given on the command
+       line used instead, the command line settings which are not given are left out."""
+
+    configuration = dict(configuration)
+    command_line = {"DailyQuota": (arguments.daily_quota)}
+    if arguments.command == "harvest":
+        command_line.update({"MaxConcurrentRequests": (arguments.max_requests), "MaxRequestsPerHost": (arguments.max_requests),
+                             "SourcesPerRequest": (arguments.sources_per_request), "ArticlesPerSource": (arguments.articles_per_source),
+                             "SaveMode": (arguments.save_mode),
+                             "HtmlParser": (arguments.html_parser), "ParseProcesses": (arguments.parse_processes),
+                             "CacheSize": (arguments.cache_size), "ConnectTimeout": (arguments.connect_timeout),
+                             "ReadTimeout": (arguments.read_timeout), "MaxAttempts": (arguments.max_attempts),
+                             "RequestsPerSecond": (arguments.requests_per_second), "ArchiveFormat": (arguments.archive_format),
+                             "StorageBackend": (arguments.storage), "PollInterval": (arguments.interval),
+                             "MetricsPort": (arguments.metrics_port), "TraceFile": (arguments.trace)})
+    for key, value in command_line.items():
+        if value is not None:
+            configuration[key] = value
+    return configuration
+
+# Function is used to read the interval of each news source.
+def parse_sources(news_sources, interval = None):
+    """This function returns a list of tuples of each news source and its interval in seconds. A news source
+       is given its own interval by writing it after a colon, otherwise the interval is used. The interval of
+       a news source is None if neither is given, the poll interval of the harvester is then used."""
+
+    schedule = []
+    for news_source in news_sources:
+        name, separator, source_interval = news_source.partition(":")
+        schedule.append((name, float(source_interval) if separator else interval))
+    return schedule
+
+# Class for the headless harvester.
+class Harvester:
+    """The Harvester collects news articles into the archive on a schedule. The news sources are kept in a
+       queue ordered by the time they are next due, so only the news sources which are due are collected."""
+
+    def __init__(self, api_key, working_directory, sort_by_var = "top", max_requests = 8, save_articles = False, http_cache = None, database = None,
+                 connect_timeout = 5, read_timeout = 20, max_attempts = 3, rate_limiter = None, archive_format = "json",
+                 save_mode = "raw", html_parser = None, parse_processes = None, sources_per_request = None,
+                 incremental_latest = True, articles_per_source = None):
+        """The initiation/constructor method for the Harvester class. Requests are made through the http_cache
+           if one is given. Articles are stored in the database if one is given. A failed request is made at
+           most max_attempts times, news sources which keep failing are skipped until their circuit is closed.
+           Requests wait for the rate_limiter if one is given, behind the requests made by the GUI. The articles
+           of each news source are archived in the archive_format. Web pages are saved in the save_mode,
+           parsed with the html_parser backend of BeautifulSoup if one is given, by parse_processes worker
+           processes for large batches. Up to sources_per_request news sources are collected by a request, each
+           keeping up to articles_per_source articles.
+           If incremental_latest is True, the latest articles of a news source are only collected since the
+           newest article collected before, by the harvester or the GUI."""
+
+        self.working_directory = working_directory
+        self.sort_by_var = sort_by_var
+        self.save_articles = save_articles
+        self.save_mode = save_mode
+        self.html_parser = html_parser
+        self.parse_processes = parse_processes
+        self.http_cache = http_cache
+        self.circuit_breaker = CircuitBreaker(os.path.join(working_directory, "Archive", "Circuits.json"))
+        self.high_water_marks = None
+        if incremental_latest:
+            self.high_water_marks = HighWaterMarks(os.path.join(working_directory, "Archive", "HighWater.json"))
+        self.fetch_engine = FetchEngine(api_key, max_requests, max_requests, read_timeout, http_cache = http_cache, database = database,
+                                        connect_timeout = connect_timeout, retry_policy = RetryPolicy(max_attempts),
+                                        circuit_breaker = self.circuit_breaker, rate_limiter = rate_limiter,
+                                        priority = SCHEDULED_PRIORITY, archive_format = archive_format,
+                                        sources_per_request = sources_per_request, high_water_marks = self.high_water_marks,
+                                        articles_per_source = articles_per_source)
+
+        # Articles which have already been archived or saved are remembered across runs.
+        self.archived_index = SeenIndex(os.path.join(working_directory, "Archive", "Archived.txt"))
+        self.page_store = PageStore(os.path.join(working_directory, "Archive", "Pages"))
+
+        # News sources without their own interval are collected every poll_interval seconds, only once if it is 0.
+        self.poll_interval = 0
+
+        # The harvester stops once the cancellation token is cancelled.
+        self.cancel_token = CancellationToken()
+
+    # Method is used to change the settings of the harvester.
+    def configure(self, configuration):
+        """This method changes the performance settings of the harvester to those of the configuration, a
+           dictionary of the settings of the configuration file. It may be called while the harvester runs,
+           requests in flight are finished with the old settings and the next collection uses the new ones.
+           The storage backend and the archive format are only read when the harvester is started."""
+
+        self.fetch_engine.configure(configuration["MaxConcurrentRequests"], configuration["MaxRequestsPerHost"], configuration["ReadTimeout"],
+                                    configuration["ConnectTimeout"], configuration["MaxAttempts"], configuration["SourcesPerRequest"],
+                                    configuration["ArticlesPerSource"])
+        if self.fetch_engine.rate_limiter is not None:
+            self.fetch_engine.rate_limiter.configure(configuration["RequestsPerSecond"], configuration["RequestBurst"], configuration["DailyQuota"])
+        if self.http_cache is not None:
+            self.http_cache.resize(configuration["CacheSize"])
+        self.save_mode = configuration["SaveMode"]
+        self.html_parser = configuration["HtmlParser"]
+        self.parse_processes = configuration["ParseProcesses"]
+        self.poll_interval = configuration["PollInterval"]
+
+        # Spans of the stages of the harvester are written to the trace file, if one is given.
+        if configuration["TraceFile"]:
+            try:
+                tracer.open(os.path.join(self.working_directory, configuration["TraceFile"]))
+            except OSError as error:
+                print("<Harvest Process: Error: Trace File Not Opened: " + str(error) + ">")
+        else:
+            tracer.close()
+
+    # Method is used to collect the news articles of the news sources which are due.
+    def harvest(self, news_sources):
+        """This method collects the news articles of the news sources into the archive for the current date.
+           Articles which have been archived before are skipped. The web pages of the articles are also saved
+           offline if save_articles is True. The number of new articles collected is returned."""
+
+        directory = archive_directory(self.working_directory)
+        collected_articles = []
+        fetched_sources = self.fetch_engine.fetch_sources(news_sources, self.sort_by_var, directory, self.archived_index, self.cancel_token)
+        for news_source, formatted_articles in fetched_sources:
+            if formatted_articles is None:
+                print("<Harvest Process: Error: Data Not Collected For: " + news_source + "-" + self.sort_by_var + ">")
+                continue
+            collected_articles.extend(formatted_articles)
+            print("<Harvest Process: JSON Created For: " + news_source + "-" + self.sort_by_var + ">")
+
+        # The web pages of the articles are saved offline.
+        if self.save_articles and collected_articles and not self.cancel_token.cancelled():
+            try:
+                save_engine = SaveEngine(self.fetch_engine.max_workers, max_connections_per_host = self.fetch_engine.max_requests_per_host,
+                                         http_cache = self.http_cache, save_mode = self.save_mode, parser = self.html_parser,
+                                         parse_processes = self.parse_processes)
+            except (ImportError, ValueError) as error:
+                print("<Harvest Process: Error: " + str(error) + ">")
+                save_engine = None
+            if save_engine is not None:
+                for article, error in save_engine.save_articles(collected_articles, self.page_store, self.cancel_token):
+                    if error is not None:
+                        print("<Harvest Process: Error: Could Not Save Article: " + str(article["Title"]) + ">")
+
+        print("<Harvest Process: " + str(len(collected_articles)) + " Articles Collected From " + str(len(news_sources)) + " Source(s)>")
+        rate_limiter = self.fetch_engine.rate_limiter
+        if rate_limiter is not None and rate_limiter.remaining() is not None:
+            print("<Harvest Process: " + str(rate_limiter.remaining()) + " Requests Left Today>")
+        return len(collected_articles)
+
+    # Method is used to collect news articles on a schedule.
+    def run(self, schedule):
+        """This method collects the news articles of each news source, then waits until the next news source
+           is due. The schedule is a list of tuples of each news source and its interval in seconds, the poll
+           interval is used for a news source whose interval is None. A news source with an interval of 0 is only
+           collected once, the method returns once no news sources are left
+           or the cancellation token is cancelled."""
+
+        due = [(0.0, news_source, interval) for news_source, interval in schedule]
+        heapq.heapify(due)
+        while due and not self.cancel_token.cancelled():
+
+            # The harvester sleeps until the next news source is due.
+            now = time.monotonic()
+            if due[0][0] > now:
+                try:
+                    self.cancel_token.sleep(due[0][0] - now)
+                except CancelledError:
+                    return
+                now = time.monotonic()
+
+            # All news sources which are due are collected together.
+            due_sources = []
+            while due and due[0][0] <= now:
+                due_sources.append(heapq.heappop(due))
+            with stage("harvest", sort = self.sort_by_var):
+                self.harvest([news_source for due_time, news_source, interval in due_sources])
+
+            finished = time.monotonic()
+            for due_time, news_source, interval in due_sources:
+                next_interval = (interval if interval is not None else self.poll_interval)
+                if next_interval > 0:
+                    heapq.heappush(due, (finished + next_interval, news_source, interval))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+
+# Importing the Python modules, the dependencies of the HTTP cache.
+import os
+import json
+import time
+import hashlib
+import threading
+import urllib.parse
+import email.utils
+from AtomicFile import write_atomic
+from Instrumentation import metrics
+
+# Class for the on-disk HTTP response cache.
+class HttpCache:
+    """The HttpCache keeps server responses on disk, so that a URL which has not changed is not downloaded
+       again. Responses are stored with their ETag and Last-Modified headers, which are sent back to the
+       server as a conditional request, a 304 response is then answered from disk. Responses which are still
+       fresh according to their Cache-Control or Expires headers are answered from disk without a request.
+       The least recently used responses are removed once the cache is larger than max_size bytes. Stored
+       responses are also used when a request fails, so the cache can be used offline."""
+
+    """Query parameters which are removed from the URL before it is stored, so the API key is not written to disk."""
+    private_parameters = ("apiKey",)
+
+    def __init__(self, directory, max_size = 256 * 1024 * 1024, offline = False):
+        """The initiation/constructor method for the HttpCache class. No requests are made if offline is True."""
+
+        self.directory = directory
+        self.max_size = max_size
+        self.offline = offline
+        os.makedirs(self.directory, exist_ok = True)
+
+        # Counters of how each request was answered.
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stale = 0
+
+        self.lock = threading.Lock()
+
+        # The size of every stored response is kept, so the size of the cache is known without reading the directory again.
+        self.sizes = {}
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".body"):
+                self.sizes[file_name[:-5]] = os.path.getsize(os.path.join(self.directory, file_name))
+        self.size = sum(self.sizes.values())
+
+    # Method is used to count how a request was answered.
+    def count(self, counter):
+        """This method increases one of the counters of how requests were answered, it is also counted in the
+           metrics of the application."""
+
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+        metrics.count("newsfeed_cache_requests_total", result = counter)
+
+    # Method is used to remove private query parameters from a URL.
+    def public_url(self, url):
+        """This method returns the URL without the query parameters which should not be written to disk."""
+
+        parts = urllib.parse.urlsplit(url)
+        query = [(name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values = True)
+                 if name not in self.private_parameters]
+        return urllib.parse.urlunsplit(parts._replace(query = urllib.parse.urlencode(query)))
+
+    # Method is used to find the key of a URL.
+    def key(self, url):
+        """This method returns the key under which the response of the URL is stored. The key includes the
+           private query parameters, so responses for different API keys are kept apart."""
+
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    # Method is used to find the stored response of a URL.
+    def lookup(self, url):
+        """This method returns the metadata of the stored response of the URL, None is returned if the
+           response is not stored."""
+
+        try:
+            with open(os.path.join(self.directory, self.key(url) + ".meta"), "r") as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+
+    # Method is used to read the body of a stored response.
+    def read_body(self, url):
+        """This method returns the body of the stored response of the URL and marks it as recently used."""
+
+        file_name = os.path.join(self.directory, self.key(url) + ".body")
+        with open(file_name, "rb") as body_file:
+            body = body_file.read()
+        try:
+            os.utime(file_name)
+        except OSError:
+            pass
+        return body
+
+    # Method is used to read the freshness lifetime of a response.
+    def freshness(self, headers):
+        """This method returns the number of seconds a response stays fresh and whether it may be stored at all."""
+
+        directives = {}
+        for directive in (headers.get("Cache-Control") or "").split(","):
+            name, separator, value = directive.strip().partition("=")
+            if name:
+                directives[name.lower()] = value.strip('"')
+
+        if "no-store" in directives:
+            return 0, False
+        if "no-cache" in directives:
+            return 0, True
+        if "max-age" in directives:
+            try:
+                return max(0, int(directives["max-age"])), True
+            except ValueError:
+                return 0, True
+        if headers.get("Expires"):
+            try:
+                expires = email.utils.parsedate_to_datetime(headers["Expires"]).timestamp()
+                return max(0, int(expires - time.time())), True
+            except (TypeError, ValueError):
+                return 0, True
+        return 0, True
+
+    # Method is used to store a response.
+    def store(self, url, headers, body):
+        """This method stores the response of the URL. The response is not stored if its Cache-Control header
+           contains no-store."""
+
+        max_age, storable = self.freshness(headers)
+        if not storable:
+            return
+
+        key = self.key(url)
+        metadata = {"URL": (self.public_url(url)), "ETag": (headers.get("ETag")), "Last-Modified": (headers.get("Last-Modified")),
+                    "Stored": (time.time()), "Max-Age": (max_age), "Size": (len(body))}
+
+        # The files are written atomically, so a reader never sees a partial response.
+        write_atomic(os.path.join(self.directory, key + ".body"), body)
+        write_atomic(os.path.join(self.directory, key + ".meta"), json.dumps(metadata))
+
+        with self.lock:
+            self.size = self.size - self.sizes.get(key, 0) + len(body)
+            self.sizes[key] = len(body)
+        self.evict()
+
+    # Method is used to mark a stored response as fresh again.
+    def refresh(self, url, metadata, headers):
+        """This method updates the stored response of the URL after the server answered 304 Not Modified."""
+
+        max_age, storable = self.freshness(headers)
+        metadata["Stored"] = time.time()
+        metadata["Max-Age"] = max_age
+        metadata["ETag"] = (headers.get("ETag") or metadata.get("ETag"))
+        metadata["Last-Modified"] = (headers.get("Last-Modified") or metadata.get("Last-Modified"))
+        write_atomic(os.path.join(self.directory, self.key(url) + ".meta"), json.dumps(metadata))
+
+    # Method is used to remove the least recently used responses.
+    def evict(self):
+        """This method removes the least recently used responses until the cache is no larger than max_size."""
+
+        with self.lock:
+            if self.size <= self.max_size:
+                return
+
+            # Responses are ordered by the time their body was last used.
+            used = []
+            for key in self.sizes:
+                try:
+                    used.append((os.path.getmtime(os.path.join(self.directory, key + ".body")), key))
+                except OSError:
+                    used.append((0, key))
+            used.sort()
+
+            for last_used, key in used:
+                if self.size <= self.max_size:
+                    break
+                for extension in (".body", ".meta"):
+                    try:
+                        os.remove(os.path.join(self.directory, key + extension))
+                    except OSError:
+                        pass
+                self.size = self.size - self.sizes.pop(key)
+
+    # Method is used to change the size of the cache.
+    def resize(self, max_size):
+        """This method changes the maximum size of the cache in bytes, responses are removed at once if the cache
+           is larger."""
+
+        self.max_size = max_size
+        self.evict()
+
+    # Method is used to make a request through the cache.
+    def request(self, url, send_request, headers = None):
+        """This method returns the body of the response of the URL. A fresh stored response is returned without
+           a request. Otherwise send_request(url, headers) is called with the conditional request headers and must
+           return the status, headers and body of the server response. A stored response is returned if the
+           server answers 304, or if the request fails and a response has been stored before. An OSError is
+           raised if the request fails and no response has been stored."""
+
+        headers = dict(headers or {})
+        metadata = self.lookup(url)
+
+        # A fresh response, or any stored response when offline, is returned without a request.
+        if metadata is not None and (self.offline or time.time() - metadata["Stored"] < metadata["Max-Age"]):
+            try:
+                body = self.read_body(url)
+                self.count("hits")
+                return body
+            except OSError:
+                metadata = None
+        if self.offline:
+            raise OSError("Not Stored In Cache: " + self.public_url(url))
+
+        # The validators of the stored response are sent with the request.
+        if metadata is not None:
+            if metadata.get("ETag"):
+                headers["If-None-Match"] = metadata["ETag"]
+            if metadata.get("Last-Modified"):
+                headers["If-Modified-Since"] = metadata["Last-Modified"]
+
+        try:
+            status, response_headers, body = send_request(url, headers)
+        except OSError:
+            if metadata is None:
+                raise
+            self.count("stale")
+            return self.read_body(url)
+
+        if status == 304 and metadata is not None:
+            self.count("revalidated")
+            self.refresh(url, metadata, response_headers)
+            return self.read_body(url)
+
+        # The stored response is returned if the server fails.
+        if status >= 500 and metadata is not None:
+            self.count("stale")
+            return self.read_body(url)
+        if status >= 400:
+            raise OSError("HTTP Error " + str(status) + ": " + self.public_url(url))
+
+        self.count("misses")
+        self.store(url, response_headers, body)
+        return body
@@ -0,0 +1,318 @@
+
+# Importing the Python modules, the dependencies of the instrumentation.
+import os
+import json
+import time
+import bisect
+import threading
+import contextlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+"""The upper bounds in seconds of the buckets every timing is counted in."""
+timer_buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Function is used to create the key of a set of labels.
+def label_key(labels):
+    """This function returns the labels as a sorted tuple of pairs of the name and value of each label, so the
+       same labels always give the same key."""
+
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+# Function is used to write the labels of a metric.
+def format_labels(key, extra = ()):
+    """This function returns the labels of a metric in the Prometheus text format, for example
+       {source="bbc-news"}, an empty string is returned if there are no labels."""
+
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = [name + "=\"" + value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") + "\"" for name, value in pairs]
+    return "{" + ",".join(escaped) + "}"
+
+# Class for the metrics of the application.
+class Metrics:
+    """The Metrics are the counters and timers of every stage of the application. A counter adds up a number,
+       such as the articles or bytes collected, and a timer counts the number of timings, their sum, the
+       longest and the number in each of the timer_buckets, so percentiles can be estimated. Every counter and
+       timer is kept for each set of labels it was given, for example for each news source. Counting takes a
+       lock for a moment, so the metrics may be updated by any thread."""
+
+    def __init__(self):
+        """The initiation/constructor method for the Metrics class."""
+
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.timers = {}
+
+    # Method is used to add to a counter.
+    def count(self, name, value = 1, **labels):
+        """This method adds the value to the counter of the name and labels."""
+
+        key = (name, label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    # Method is used to add a timing to a timer.
+    def observe(self, name, seconds, **labels):
+        """This method adds a timing in seconds to the timer of the name and labels."""
+
+        key = (name, label_key(labels))
+        with self.lock:
+            timer = self.timers.get(key)
+            if timer is None:
+                timer = self.timers[key] = {"Count": 0, "Seconds": 0.0, "Max": 0.0, "Buckets": [0] * (len(timer_buckets) + 1)}
+            timer["Count"] = timer["Count"] + 1
+            timer["Seconds"] = timer["Seconds"] + seconds
+            timer["Max"] = max(timer["Max"], seconds)
+            timer["Buckets"][bisect.bisect_left(timer_buckets, seconds)] += 1
+
+    # Method is used to time a block of code.
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        """This method times the with block and adds the timing to the timer of the name and labels, also if
+           the block raises an error."""
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    # Method is used to estimate a percentile of a timer.
+    @staticmethod
+    def percentile(timer, fraction):
+        """This method returns the upper bound of the bucket the percentile of the timer falls in, in seconds.
+           The longest timing is returned for the last bucket, None is returned if there are no timings."""
+
+        if timer["Count"] == 0:
+            return None
+        wanted = fraction * timer["Count"]
+        counted = 0
+        for bucket, bucket_count in enumerate(timer["Buckets"]):
+            counted = counted + bucket_count
+            if counted >= wanted and bucket_count:
+                return min(timer["Max"], timer_buckets[bucket]) if bucket < len(timer_buckets) else timer["Max"]
+        return timer["Max"]
+
+    # Method is used to clear the metrics.
+    def reset(self):
+        """This method removes every counter and timer."""
+
+        with self.lock:
+            self.counters = {}
+            self.timers = {}
+
+    # Method is used to take a copy of the metrics.
+    def snapshot(self):
+        """This method returns the metrics as a dictionary which can be written as JSON. Each counter is given
+           with its name, labels and value, each timer with its name, labels, number of timings, total, mean,
+           longest, and estimated p50 and p99 in seconds, in the order of their names."""
+
+        with self.lock:
+            counters = sorted(self.counters.items())
+            timers = sorted((key, dict(timer, Buckets = list(timer["Buckets"]))) for key, timer in self.timers.items())
+        return {"Time": (time.time()),
+                "Counters": ([{"Name": (name), "Labels": (dict(labels)), "Value": (value)} for (name, labels), value in counters]),
+                "Timers": ([{"Name": (name), "Labels": (dict(labels)), "Count": (timer["Count"]), "Seconds": (round(timer["Seconds"], 6)),
+                             "Mean": (round(timer["Seconds"] / timer["Count"], 6)), "Max": (round(timer["Max"], 6)),
+                             "P50": (Metrics.percentile(timer, 0.50)), "P99": (Metrics.percentile(timer, 0.99))}
+                            for (name, labels), timer in timers])}
+
+    # Method is used to write the metrics in the Prometheus text format.
+    def prometheus_text(self):
+        """This method returns the metrics in the Prometheus text exposition format. Counters are written as
+           counters and timers as histograms of the timer_buckets, with their sum and count."""
+
+        with self.lock:
+            counters = sorted(self.counters.items())
+            timers = sorted((key, dict(timer, Buckets = list(timer["Buckets"]))) for key, timer in self.timers.items())
+
+        lines = []
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                typed.add(name)
+                lines.append("# TYPE " + name + " counter")
+            lines.append(name + format_labels(labels) + " " + repr(value))
+        for (name, labels), timer in timers:
+            if name not in typed:
+                typed.add(name)
+                lines.append("# TYPE " + name + " histogram")
+            cumulative = 0
+            for bucket, upper_bound in enumerate(timer_buckets):
+                cumulative = cumulative + timer["Buckets"][bucket]
+                lines.append(name + "_bucket" + format_labels(labels, [("le", repr(upper_bound))]) + " " + str(cumulative))
+            lines.append(name + "_bucket" + format_labels(labels, [("le", "+Inf")]) + " " + str(timer["Count"]))
+            lines.append(name + "_sum" + format_labels(labels) + " " + repr(timer["Seconds"]))
+            lines.append(name + "_count" + format_labels(labels) + " " + str(timer["Count"]))
+        return "\n".join(lines) + "\n"
+
+    # Method is used to write the metrics to a file.
+    def dump(self, file_name):
+        """This method writes the snapshot of the metrics to a JSON file."""
+
+        with open(file_name, "w") as metrics_file:
+            json.dump(self.snapshot(), metrics_file, indent = 4)
+
+# Class for the tracer of the stages of the application.
+class Tracer:
+    """The Tracer writes a span for every stage of the application which is timed, with the time it started,
+       how long it took, the thread it ran on and its labels. Spans are written to a file in the JSON array
+       format of the Chrome trace viewer, which may be left unterminated, so the file can be opened in
+       chrome://tracing or Perfetto at any time. No spans are written until a file is opened."""
+
+    def __init__(self, file_name = None):
+        """The initiation/constructor method for the Tracer class. Tracing starts at once if a file name is given."""
+
+        self.lock = threading.Lock()
+        self.file_name = None
+        self.trace_file = None
+        if file_name is not None:
+            self.open(file_name)
+
+    # Method is used to check if spans are written.
+    def enabled(self):
+        """This method returns True if spans are written to a file."""
+
+        return self.trace_file is not None
+
+    # Method is used to start writing spans to a file.
+    def open(self, file_name):
+        """This method starts writing spans to the end of the file, the file is created if it does not exist.
+           Tracing to another file is stopped first."""
+
+        with self.lock:
+            if self.file_name == file_name and self.trace_file is not None:
+                return
+            if self.trace_file is not None:
+                self.trace_file.close()
+            directory = os.path.dirname(file_name)
+            if directory:
+                os.makedirs(directory, exist_ok = True)
+            trace_file = open(file_name, "a")
+            if trace_file.tell() == 0:
+                trace_file.write("[\n")
+            self.file_name = file_name
+            self.trace_file = trace_file
+
+    # Method is used to stop writing spans.
+    def close(self):
+        """This method stops writing spans and closes the file."""
+
+        with self.lock:
+            if self.trace_file is not None:
+                self.trace_file.close()
+            self.file_name = None
+            self.trace_file = None
+
+    # Method is used to trace a block of code.
+    @contextlib.contextmanager
+    def span(self, name, **labels):
+        """This method writes a span of the name and labels for the with block once it has finished. The error
+           raised by the block, if any, is added to the labels of the span."""
+
+        if self.trace_file is None:
+            yield
+            return
+        start_time = time.time()
+        start_counter = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as raised:
+            error = type(raised).__name__
+            raise
+        finally:
+            arguments = dict((label, str(value)) for label, value in labels.items())
+            if error is not None:
+                arguments["error"] = error
+            self.write({"name": (name), "cat": ("newsfeed"), "ph": ("X"), "ts": (int(start_time * 1000000)),
+                        "dur": (int((time.perf_counter() - start_counter) * 1000000)), "pid": (os.getpid()),
+                        "tid": (threading.get_ident()), "args": (arguments)})
+
+    # Method is used to write a span.
+    def write(self, event):
+        """This method writes an event to the trace file, it is flushed at once so the file is always complete."""
+
+        with self.lock:
+            if self.trace_file is not None:
+                self.trace_file.write(json.dumps(event) + ",\n")
+                self.trace_file.flush()
+
+"""The metrics and the tracer shared by every part of the application."""
+metrics = Metrics()
+tracer = Tracer()
+
+# Function is used to time and trace a stage of the application.
+@contextlib.contextmanager
+def stage(name, **labels):
+    """This function times the with block in the timer newsfeed_<name>_seconds of the labels, and writes a span
+       of the name if tracing is on."""
+
+    with tracer.span(name, **labels), metrics.timer("newsfeed_" + name + "_seconds", **labels):
+        yield
+
+# Class for the server of the metrics.
+class MetricsServer:
+    """The MetricsServer serves the metrics on localhost while the application runs without the GUI, in the
+       Prometheus text format from /metrics and as JSON from /metrics.json. It only listens on the loopback
+       interface unless another host is given."""
+
+    def __init__(self, port = 9464, host = "127.0.0.1", registry = None):
+        """The initiation/constructor method for the MetricsServer class. A free port is used if the port is 0."""
+
+        self.registry = (registry or metrics)
+        server = self
+
+        # Class for the handler of the requests made to the server.
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *arguments):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    # Method is used to find the URL of the server.
+    def url(self):
+        """This method returns the URL of the metrics in the Prometheus text format."""
+
+        return "http://" + self.server.server_address[0] + ":" + str(self.server.server_address[1]) + "/metrics"
+
+    # Method is used to start the server.
+    def start(self):
+        """This method starts the server on a background thread."""
+
+        self.thread = threading.Thread(target = self.server.serve_forever, daemon = True)
+        self.thread.start()
+        return self
+
+    # Method is used to stop the server.
+    def stop(self):
+        """This method stops the server."""
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    # Method is used to answer a request.
+    def handle(self, handler):
+        """This method answers a request made to the server."""
+
+        path = handler.path.split("?", 1)[0]
+        if path == "/metrics":
+            status, content_type, body = 200, "text/plain; version=0.0.4; charset=utf-8", self.registry.prometheus_text().encode("utf-8")
+        elif path == "/metrics.json":
+            status, content_type, body = 200, "application/json", json.dumps(self.registry.snapshot(), indent = 4).encode("utf-8")
+        else:
+            status, content_type, body = 404, "text/plain; charset=utf-8", b"Not Found\n"
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
@@ -0,0 +1,174 @@
+
+# Importing the Python modules, the dependencies of the mock News API server.
+import json
+import time
+import hashlib
+import random
+import threading
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Class for the mock News API server.
+class MockNewsAPI:
+    """The MockNewsAPI is a local stand-in for https://newsapi.org/v2/ and the web pages of news articles. The
+       top-headlines and everything endpoints return pages of synthetic articles for any comma-separated news
+       sources, newest first as News API does, so the articles of the news sources are mixed on a page. The
+       sources endpoint lists number_of_sources synthetic news sources, and the web page of every article is
+       served from /articles/<source>/<number>. The responses of the endpoints carry an ETag, a
+       request sending it back in If-None-Match is answered with 304 Not Modified. The latency, size and error
+       rate of the responses can be set, so the application can be measured and tested without making
+       requests to News API."""
+
+    def __init__(self, latency = 0.05, jitter = 0.0, articles_per_source = 20, page_size = 20000, error_rate = 0.0, seed = 0,
+                 number_of_sources = 40, error_status = 500):
+        """The initiation/constructor method for the MockNewsAPI class. The latency and jitter are in seconds,
+           the page size is the number of bytes of each web page and the error rate is the fraction of
+           requests answered with an error, of the error_status."""
+
+        self.latency = latency
+        self.jitter = jitter
+        self.articles_per_source = articles_per_source
+        self.page_size = page_size
+        self.error_rate = error_rate
+        self.number_of_sources = number_of_sources
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.requests = 0
+
+        mock = self
+
+        # Class for the handler of the requests made to the server.
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            # The headers and the body are sent by separate writes, with Nagle's algorithm the body would wait
+            # for the client to acknowledge the headers, adding a delayed ACK to the latency of every response.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                mock.handle(self)
+
+            def log_message(self, *arguments):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    # Method is used to find the URL of the server.
+    def base_url(self):
+        """This method returns the URL to use in place of https://newsapi.org/v2/."""
+
+        return "http://127.0.0.1:" + str(self.server.server_address[1]) + "/v2/"
+
+    # Method is used to start the server.
+    def start(self):
+        """This method starts the server on a background thread."""
+
+        self.thread = threading.Thread(target = self.server.serve_forever, daemon = True)
+        self.thread.start()
+        return self
+
+    # Method is used to stop the server.
+    def stop(self):
+        """This method stops the server."""
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    # Method is used to decide how a request is answered.
+    def roll(self):
+        """This method returns the delay before a request is answered and whether it is answered with an error."""
+
+        with self.random_lock:
+            self.requests = self.requests + 1
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            failed = self.random.random() < self.error_rate
+        return delay, failed
+
+    # Method is used to create the articles of a news source.
+    def articles(self, news_source, sort):
+        """This method returns the synthetic articles of a news source in the format of News API."""
+
+        base_url = "http://127.0.0.1:" + str(self.server.server_address[1]) + "/articles/"
+        articles = []
+        for number in range(self.articles_per_source):
+            articles.append({"source": {"id": news_source, "name": news_source},
+                             "author": "Author " + str(number % 7),
+                             "title": news_source + " " + sort + " story " + str(number) + " about markets and elections",
+                             "description": "Synthetic description of story " + str(number) + " from " + news_source + ".",
+                             "url": base_url + news_source + "/" + str(number),
+                             "publishedAt": "2017-12-28T%02d:%02d:00Z" % (number // 60 % 24, number % 60)})
+        return articles
+
+    # Method is used to create the web page of an article.
+    def web_page(self, path):
+        """This method returns the web page of an article, padded to the page size. As on a real news site about
+           half of the web page is scripts, navigation, adverts and links to other articles."""
+
+        boilerplate = ("<script>var tracking = {\"page\": \"" + path + "\", \"slots\": [1, 2, 3]};</script>"
+                       "<div class=\"advert\"><a href=\"/ads\"><img src=\"/ads/banner.png\"></a></div>"
+                       "<aside class=\"related\"><a href=\"/other\">Another headline worth reading</a></aside>")
+        html = ("<html><head><title>" + path + "</title><meta name=\"author\" content=\"Author\"></head><body>"
+                "<nav>Home | World | Business</nav><article><h1>" + path + "</h1><p class=\"byline\">By Author</p>")
+        paragraph = "<p>Synthetic article text for " + path + ", with commas, written to be long enough to score. </p>"
+        repeats = max(1, (self.page_size - len(html)) // (len(paragraph) + len(boilerplate)))
+        html = html + paragraph * repeats + "</article>" + boilerplate * repeats + "</body></html>"
+        return html.encode("utf-8")
+
+    # Method is used to answer a request.
+    def handle(self, handler):
+        """This method answers a request made to the server."""
+
+        delay, failed = self.roll()
+        time.sleep(delay)
+
+        parts = urllib.parse.urlsplit(handler.path)
+        query = urllib.parse.parse_qs(parts.query)
+        if failed:
+            code = {401: "apiKeyInvalid", 429: "rateLimited"}.get(self.error_status, "unexpectedError")
+            status, content_type, body = self.error_status, "application/json", ('{"status": "error", "code": "' + code + '"}').encode("utf-8")
+        elif parts.path in ("/v2/top-headlines", "/v2/everything"):
+            sort = "top" if parts.path.endswith("top-headlines") else "latest"
+            articles = []
+            for news_source in query.get("sources", [""])[0].split(","):
+                articles.extend(self.articles(news_source, sort))
+            articles.sort(key = lambda article: article["publishedAt"], reverse = True)
+
+            # Only the articles published since the from time are returned, if it is asked for.
+            if "from" in query:
+                articles = [article for article in articles if article["publishedAt"][:19] >= query["from"][0][:19]]
+
+            # The articles are paged as by News API, 20 on a page unless another page size is asked for.
+            page_size = int(query.get("pageSize", ["20"])[0])
+            page = int(query.get("page", ["1"])[0])
+            body = json.dumps({"status": "ok", "totalResults": len(articles),
+                               "articles": articles[(page - 1) * page_size:page * page_size]}).encode("utf-8")
+            status, content_type = 200, "application/json"
+        elif parts.path == "/v2/sources":
+            categories = ["business", "entertainment", "general", "health", "science", "sports", "technology"]
+            countries = ["au", "gb", "us"]
+            sources = [{"id": ("source-" + str(number)), "name": ("Source " + str(number)), "description": (""),
+                        "url": ("http://localhost/source-" + str(number)), "category": (categories[number % len(categories)]),
+                        "language": ("en"), "country": (countries[number % len(countries)])} for number in range(self.number_of_sources)]
+            body = json.dumps({"status": "ok", "sources": sources}).encode("utf-8")
+            status, content_type = 200, "application/json"
+        elif parts.path.startswith("/articles/"):
+            status, content_type, body = 200, "text/html; charset=utf-8", self.web_page(parts.path)
+        else:
+            status, content_type, body = 404, "application/json", b'{"status": "error", "code": "notFound"}'
+
+        # The responses of the endpoints are tagged, a response the client already has is not sent again.
+        headers = {"Content-Type": (content_type)}
+        if status == 200 and parts.path.startswith("/v2/"):
+            headers["ETag"] = "\"" + hashlib.sha1(body).hexdigest() + "\""
+            if handler.headers.get("If-None-Match") == headers["ETag"]:
+                status, body = 304, b""
+
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
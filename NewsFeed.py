@@ -1,15 +1,28 @@
 
 # Importing the Python modules, the dependencies of the application.
-import random
 import os
 import sys
-import json
 import time
-import urllib.request
-import subprocess
-from bs4 import BeautifulSoup
+import multiprocessing
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
+from PyQt5.QtGui import QDesktopServices
+from FetchEngine import FetchEngine, archive_directory
+from SaveEngine import SaveEngine, save_modes
+from ArticleStore import ArticleStore
+from SearchIndex import SearchIndex
+from HttpCache import HttpCache
+from PageStore import PageStore
+from Deduplication import HighWaterMarks
+from SourceCatalogue import SourceCatalogue
+from Configuration import ConfigurationError, ConfigurationWatcher, configuration_file, load_configuration, create_configuration_file
+from Instrumentation import metrics, tracer, stage
+from Database import ArchiveDatabase
+from Resilience import RetryPolicy, CircuitBreaker
+from RateLimiter import RateLimiter, USER_PRIORITY, SCHEDULED_PRIORITY
+from Cancellation import CancellationToken
+import ArchiveFormat
+from ArchiveIndex import ArchiveIndex
 
 # Main algorithm.
 def run():
@@ -18,7 +31,10 @@ def run():
 
     application = QApplication(sys.argv)
     gui = MainWindow()
-    sys.exit(application.exec_())
+    exit_code = application.exec_()
+    if MainWindow.rate_limiter is not None:
+        MainWindow.rate_limiter.close()
+    sys.exit(exit_code)
 
 # Class for the NewsFeed GUI.
 class MainWindow(QMainWindow):
@@ -31,6 +47,13 @@ class MainWindow(QMainWindow):
     """This list contains all news sources that news articles will be collected from."""
     news_sources = []
 
+    """The source catalogue lists the news sources offered by News API by category, country and language. It is kept
+       in the archive and collected again in the background once it is older than source_catalogue_ttl seconds. The
+       Categories combobox is filled from it, each of its entries is the category and country of the news sources selected."""
+    source_catalogue = None
+    source_catalogue_ttl = 7 * 24 * 60 * 60
+    category_selections = {}
+
     """This variable decides if whether the top or the latest news articles from a given news sources will be collected."""
     sort_by_var = "top"
 
@@ -39,13 +62,111 @@ class MainWindow(QMainWindow):
     article_list = []
     selected_articles = []
 
+    """The article store keeps the news articles of the JSON files in memory, the files are only read again once they have changed."""
+    article_store = ArticleStore()
+
+    """The search index is used by the "Filter" button to search all articles in the archive. The archive is indexed
+       the first time the "Filter" button is pressed, afterwards new JSON files are indexed as they are created."""
+    search_index = SearchIndex(article_store)
+    archive_indexed = False
+
+    """Articles are displayed to the GUI as a single HTML document. The first page of articles is displayed at once,
+       the remaining articles are appended a page of first_page_articles at a time, each once the previous page has
+       been drawn. The render generation is increased every time articles are displayed, so the remaining articles
+       of an old display are not appended. The number of articles still to be appended is kept."""
+    first_page_articles = 50
+    render_generation = 0
+    pending_articles = 0
+
+    """If incremental display is on, the articles of each news source are displayed as soon as the news source has
+       been collected, rather than once every news source has been collected."""
+    incremental_display = True
+
+    """The archive index opened by the "Load" button. Only the articles of the archive which are scrolled into
+       view are decoded, a page of first_page_articles articles at a time."""
+    archive_index = None
+    archive_selection = None
+    archive_position = 0
+    archive_generation = 0
+
     """This variable contains the value of the progressbar."""
     progress_bar_value = 0
 
+    """These variables limit the number of URL requests in flight at once, in total and to a single host."""
+    max_concurrent_requests = 8
+    max_requests_per_host = 8
+
+    """This variable contains the number of news sources collected by a single request to News API, at most 20."""
+    sources_per_request = 20
+
+    """This variable contains the number of articles kept for each news source, fewer articles need fewer pages for a batch."""
+    articles_per_source = 20
+
+    """If incremental latest is on, the "Latest" articles of a news source are only collected since the newest article
+       collected before, its high-water mark, and added to the file of the day. The marks are kept in the archive."""
+    incremental_latest = True
+    high_water_marks = None
+
+    """These variables contain the number of threads parsing web pages while articles are saved offline, and the number
+       of worker processes parsing the web pages of large saves. There is a worker process for each core if
+       parse_processes is None, and web pages are always parsed by threads if it is 0."""
+    max_parsers = 2
+    parse_processes = None
+
+    """The HTTP cache keeps the server responses of News API and the web pages of articles in the archive, so
+       responses which have not changed are not downloaded again. The size of the cache is limited in bytes."""
+    http_cache = None
+    http_cache_size = 256 * 1024 * 1024
+
+    """These variables contain the number of seconds to wait for a connection and for data from News API, and the
+       number of times a failed request is made. A news source which keeps failing is skipped by the circuit breaker."""
+    connect_timeout = 5
+    read_timeout = 20
+    max_attempts = 3
+    circuit_breaker = None
+
+    """The rate limiter lets through at most requests_per_second requests to News API, with bursts of up to
+       request_burst requests, and no more than daily_quota requests a day. The daily quota is shared with the
+       harvester through a ledger in the archive."""
+    requests_per_second = 5
+    request_burst = 10
+    daily_quota = 1000
+    rate_limiter = None
+
+    """The storage backend decides if whether articles are archived as JSON files ("json") or in a SQLite database ("sqlite")."""
+    storage_backend = "json"
+    database = None
+
+    """The archive format decides how the articles of each news source are written to the archive, as an indented
+       JSON file ("json") or as line-delimited JSON ("ndjson"), which may be compressed ("ndjson.gz", "ndjson.zst")."""
+    archive_format = "json"
+
+    """The page store keeps the web pages of all articles saved offline, so an article is never downloaded twice and
+       identical web pages are stored once."""
+    page_store = None
+
+    """The save mode decides how web pages are saved offline, as downloaded ("raw"), rewritten ("rewrite") or with only
+       the text of the article extracted ("extract"). It is choosen for each save with the SaveMode combobox. The
+       parser backend of BeautifulSoup is lxml if it is installed, unless html_parser names another."""
+    save_mode = "raw"
+    save_mode_names = {"raw": "Whole Page", "rewrite": "Rewritten Page", "extract": "Article Only"}
+    html_parser = None
+
+    """The configuration file is watched by the ConfigurationThread every reload_interval seconds, its settings are
+       loaded again once it has changed. Searches and saves started afterwards use the new settings."""
+    reload_interval = 2.0
+
+    """The stats panel shows the metrics of the application, it is created the first time the "Stats" button is pressed."""
+    StatsDialog = None
+
     """This variable contains the working directory of the application. The working directory of the application is
        identical to the directory where NewsAPI.exe is located."""
     working_directory = (os.getcwd())
-    executable_directory = (working_directory + "\\" + "NewsFeed.exe")
+    executable_directory = (os.path.join(working_directory, "NewsFeed.exe"))
+
+    """This variable contains the directory of the articles displayed, the archive directory of the current date
+       after a search or the directory choosen with the "Load" button. The process working directory is never changed."""
+    current_directory = (working_directory)
 
     # The initiation method is ran once an instance of the MainWindow class is created.
     def __init__(self, parent = None):
@@ -65,6 +186,7 @@ class MainWindow(QMainWindow):
 
         # Signals between the Main Thread and the Search Articles Thread are created.
         self.SearchArticlesThread.display_articles_signal.connect(MainWindow.display_articles)
+        self.SearchArticlesThread.articles_batch_signal.connect(MainWindow.append_article_batch)
         self.SearchArticlesThread.clear_textbox_signal.connect(MainWindow.clear_textbox)
         self.SearchArticlesThread.update_statusbar_signal.connect(MainWindow.update_statusbar_articles_thread)
         self.SearchArticlesThread.update_progressbar_signal.connect(MainWindow.update_progressbar)
@@ -80,6 +202,15 @@ class MainWindow(QMainWindow):
         self.SaveArticlesThread.terminate_signal.connect(MainWindow.terminate_event_handler)
         self.SaveArticlesThread.no_connection_signal.connect(MainWindow.no_internet_connection)
 
+        # Instance of the SourceCatalogueThread is created, it collects the source catalogue in the background.
+        MainWindow.SourceCatalogueThread = SourceCatalogueThread()
+        self.SourceCatalogueThread.refreshed_signal.connect(MainWindow.source_catalogue_refreshed)
+
+        # Instance of the ConfigurationThread is created, it watches the configuration file.
+        MainWindow.ConfigurationThread = ConfigurationThread()
+        self.ConfigurationThread.reloaded_signal.connect(MainWindow.configuration_reloaded)
+        self.ConfigurationThread.error_signal.connect(MainWindow.configuration_error)
+
         # Toolbar, Buttons and widgets are created.
         MainWindow.Toolbar = self.addToolBar("Toolbar")
         MainWindow.Search_Button = QAction("Search", self)
@@ -87,57 +218,33 @@ class MainWindow(QMainWindow):
         MainWindow.Cancel_Button = QAction("Cancel", self)
         MainWindow.Save_Button = QAction("Save Articles", self)
         MainWindow.Load_Button = QAction("Load Articles", self)
+        MainWindow.Open_Page_Button = QAction("Open Saved Page", self)
         MainWindow.Filter_Button = QAction("Filter", self)
         MainWindow.Open_Config_Button = QAction("Open Config", self)
+        MainWindow.Stats_Button = QAction("Stats", self)
         MainWindow.Filter_Bar = QLineEdit(self)
         MainWindow.Categories = QComboBox(self)
-        MainWindow.Categories.addItem("Default")
-        MainWindow.Categories.addItem("All")
-        MainWindow.Categories.addItem("Business")
-        MainWindow.Categories.addItem("Entertainment")
-        MainWindow.Categories.addItem("Gaming")
-        MainWindow.Categories.addItem("Health")
-        MainWindow.Categories.addItem("Music")
-        MainWindow.Categories.addItem("Politics")
-        MainWindow.Categories.addItem("Science")
-        MainWindow.Categories.addItem("Sport")
-        MainWindow.Categories.addItem("Technology")
-        MainWindow.Categories.addItem("Argentina")
-        MainWindow.Categories.addItem("Australia")
-        MainWindow.Categories.addItem("Brazil")
-        MainWindow.Categories.addItem("Canada")
-        MainWindow.Categories.addItem("China")
-        MainWindow.Categories.addItem("France")
-        MainWindow.Categories.addItem("Germany")
-        MainWindow.Categories.addItem("India")
-        MainWindow.Categories.addItem("Ireland")
-        MainWindow.Categories.addItem("Israel")
-        MainWindow.Categories.addItem("Italy")
-        MainWindow.Categories.addItem("Netherlands")
-        MainWindow.Categories.addItem("Norway")
-        MainWindow.Categories.addItem("Pakistan")
-        MainWindow.Categories.addItem("Russia")
-        MainWindow.Categories.addItem("Saudi Arabia")
-        MainWindow.Categories.addItem("South Africa")
-        MainWindow.Categories.addItem("Spain")
-        MainWindow.Categories.addItem("Sweden")
-        MainWindow.Categories.addItem("United Kingdom")
-        MainWindow.Categories.addItem("United States")
         MainWindow.SortBy = QComboBox(self)
         MainWindow.SortBy.addItem("Top")
         MainWindow.SortBy.addItem("Latest")
+        MainWindow.SaveMode = QComboBox(self)
+        for save_mode in save_modes:
+            MainWindow.SaveMode.addItem(MainWindow.save_mode_names[save_mode])
         MainWindow.ProgressBar = QProgressBar(self)
 
         # Buttons and widgets are connected to their class methods.
         MainWindow.Search_Button.triggered.connect(MainWindow.search_button_handler)
         MainWindow.Refresh_Button.triggered.connect(MainWindow.refresh_event_handler)
-        MainWindow.Cancel_Button.triggered.connect(MainWindow.terminate_event_handler)
+        MainWindow.Cancel_Button.triggered.connect(MainWindow.cancel_event_handler)
         MainWindow.Save_Button.triggered.connect(MainWindow.save_button_handler)
         MainWindow.Load_Button.triggered.connect(MainWindow.load_button_handler)
+        MainWindow.Open_Page_Button.triggered.connect(MainWindow.open_page_button_handler)
         MainWindow.Filter_Button.triggered.connect(MainWindow.filter_button_handler)
         MainWindow.Open_Config_Button.triggered.connect(MainWindow.open_config_button_event_handler)
+        MainWindow.Stats_Button.triggered.connect(MainWindow.stats_button_handler)
         MainWindow.Categories.activated[str].connect(MainWindow.categories_event_handler)
         MainWindow.SortBy.activated[str].connect(MainWindow.sort_by_event_handler)
+        MainWindow.SaveMode.activated[str].connect(MainWindow.save_mode_event_handler)
 
         # Widgets are added to the toolbar.
         MainWindow.Toolbar.addWidget(MainWindow.Categories)
@@ -148,26 +255,25 @@ class MainWindow(QMainWindow):
         MainWindow.Toolbar.addWidget(MainWindow.ProgressBar)
         MainWindow.Toolbar.addAction(MainWindow.Filter_Button)
         MainWindow.Toolbar.addWidget(MainWindow.Filter_Bar)
+        MainWindow.Toolbar.addWidget(MainWindow.SaveMode)
         MainWindow.Toolbar.addAction(MainWindow.Save_Button)
         MainWindow.Toolbar.addAction(MainWindow.Load_Button)
+        MainWindow.Toolbar.addAction(MainWindow.Open_Page_Button)
         MainWindow.Toolbar.addAction(MainWindow.Open_Config_Button)
+        MainWindow.Toolbar.addAction(MainWindow.Stats_Button)
 
         # Textbox is created as the CentralWidget.
         MainWindow.Textbox = QTextBrowser(self)
         self.setCentralWidget(MainWindow.Textbox)
         MainWindow.Textbox.setReadOnly(True)
         MainWindow.Textbox.setOpenExternalLinks(True)
-        MainWindow.Textbox.insertHtml("<b> NewsFeed 1.0.0 (64-bit) </b>")
-        MainWindow.Textbox.insertPlainText("\n")
-        MainWindow.Textbox.insertHtml("<b> Prithvi R, powered by News API </b>")
-        MainWindow.Textbox.insertPlainText("\n")
-        MainWindow.Textbox.insertHtml("<b>" + MainWindow.executable_directory + "</b>")
-        MainWindow.Textbox.insertPlainText("\n")
-        MainWindow.Textbox.insertPlainText("")
-        MainWindow.Textbox.insertPlainText("\n")
-
-        # Statusbar is added.
+        MainWindow.Textbox.setHtml(MainWindow.header_html())
+        MainWindow.Textbox.verticalScrollBar().valueChanged.connect(MainWindow.archive_scrolled)
+
+        # Statusbar is added, the number of requests left today is shown on the right.
         MainWindow.StatusBar = self.statusBar()
+        MainWindow.QuotaLabel = QLabel(self)
+        MainWindow.StatusBar.addPermanentWidget(MainWindow.QuotaLabel)
 
         # MainWindow is displayed to the screen.
         self.show()
@@ -183,15 +289,116 @@ class MainWindow(QMainWindow):
         # Configuration file is loaded.
         MainWindow.load_configuration_file()
 
+        # SaveMode combobox shows the save mode of the configuration file.
+        if MainWindow.save_mode in MainWindow.save_mode_names:
+            MainWindow.SaveMode.setCurrentText(MainWindow.save_mode_names[MainWindow.save_mode])
+
+        # Source catalogue is loaded from the archive and the Categories combobox is filled from it.
+        MainWindow.source_catalogue = SourceCatalogue(os.path.join(MainWindow.working_directory, "Archive", "Sources.json"),
+                                                      MainWindow.source_catalogue_ttl)
+        MainWindow.fill_categories()
+
+        # HTTP cache is created in the archive.
+        MainWindow.http_cache = HttpCache(os.path.join(MainWindow.working_directory, "Archive", "Cache"), MainWindow.http_cache_size)
+
+        # Archive database is opened if articles are archived in a SQLite database.
+        MainWindow.open_database()
+
+        # Page store of the articles saved offline is loaded.
+        MainWindow.page_store = PageStore(os.path.join(MainWindow.working_directory, "Archive", "Pages"))
+
+        # High-water marks of the latest articles of the news sources are loaded.
+        MainWindow.high_water_marks = HighWaterMarks(os.path.join(MainWindow.working_directory, "Archive", "HighWater.json"))
+
+        # Circuit breaker of the news sources is loaded.
+        MainWindow.circuit_breaker = CircuitBreaker(os.path.join(MainWindow.working_directory, "Archive", "Circuits.json"))
+
+        # Rate limiter and the ledger of the daily quota are loaded.
+        MainWindow.rate_limiter = RateLimiter(MainWindow.requests_per_second, MainWindow.request_burst, MainWindow.daily_quota,
+                                              os.path.join(MainWindow.working_directory, "Archive", "Quota.json"))
+        MainWindow.update_quota_label()
+
+        # Source catalogue is collected again in the background once it is out of date.
+        if MainWindow.source_catalogue.stale() and MainWindow.APIKEY:
+            MainWindow.SourceCatalogueThread.start()
+
+        # Configuration file is watched from now on, its changes are loaded without restarting the application.
+        MainWindow.ConfigurationThread.start()
+
     # Method is activated once the "Open Config" button is pressed.
     def open_config_button_event_handler():
-        """This method is activated once the "Config" button is pressed. This function opens the default text editor
-           on the user's system using the subprocess module to edit the configuration file."""
+        """This method is activated once the "Config" button is pressed. The configuration file is opened in the
+           default text editor of the user's system, the GUI is not blocked while it is edited. The configuration
+           file is loaded again by the ConfigurationThread once it has been saved."""
 
         print("<GUI Thread Process: Open Configuration File>")
-        config_file = subprocess.Popen(["notepad.exe", (MainWindow.working_directory + "\Config.txt")])
-        config_file.wait()
-        MainWindow.load_configuration_file()
+        file_name = configuration_file(MainWindow.working_directory)
+        if not os.path.exists(file_name):
+            create_configuration_file(file_name)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(file_name))
+
+    # Method is activated once the "Stats" button is pressed.
+    def stats_button_handler():
+        """This method shows the stats panel, the timers and counters of every stage of the application since it
+           was started. The panel does not block the GUI, it is filled again every time the button is pressed and
+           the metrics can be saved as a JSON file from it."""
+
+        print("<GUI Thread Process: Show Stats>")
+        if MainWindow.StatsDialog is None:
+            MainWindow.StatsDialog = QDialog()
+            MainWindow.StatsDialog.setWindowTitle("NewsFeed Stats")
+            MainWindow.StatsDialog.resize(800, 500)
+            MainWindow.StatsBrowser = QTextBrowser(MainWindow.StatsDialog)
+            refresh_button = QPushButton("Refresh", MainWindow.StatsDialog)
+            refresh_button.clicked.connect(MainWindow.stats_button_handler)
+            save_button = QPushButton("Save JSON", MainWindow.StatsDialog)
+            save_button.clicked.connect(MainWindow.save_stats_handler)
+            buttons = QHBoxLayout()
+            buttons.addWidget(refresh_button)
+            buttons.addWidget(save_button)
+            layout = QVBoxLayout(MainWindow.StatsDialog)
+            layout.addWidget(MainWindow.StatsBrowser)
+            layout.addLayout(buttons)
+        MainWindow.StatsBrowser.setHtml(MainWindow.stats_html(metrics.snapshot()))
+        MainWindow.StatsDialog.show()
+        MainWindow.StatsDialog.raise_()
+
+    # Method is used to create the HTML of the stats panel.
+    def stats_html(snapshot):
+        """This method returns the HTML of the stats panel, a table of the timers in milliseconds and a table of
+           the counters of a snapshot of the metrics."""
+
+        def labels_text(labels):
+            return ", ".join(name + "=" + value for name, value in sorted(labels.items()))
+
+        def milliseconds(seconds):
+            return "" if seconds is None else str(round(seconds * 1000, 1))
+
+        html = ["<h3>Timers (ms)</h3><table border=\"1\" cellpadding=\"3\" cellspacing=\"0\"><tr><th>Stage</th><th>Labels</th>"
+                "<th>Count</th><th>Mean</th><th>P50</th><th>P99</th><th>Max</th><th>Total</th></tr>"]
+        for timer in snapshot["Timers"]:
+            html.append("<tr><td>" + timer["Name"] + "</td><td>" + labels_text(timer["Labels"]) + "</td><td>" + str(timer["Count"]) +
+                        "</td><td>" + milliseconds(timer["Mean"]) + "</td><td>" + milliseconds(timer["P50"]) + "</td><td>" +
+                        milliseconds(timer["P99"]) + "</td><td>" + milliseconds(timer["Max"]) + "</td><td>" + milliseconds(timer["Seconds"]) + "</td></tr>")
+        html.append("</table><h3>Counters</h3><table border=\"1\" cellpadding=\"3\" cellspacing=\"0\"><tr><th>Counter</th><th>Labels</th><th>Value</th></tr>")
+        for counter in snapshot["Counters"]:
+            html.append("<tr><td>" + counter["Name"] + "</td><td>" + labels_text(counter["Labels"]) + "</td><td>" + str(counter["Value"]) + "</td></tr>")
+        html.append("</table>")
+        return "".join(html)
+
+    # Method is activated once the "Save JSON" button of the stats panel is pressed.
+    def save_stats_handler():
+        """This method saves a snapshot of the metrics as a JSON file choosen by the user."""
+
+        file_name, file_filter = QFileDialog.getSaveFileName(MainWindow.StatsDialog, "Save Stats",
+                                                             os.path.join(MainWindow.working_directory, "Archive", "Metrics.json"), "JSON (*.json)")
+        if not file_name:
+            return
+        try:
+            metrics.dump(file_name)
+            print("<GUI Thread Process: Stats Saved To " + file_name + ">")
+        except OSError as error:
+            print("<GUI Thread Process: Error: Stats Not Saved: " + str(error) + ">")
 
     # Method is activated once the "Search" button is pressed.
     def search_button_handler():
@@ -205,6 +412,7 @@ class MainWindow(QMainWindow):
         MainWindow.Categories.setEnabled(False)
         MainWindow.Filter_Button.setEnabled(False)
         MainWindow.Save_Button.setEnabled(False)
+        MainWindow.SaveMode.setEnabled(False)
         MainWindow.Load_Button.setEnabled(False)
         MainWindow.Open_Config_Button.setEnabled(False)
         MainWindow.SearchArticlesThread.start()
@@ -222,77 +430,83 @@ class MainWindow(QMainWindow):
         MainWindow.SortBy.setEnabled(False)
         MainWindow.Filter_Button.setEnabled(False)
         MainWindow.Save_Button.setEnabled(False)
+        MainWindow.SaveMode.setEnabled(False)
         MainWindow.Load_Button.setEnabled(False)
         MainWindow.Open_Config_Button.setEnabled(False)
 
     # Method is activated once the "Load" button is pressed.
     def load_button_handler():
         """This method is activated once the "Load" button is pressed. The user enters a directory through
-           a file browser, the method loads all JSON files in the choosen directory and displays the articles
-           contained in the JSON files to the GUI."""
+           a file browser, either an archive day or a directory of archive days such as Archive. The articles
+           of the news sources in the choosen directory are displayed to the GUI through the archive index, so
+           only the articles scrolled into view are decoded. Every article is selected, those not scrolled into
+           view are decoded once they are saved. Articles archived in a database are loaded from it."""
 
         #Console output.
         print("<GUI Thread Process: Load Articles>")
 
         #User inputs directory.
-        try:
-            directory = str(QFileDialog.getExistingDirectory())
-            os.chdir(directory)
-        except OSError:
+        directory = str(QFileDialog.getExistingDirectory())
+        if os.path.isdir(directory):
+            MainWindow.current_directory = directory
+        else:
             print("<GUI Thread Process: Error: No Directory Choosen>")
 
-        #Clear textbox.
-        MainWindow.clear_textbox()
-
         #Reset article list.
         MainWindow.article_list = []
         MainWindow.selected_articles = []
 
-        #Articles in the current directory are displayed.
-        for news_source in MainWindow.news_sources:
-
-            # File name is defined.
-            file_name = (news_source + "-" + MainWindow.sort_by_var + ".json")
-            try:
-
-                # File is opened and the data is loaded.
-                json_file = open(file_name, "r")
-                data = json.load(json_file)
-
-                # Displays articles in the data to the GUI.
-                for article in data:
-                    MainWindow.article_list.append(article["ID"])
-                    MainWindow.selected_articles.append(article["ID"])
-                    MainWindow.Textbox.insertHtml("<h2>" + article["Title"] + "</h2>")
-                    MainWindow.Textbox.insertPlainText("\n")
-
-                    if article["Description"] is "":
-                        pass
-                    elif article["Description"] is None:
-                        pass
-                    else:
-                        MainWindow.Textbox.insertHtml(article["Description"])
-                        MainWindow.Textbox.insertPlainText("\n")
-
-                    link = ("<a href= " + article["URL"] + ">" + article["URL"] + " </a>")
-                    MainWindow.Textbox.insertHtml(link)
-                    MainWindow.Textbox.insertPlainText("\n")
-                    MainWindow.Textbox.insertPlainText("")
-                    MainWindow.Textbox.insertPlainText("\n")
-
-                    # File is closed.
-                    json_file.close()
-
-            # Error code.
-            except:
-                print("<GUI Thread Process: Error: Could Not Find " + file_name + ">")
+        #Articles in the current directory are displayed through the archive index.
+        if MainWindow.database is None:
+            MainWindow.open_archive(MainWindow.current_directory)
+            return
+
+        #Articles in the current directory are loaded from the database.
+        articles, missing_files = MainWindow.article_store.load(MainWindow.current_directory, MainWindow.news_sources, MainWindow.sort_by_var)
+        for file_name in missing_files:
+            print("<GUI Thread Process: Error: Could Not Find " + file_name + ">")
+
+        for article in articles:
+            MainWindow.article_list.append(article.id)
+            MainWindow.selected_articles.append(article.id)
+        MainWindow.render_articles(articles)
+
+    # Method is activated once the "Open Saved Page" button is pressed.
+    def open_page_button_handler():
+        """This method is activated once the "Open Saved Page" button is pressed. The user picks one of the web
+           pages saved offline, newest first, which is written out of the page store as a HTML file to
+           Archive/Pages/Open and opened in the default web browser of the user's system."""
+
+        print("<GUI Thread Process: Open Saved Page>")
+        if MainWindow.page_store is None or not len(MainWindow.page_store):
+            print("<GUI Thread Process: Error: No Saved Pages>")
+            MainWindow.StatusBar.showMessage("No Saved Pages")
+            return
+
+        # Saved pages are listed by title, the most recently saved first, pages may be saved meanwhile.
+        with MainWindow.page_store.lock:
+            entries = list(MainWindow.page_store.entries.values())
+        entries = sorted(entries, key = lambda entry: entry.get("Saved", 0), reverse = True)
+        titles = [str(entry.get("Title") or entry.get("URL") or entry["ID"]) + " [" + str(entry["ID"])[:8] + "]" for entry in entries]
+        title, chosen = QInputDialog.getItem(MainWindow.Textbox, "Open Saved Page", "Saved pages:", titles, 0, False)
+        if not chosen:
+            return
+
+        article_id = entries[titles.index(title)]["ID"]
+        try:
+            file_name = MainWindow.page_store.export_page(article_id, os.path.join(MainWindow.working_directory, "Archive", "Pages", "Open"))
+        except OSError as error:
+            print("<GUI Thread Process: Error: Saved Page Not Opened: " + str(error) + ">")
+            MainWindow.StatusBar.showMessage("Saved Page Not Opened")
+            return
+        QDesktopServices.openUrl(QUrl.fromLocalFile(file_name))
 
     # Method is activated once the "Filter" button is pressed.
     def filter_button_handler():
-        """Finds keywords and phrases in the news articles that are displayed to the GUI.
-           This method searches through the JSON files in the current directory, it identifies
-           the articles in the JSON files which contain the keyword or phrase. It then
-           displays these articles to the GUI."""
+        """Finds keywords and phrases in the news articles of the archive and the current directory.
+           This method searches the search index for the articles which contain the keywords or phrases,
+           ignoring case. Words either side of OR are alternatives and words in quotation marks are searched
+           for as a phrase. It then displays these articles to the GUI, the best matching articles first."""
 
         # Valid characters.
         valid_characters = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "a", "b", "c", "d",
@@ -311,107 +525,55 @@ class MainWindow(QMainWindow):
         # The Searching algorithm.
         if valid_string is True:
 
-            # Textbox is cleared.
-            MainWindow.clear_textbox()
-
             # Selected articles list is reset.
             MainWindow.selected_articles = []
 
             print("<GUI Thread Process: Searched For: " + string + ">")
-            word_found = False
-            for news_source in MainWindow.news_sources:
-
-                # File name is defined.
-                file_name = (news_source + "-" + MainWindow.sort_by_var + ".json")
-                try:
-
-                    # File is opened and the data is loaded.
-                    json_file = open(file_name, "r")
-                    data = json.load(json_file)
-
-                    # Keyword or phrase is found.
-                    for article in data:
-                        if string in article["Title"]:
-                            word_found = True
-                            MainWindow.selected_articles.append(article["ID"])
-                        if string in article["Description"]:
-                            word_found = True
-                            MainWindow.selected_articles.append(article["ID"])
-
-                    # File is closed.
-                    json_file.close()
 
-                # Error code.
-                except:
-                    print("<GUI Thread Process: Error: " + file_name + " Not Found>")
+            # The archive is indexed, files which have not changed are not indexed again.
+            if MainWindow.archive_indexed is False:
+                MainWindow.search_index.index_directory(os.path.join(MainWindow.working_directory, "Archive"), recursive = True)
+                MainWindow.archive_indexed = True
+            MainWindow.search_index.index_directory(MainWindow.current_directory)
 
-            # Remove duplicates in selected articles list.
-            MainWindow.selected_articles = list(set(MainWindow.selected_articles))
+            # Keyword or phrase is found using the search index.
+            articles = MainWindow.search_index.search(string)
+            for article in articles:
+                MainWindow.selected_articles.append(article.id)
 
-            # Selected articles are displayed to the GUI.
-            for news_source in MainWindow.news_sources:
-
-                # File name is defined.
-                file_name = (news_source + "-" + MainWindow.sort_by_var + ".json")
-                try:
-
-                    # File is opened and the data is loaded.
-                    json_file = open(file_name, "r")
-                    data = json.load(json_file)
-
-                    # Contents of the news article is displayed to the GUI.
-                    for article in data:
-
-                        # Checking if the article ID is in the selected articles list.
-                        if article["ID"] in MainWindow.selected_articles:
-
-                            # Displays articles in the data to the GUI.
-                            MainWindow.Textbox.insertHtml("<h2>" + article["Title"] + "</h2>")
-                            MainWindow.Textbox.insertPlainText("\n")
-
-                            if article["Description"] is "":
-                                pass
-                            elif article["Description"] is None:
-                                pass
-                            else:
-                                MainWindow.Textbox.insertHtml(article["Description"])
-                                MainWindow.Textbox.insertPlainText("\n")
-
-                            link = ("<a href= " + article["URL"] + ">" + article["URL"] + " </a>")
-                            MainWindow.Textbox.insertHtml(link)
-                            MainWindow.Textbox.insertPlainText("\n")
-                            MainWindow.Textbox.insertPlainText("")
-                            MainWindow.Textbox.insertPlainText("\n")
-
-                    # File is closed.
-                    json_file.close()
-
-                except:
-                    pass
-
-            # No results.
-            if word_found is False:
-                MainWindow.Textbox.insertHtml("<h2> No Results. </h2>")
+            # Articles are displayed to the GUI, the textbox is replaced.
+            MainWindow.render_articles(articles, "<h2> No Results. </h2>")
 
         # Error code.
         else:
             print("<GUI Thread Process: Error: Invalid String>")
 
     # Method is activated once the "Cancel" button is pressed.
+    def cancel_event_handler():
+        """This method is activated once the "Cancel" button is pressed. It asks all running threads to stop,
+           requests in flight are interrupted and files being written are finished, so the archive is never
+           left half written. Once a thread has stopped it sends the terminate signal."""
+
+        print("<GUI Thread Process: Cancelling>")
+        MainWindow.StatusBar.showMessage("Cancelling...")
+        MainWindow.SearchArticlesThread.cancel_token.cancel()
+        MainWindow.SaveArticlesThread.cancel_token.cancel()
+
+    # Method is activated once a thread has finished.
     def terminate_event_handler():
-        """This method is activated once the "Cancel" button is pressed. It terminates
-           all running threads, enables all buttons and resets the status bar and progress bar."""
+        """This method is activated once a thread has finished or stopped after the "Cancel" button was pressed.
+           It enables all buttons and resets the status bar and progress bar."""
 
         MainWindow.StatusBar.showMessage("")
         MainWindow.ProgressBar.setValue(0)
-        MainWindow.SearchArticlesThread.terminate()
-        MainWindow.SaveArticlesThread.terminate()
+        MainWindow.update_quota_label()
         MainWindow.Search_Button.setEnabled(True)
         MainWindow.Refresh_Button.setEnabled(True)
         MainWindow.Categories.setEnabled(True)
         MainWindow.SortBy.setEnabled(True)
         MainWindow.Filter_Button.setEnabled(True)
         MainWindow.Save_Button.setEnabled(True)
+        MainWindow.SaveMode.setEnabled(True)
         MainWindow.Load_Button.setEnabled(True)
         MainWindow.Open_Config_Button.setEnabled(True)
         print("<GUI Thread Process: Thread Terminated>")
@@ -424,51 +586,19 @@ class MainWindow(QMainWindow):
 
         print("<GUI Thread Process: Refresh>")
 
-        # Clear textbox.
-        MainWindow.clear_textbox()
-
         # Reset article list.
         MainWindow.article_list = []
         MainWindow.selected_articles = []
 
         # Articles in the current directory are displayed.
-        for news_source in MainWindow.news_sources:
+        articles, missing_files = MainWindow.article_store.load(MainWindow.current_directory, MainWindow.news_sources, MainWindow.sort_by_var)
+        for file_name in missing_files:
+            print("<GUI Thread Process: Error: " + file_name + " Not Found>")
 
-            # File name is defined.
-            file_name = (news_source + "-" + MainWindow.sort_by_var + ".json")
-            try:
-
-                # File is opened and the data is loaded.
-                json_file = open(file_name, "r")
-                data = json.load(json_file)
-
-                # News articles in the data are displayed to the GUI.
-                for article in data:
-                    MainWindow.article_list.append(article["ID"])
-                    MainWindow.selected_articles.append(article["ID"])
-                    MainWindow.Textbox.insertHtml("<h2>" + article["Title"] + "</h2>")
-                    MainWindow.Textbox.insertPlainText("\n")
-
-                    if article["Description"] is "":
-                        pass
-                    elif article["Description"] is None:
-                        pass
-                    else:
-                        MainWindow.Textbox.insertHtml(article["Description"])
-                        MainWindow.Textbox.insertPlainText("\n")
-
-                    link = ("<a href= " + article["URL"] + ">" + article["URL"] + " </a>")
-                    MainWindow.Textbox.insertHtml(link)
-                    MainWindow.Textbox.insertPlainText("\n")
-                    MainWindow.Textbox.insertPlainText("")
-                    MainWindow.Textbox.insertPlainText("\n")
-
-                    # File is closed.
-                    json_file.close()
-
-            # Error code.
-            except:
-                print("<GUI Thread Process: Error: " + file_name + " Not Found>")
+        for article in articles:
+            MainWindow.article_list.append(article.id)
+            MainWindow.selected_articles.append(article.id)
+        MainWindow.render_articles(articles)
 
     # Method is activated once the "SortBy" combobox is interacted with.
     def sort_by_event_handler():
@@ -481,195 +611,83 @@ class MainWindow(QMainWindow):
             MainWindow.sort_by_var = ("latest")
         print("<GUI Thread Process: " + sort_by_string_value + " Selected>")
 
+    # Method is activated once the "SaveMode" combobox is interacted with.
+    def save_mode_event_handler():
+        """Event handler for the SaveMode combobox, the save mode is used by the next save."""
+
+        save_mode_string_value = (MainWindow.SaveMode.currentText())
+        for save_mode, name in MainWindow.save_mode_names.items():
+            if name == save_mode_string_value:
+                MainWindow.save_mode = (save_mode)
+        print("<GUI Thread Process: " + save_mode_string_value + " Selected>")
+
     # Method is activated once the "Country" combobox is interacted with.
     def categories_event_handler():
-        """Event handler for the Country combobox."""
+        """Event handler for the Country combobox. The news sources of the category or country selected are
+           found in the source catalogue."""
 
         string_value = (MainWindow.Categories.currentText())
+        print("<GUI Thread Process: " + string_value + " Selected>")
 
         if string_value == "Default":
-            print("<GUI Thread Process: Default Selected>")
             MainWindow.load_configuration_file()
+        elif string_value == "All":
+            MainWindow.news_sources = MainWindow.source_catalogue.all_sources()
+        elif string_value in MainWindow.category_selections:
+            category, country = MainWindow.category_selections[string_value]
+            MainWindow.news_sources = MainWindow.source_catalogue.select(category = category, country = country)
+
+    # Method is used to fill the Categories combobox from the source catalogue.
+    def fill_categories():
+        """This method fills the Categories combobox with the categories and countries of the source catalogue,
+           after the "Default" and "All" entries. The entry selected is kept if it is still in the catalogue."""
+
+        selected = (MainWindow.Categories.currentText())
+        MainWindow.category_selections = {}
+        for category in MainWindow.source_catalogue.categories():
+            MainWindow.category_selections[category.title()] = (category, None)
+        for country in MainWindow.source_catalogue.countries():
+            MainWindow.category_selections.setdefault(SourceCatalogue.country_name(country), (None, country))
+
+        MainWindow.Categories.clear()
+        MainWindow.Categories.addItem("Default")
+        MainWindow.Categories.addItem("All")
+        for string_value in MainWindow.category_selections:
+            MainWindow.Categories.addItem(string_value)
+        if selected:
+            MainWindow.Categories.setCurrentText(selected)
+
+    # Method is used to show the news sources collected from News API.
+    def source_catalogue_refreshed():
+        """This method is called by the SourceCatalogueThread once the source catalogue has been collected again."""
 
-        if string_value == "All":
-            print("<GUI Thread Process: All Selected>")
-            MainWindow.news_sources = [ "abc-news", "abc-news-au", "al-jazeera-english", "aftenposten", "ansa", "argaam", "ars-technica", "ary-news", "associated-press",
-                                        "australian-financial-review", "axios", "bbc-news", "bbc-sport", "bild", "blasting-news-br", "bleacher-report", "bloomberg",
-                                        "breitbart-news", "business-insider", "business-insider-uk", "buzzfeed", "cbc-news", "cbs-news", "cnbc", "cnn", "cnn-es",
-                                        "crypto-coins-news", "daily-mail", "der-tagesspiegel", "die-zeit", "el-mundo", "engadget", "entertainment-weekly", "espn",
-                                        "espn-cric-info", "financial-post", "financial-times", "focus", "football-italia", "fortune", "four-four-two", "fox-news",
-                                        "fox-sports", "globo", "google-news", "google-news-ar", "google-news-au", "google-news-br", "google-news-ca", "google-news-ca",
-                                        "google-news-fr", "google-news-in", "google-news-is", "google-news-it", "google-news-ru", "google-news-sa", "google-news-uk",
-                                        "goteborgs-posten", "gruenderszene", "hacker-news", "handelsblatt", "ign", "il-sole-24-ore", "independent", "infobae", "info-money",
-                                        "la-gaceta", "la-nacion", "la-repubblica", "le-monde", "lenta", "lequipe", "liberation", "marca", "mashable", "medical-news-today",
-                                        "metro", "mirror", "msnbc", "mtv-news", "mtv-news-uk", "national-geographic", "nbc-news", "news24", "new-scientist", "news-com-au",
-                                        "newsweek", "new-york-magazine", "next-big-future", "nfl-news", "nhl-news", "nrk", "politico", "polygon", "rbc", "recode",
-                                        "reuters", "rt", "rte", "rtl-nieuws", "sabq", "spiegel-online", "svenska-dagbladet", "t3n", "talksport", "techcrunch",
-                                        "techcrunch-cn", "techradar", "the-economist","the-guardian-au", "the-guardian-uk", "the-hill", "the-hindu", "the-huffington-post",
-                                        "the-irish-times", "the-lad-bible", "the-new-york-times", "the-next-web", "the-sport-bible", "the-telegraph", "the-times-of-india",
-                                        "the-verge","the-next-web", "the-sport-bible","the-telegraph","the-times-of-india", "the-verge", "the-wall-street-journal", "the-washington-post",
-                                        "time", "usa-today", "vice-news", "wired-de", "wirtschafts-woche", "xinhua-net", "ynet"]
-
-        if string_value == "Business":
-            print("<GUI Thread Process: Business Selected>")
-            MainWindow.news_sources = ["bloomberg", "australian-financial-review", "bloomberg", "business-insider", "business-insider-uk",
-                                        "cnbc", "die-zeit", "financial-post", "financial-times", "fortune", "handelsblatt", "il-sole-24-ore",
-                                        "info-money", "les-echos", "the-economist", "the-wall-street-journal", "wirtschafts-woche"]
-
-        if string_value == "Entertainment":
-            print("<GUI Thread Process: Entertainment Selected>")
-            MainWindow.news_sources = ["buzzfeed", "daily-mail", "entertainment-weekly", "mashable", "the-lad-bible"]
-
-        if string_value == "Gaming":
-            print("<GUI Thread Process: Gaming Selected>")
-            MainWindow.news_sources = ["ign", "polygon"]
-
-        if string_value == "Health":
-            print("<GUI Thread Process: Health Selected>")
-            MainWindow.news_sources = ["medical-news-today"]
-
-        if string_value == "Music":
-            print("<GUI Thread Process: Music Selected>")
-            MainWindow.news_sources = ["mtv-news", "mtv-news-uk"]
-
-        if string_value == "Politics":
-            print("<GUI Thread Process: Politics Selected>")
-            MainWindow.news_sources = ["breitbart-news", "la-nacion", "politico", "the-hill"]
-
-        if string_value == "Science":
-            print("<GUI Thread Process: Science Selected>")
-            MainWindow.news_sources = ["national-geographic", "new-scientist", "next-big-future"]
-
-        if string_value == "Sport":
-            print("<GUI Thread Process: Sport Selected>")
-            MainWindow.news_sources = ["bbc-sport", "bleacher-report", "espn", "football-italia", "four-four-two",
-                                       "fox-sports", "lequip", "marca", "nfl-news", "nhl-news", "talksport", "the-sport-bible"]
-
-        if string_value == "Technology":
-            print("<GUI Thread Process: Technology Selected>")
-            MainWindow.news_sources = ["gruenderszene", "hacker-news", "recode", "t3n", "techcrunch", "techradar", "the-next-web",
-                                       "the-verge", "wired", "wired-de"]
-
-        if string_value == "Argentina":
-            print("<GUI Thread Process: Argentina Selected>")
-            MainWindow.news_sources = ["infobae", "la-gaceta", "la-nacion"]
-
-        if string_value == "Australia":
-            print("<GUI Thread Process: Australia Selected>")
-            MainWindow.news_sources = ["abc-news-au", "australian-financial-review", "google-news-au", "news-com-au", "the-guardian-au"]
-
-        if string_value == "Brazil":
-            print("<GUI Thread Process: Brazil Selected>")
-            MainWindow.news_sources = ["blasting-news-br", "globo", "google-news-br", "info-money"]
-
-        if string_value == "Canada":
-            print("<GUI Thread Process: Canada Selected>")
-            MainWindow.news_sources = ["cbc-news", "financial-post", "google-news-ca", "the-globe-and-mail"]
-
-        if string_value == "China":
-            print("<GUI Thread Process: China Selected>")
-            MainWindow.news_sources = ["techcrunch-cn", "xinhua-net"]
-
-        if string_value == "France":
-            print("<GUI Thread Process: France Selected>")
-            MainWindow.news_sources = ["google-news-fr", "le-monde", "lequip", "les-echos", "liberation"]
-
-        if string_value == "Germany":
-            print("<GUI Thread Process: Germany Selected>")
-            MainWindow.news_sources = ["bild", "der-tagesspiegel", "die-zeit", "focus", "gruenderszene", "handelsblatt", "spiegel-online", "t3n", "wired-de", "wirtschafts-woche"]
-
-        if string_value == "India":
-            print("<GUI Thread Process: India Selected>")
-            MainWindow.news_sources = ["google-news-in", "the-hindu", "the-times-of-india"]
-
-        if string_value == "Ireland":
-            print("<GUI Thread Process: Ireland Selected>")
-            MainWindow.news_sources = ["rte", "the-irish-times"]
-
-        if string_value == "Israel":
-            print("<GUI Thread Process: Israel Selected>")
-            MainWindow.news_sources = ["google-news-is", "ynet"]
-
-        if string_value == "Italy":
-            print("<GUI Thread Process: Italy Selected>")
-            MainWindow.news_sources = ["ansa", "football-italia", "google-news-it", "il-sole-24-ore", "la-repubblica"]
-
-        if string_value == "Netherlands":
-            print("<GUI Thread Process: Netherlands Selected>")
-            MainWindow.news_sources = ["rtl-nieuws"]
-
-        if string_value == "Norway":
-            print("<GUI Thread Process: Norway Selected>")
-            MainWindow.news_sources = ["aftenposten", "nrk"]
-
-        if string_value == "Pakistan":
-            print("<GUI Thread Process: Pakistan Selected>")
-            MainWindow.news_sources = ["ary-news"]
-
-        if string_value == "Russia":
-            print("<GUI Thread Process: Russia Selected>")
-            MainWindow.news_sources = ["google-news-ru", "lenta", "rbc", "rt"]
-
-        if string_value == "Saudi Arabia":
-            print("<GUI Thread Process: Saudi Arabia Selected>")
-            MainWindow.news_sources = ["argaam", "google-news-sa", "sabq"]
-
-        if string_value == "South Africa":
-            print("<GUI Thread Process: South Africa Selected>")
-            MainWindow.news_sources = ["news24"]
-
-        if string_value == "Spain":
-            print("<GUI Thread Process: Spain Selected>")
-            MainWindow.news_sources = ["el-mundo", "marca"]
-
-        if string_value == "Sweden":
-            print("<GUI Thread Process: Sweden Selected>")
-            MainWindow.news_sources = ["goteborgs-posten", "svenska-dagbladet"]
-
-        if string_value == "United Kingdom":
-            print("<GUI Thread Process: United Kingdom Selected>")
-            MainWindow.news_sources = ["bbc-news", "bbc-sport", "business-insider", "daily-mail",
-                                       "financial-times", "four-four-two", "google-news-uk", "independent",
-                                       "metro", "mirror", "mtv-news-uk", "talksport", "the-economist",
-                                       "the-guardian-uk", "the-lad-bible", "the-sport-bible", "the-telegraph"]
-
-        if string_value == "United States":
-            print("<GUI Thread Process: United States Selected>")
-            MainWindow.news_sources = ["abc-news", "associated-press", "axios", "bleacher-report", "bloomberg",
-                                       "breitbart-news", "business-insider", "cbs-news", "cnbc", "cnn", "espn",
-                                       "fortune", "fox-news", "google-news","msnbc", "mtv-news", "national-geographic",
-                                       "nbc-news", "new-york-magazine", "nfl-news", "polygon", "reuters", "time",
-                                       "usa-today", "the-washington-post", "wired", "the-new-york-times"]
-
-    # Method is used to load the information from Config.txt.
+        print("<GUI Thread Process: Source Catalogue Collected: " + str(len(MainWindow.source_catalogue)) + " News Sources>")
+        MainWindow.fill_categories()
+
+    # Method is used to load the configuration file.
     def load_configuration_file():
-        """This method loads the Config.txt file. The news sources and API key is
-           loaded from the configuration file (Config.txt)."""
+        """This method loads the configuration file, Config.toml, Config.json or Config.txt, and the news sources,
+           API key and settings are loaded from it. The configuration file is created if there is none. The
+           settings are kept if the configuration file cannot be used."""
 
+        file_name = configuration_file(MainWindow.working_directory)
         try:
-            #Configuration file is opened and loaded.
-            configuration_file = open((MainWindow.working_directory + "\Config.txt"), "r")
-            file_data = configuration_file.read()
-            file_data = eval(file_data)
-            MainWindow.APIKEY = (file_data["APIKEY"])
-            MainWindow.news_sources = (file_data["Sources"])
+            if not os.path.exists(file_name):
+                create_configuration_file(file_name)
+                print("<GUI Thread Process: Configuration File Created>")
+            configuration = load_configuration(file_name)
+        except (OSError, ConfigurationError) as error:
+            MainWindow.configuration_error(error)
+            configuration = None
+
+        if configuration is not None:
+            MainWindow.APIKEY = (configuration["APIKEY"])
+            MainWindow.news_sources = (configuration["Sources"])
+            MainWindow.apply_configuration(configuration)
             print("<GUI Thread Process: Configuration File Loaded>")
-            configuration_file.close()
-
-        except:
-            # Configuration file is created and loaded.
-            configuration_file = open((MainWindow.working_directory + "\Config.txt"), "w")
-            configuration_file.write("{'Sources': ['bbc-news', 'daily-mail', 'cnn', 'mirror'], 'APIKEY': ''}")
-            configuration_file = open("Config.txt", "r")
-            file_data = configuration_file.read()
-            file_data = eval(file_data)
-            MainWindow.APIKEY = (file_data["APIKEY"])
-            MainWindow.news_sources = (file_data["Sources"])
-            print("<GUI Thread Process: Configuration File Created>")
-            configuration_file.close()
 
         # API Key from the configuration file is checked.
-        if MainWindow.APIKEY == "":
+        if not MainWindow.APIKEY:
             print("<GUI Thread Process: Error: API Key Missing>")
             warning_box = QMessageBox()
             warning_box.setIcon(QMessageBox.Critical)
@@ -677,51 +695,226 @@ class MainWindow(QMainWindow):
             warning_box.setText("Requests cannot be made to News API without an API key.")
             warning_box.exec_()
 
+    # Method is used to use the settings of the configuration file.
+    def apply_configuration(configuration):
+        """This method sets the settings of the application to those of the configuration, a dictionary of the
+           checked settings of the configuration file. The rate limiter, the HTTP cache and the archive database
+           are changed in place, so threads which are running are not restarted."""
+
+        MainWindow.max_concurrent_requests = (configuration["MaxConcurrentRequests"])
+        MainWindow.max_requests_per_host = (configuration["MaxRequestsPerHost"])
+        MainWindow.sources_per_request = (configuration["SourcesPerRequest"])
+        MainWindow.articles_per_source = (configuration["ArticlesPerSource"])
+        MainWindow.incremental_latest = (configuration["IncrementalLatest"])
+        MainWindow.max_parsers = (configuration["MaxParsers"])
+        MainWindow.parse_processes = (configuration["ParseProcesses"])
+        MainWindow.save_mode = (configuration["SaveMode"])
+        MainWindow.html_parser = (configuration["HtmlParser"])
+        MainWindow.http_cache_size = (configuration["CacheSize"])
+        MainWindow.storage_backend = (configuration["StorageBackend"])
+        MainWindow.archive_format = (configuration["ArchiveFormat"])
+        MainWindow.connect_timeout = (configuration["ConnectTimeout"])
+        MainWindow.read_timeout = (configuration["ReadTimeout"])
+        MainWindow.max_attempts = (configuration["MaxAttempts"])
+        MainWindow.requests_per_second = (configuration["RequestsPerSecond"])
+        MainWindow.request_burst = (configuration["RequestBurst"])
+        MainWindow.daily_quota = (configuration["DailyQuota"])
+        MainWindow.incremental_display = (configuration["IncrementalDisplay"])
+        MainWindow.source_catalogue_ttl = (configuration["SourceCatalogueTTL"])
+        MainWindow.reload_interval = (configuration["ReloadInterval"])
+
+        # Spans of the stages of the application are written to the trace file, if one is given.
+        if configuration["TraceFile"]:
+            try:
+                tracer.open(os.path.join(MainWindow.working_directory, configuration["TraceFile"]))
+            except OSError as error:
+                print("<GUI Thread Process: Error: Trace File Not Opened: " + str(error) + ">")
+        else:
+            tracer.close()
+
+        # Archive format from the configuration file is checked, JSON files are written if it cannot be used.
+        try:
+            ArchiveFormat.check_format(MainWindow.archive_format)
+        except ValueError as error:
+            print("<GUI Thread Process: Error: " + str(error) + ">")
+            MainWindow.archive_format = "json"
+
+        # Objects which have already been created are changed, they are created from the settings at start up.
+        if MainWindow.rate_limiter is not None:
+            MainWindow.rate_limiter.configure(MainWindow.requests_per_second, MainWindow.request_burst, MainWindow.daily_quota)
+            MainWindow.update_quota_label()
+        if MainWindow.http_cache is not None:
+            MainWindow.http_cache.resize(MainWindow.http_cache_size)
+        if MainWindow.source_catalogue is not None:
+            MainWindow.source_catalogue.ttl = MainWindow.source_catalogue_ttl
+        if MainWindow.page_store is not None:
+            MainWindow.open_database()
+
+    # Method is used to open the archive database.
+    def open_database():
+        """This method opens the archive database if articles are archived in a SQLite database, and closes it
+           otherwise. Searches started afterwards use the storage backend."""
+
+        if MainWindow.storage_backend == "sqlite" and MainWindow.database is None:
+            MainWindow.database = ArchiveDatabase(os.path.join(MainWindow.working_directory, "Archive", "Archive.db"))
+        elif MainWindow.storage_backend != "sqlite":
+            MainWindow.database = None
+        MainWindow.article_store.database = MainWindow.database
+
+    # Method is called by the ConfigurationThread once the configuration file has changed.
+    def configuration_reloaded(configuration):
+        """This method uses the settings of the configuration file once it has changed. The news sources of the
+           configuration file are only selected if the "Default" news sources are."""
+
+        MainWindow.APIKEY = (configuration["APIKEY"])
+        if MainWindow.Categories.currentText() == "Default":
+            MainWindow.news_sources = (configuration["Sources"])
+        MainWindow.apply_configuration(configuration)
+        print("<GUI Thread Process: Configuration File Loaded>")
+        MainWindow.StatusBar.showMessage("Configuration File Loaded")
+
+    # Method is used to show an error of the configuration file.
+    def configuration_error(error):
+        """This method shows why the configuration file cannot be used, the previous settings are kept."""
+
+        print("<GUI Thread Process: Error: " + str(error) + ">")
+        MainWindow.StatusBar.showMessage("Configuration File Not Loaded: " + str(error))
+
     # Method is used to display articles to the GUI.
     def display_articles():
         """This method loads JSON files from the current directorty and displays the articles
-           stored in the JSON files."""
+           stored in the JSON files. Files which have not changed are not read again."""
 
         print("<GUI Thread Process: Display Articles>")
 
+        # Articles are loaded from the article store.
+        articles, missing_files = MainWindow.article_store.load(MainWindow.current_directory, MainWindow.news_sources, MainWindow.sort_by_var)
+        for file_name in missing_files:
+            print("<GUI Thread Process: Error: " + file_name + " Not Found>")
+
         # Selected articles are displayed to the GUI.
-        for news_source in MainWindow.news_sources:
+        for article in articles:
+            MainWindow.article_list.append(article.id)
+            MainWindow.selected_articles.append(article.id)
+        MainWindow.render_articles(articles)
 
-            # File name is defined.
-            file_name = (news_source + "-" + MainWindow.sort_by_var + ".json")
-            try:
+    # Method is used to create the HTML of a single article.
+    def article_html(article):
+        """This method returns the HTML displaying the title, description and link of an article."""
 
-                # File is opened and the data is loaded.
-                json_file = open(file_name, "r")
-                data = json.load(json_file)
-
-                # Displays articles in the data to the GUI.
-                for article in data:
-                    MainWindow.article_list.append(article["ID"])
-                    MainWindow.selected_articles.append(article["ID"])
-                    MainWindow.Textbox.insertHtml("<h2>" + article["Title"] + "</h2>")
-                    MainWindow.Textbox.insertPlainText("\n")
-
-                    if article["Description"] is "":
-                        pass
-                    elif article["Description"] is None:
-                        pass
-                    else:
-                        MainWindow.Textbox.insertHtml(article["Description"])
-                        MainWindow.Textbox.insertPlainText("\n")
-
-                    Link = ("<a href= " + article["URL"] + ">" + article["URL"] + " </a>")
-                    MainWindow.Textbox.insertHtml(Link)
-                    MainWindow.Textbox.insertPlainText("\n")
-                    MainWindow.Textbox.insertPlainText("")
-                    MainWindow.Textbox.insertPlainText("\n")
-
-                    # File is closed.
-                    json_file.close()
+        html = ["<h2>" + (article.title or "") + "</h2>"]
+        if article.description:
+            html.append(article.description + "<br>")
+        html.append("<a href=\"" + (article.url or "") + "\">" + (article.url or "") + " </a><br><br>")
+        return "".join(html)
 
-            # Error code.
-            except:
-                print("<GUI Thread Process: Error: " + file_name + " Not Found>")
+    # Method is used to display articles to the GUI.
+    def render_articles(articles, empty_html = ""):
+        """This method replaces the text of the textbox with the articles. The first page of articles is
+           displayed with a single call, so the document is only laid out once and the time to first paint
+           depends on first_page_articles, not on the number of articles. The remaining articles are appended
+           a page at a time by append_remaining_articles. The empty_html is displayed if there are no articles."""
+
+        start_time = time.perf_counter()
+        MainWindow.render_generation = MainWindow.render_generation + 1
+        render_generation = MainWindow.render_generation
+
+        # The first page of articles is displayed.
+        first_page = articles[:MainWindow.first_page_articles]
+        html = [MainWindow.header_html()] + [MainWindow.article_html(article) for article in first_page]
+        if not articles:
+            html.append(empty_html)
+        with stage("render", view = "first_page"):
+            MainWindow.Textbox.setHtml("".join(html))
+        metrics.count("newsfeed_rendered_articles_total", len(first_page))
+        print("<GUI Thread Process: " + str(len(first_page)) + " Article(s) Displayed In " + str(int((time.perf_counter() - start_time) * 1000)) + "ms>")
+
+        # The remaining articles are appended once the event loop has drawn the first page.
+        MainWindow.pending_articles = max(0, len(articles) - len(first_page))
+        if MainWindow.pending_articles:
+            QTimer.singleShot(0, lambda: MainWindow.append_remaining_articles(articles, len(first_page), render_generation))
+
+    # Method is used to append the remaining articles to the GUI a page at a time.
+    def append_remaining_articles(articles, position, render_generation):
+        """This method appends the page of articles from the position to the textbox, and appends the next page
+           once the event loop has drawn it. The GUI thread is only ever busy for the time a page takes to lay
+           out, however many articles there are. Nothing is appended if other articles have been displayed since."""
+
+        if render_generation != MainWindow.render_generation:
+            return
+
+        page = articles[position:position + MainWindow.first_page_articles]
+        MainWindow.append_articles(page, render_generation)
+        position = position + len(page)
+        MainWindow.pending_articles = len(articles) - position
+        if MainWindow.pending_articles:
+            QTimer.singleShot(0, lambda: MainWindow.append_remaining_articles(articles, position, render_generation))
+
+    # Method is used to append articles to the GUI.
+    def append_articles(articles, render_generation):
+        """This method appends the articles to the textbox with a single call, the articles are at most a page.
+           Nothing is appended if other articles have been displayed since."""
+
+        if render_generation != MainWindow.render_generation:
+            return
+
+        start_time = time.perf_counter()
+        with stage("render", view = "append"):
+            MainWindow.Textbox.append("".join(MainWindow.article_html(article) for article in articles))
+        metrics.count("newsfeed_rendered_articles_total", len(articles))
+        print("<GUI Thread Process: " + str(len(articles)) + " Article(s) Appended In " + str(int((time.perf_counter() - start_time) * 1000)) + "ms>")
+
+    # Method is used to display the articles of an archive through the archive index.
+    def open_archive(directory):
+        """This method opens the archive index of the directory and displays the first page of the articles of
+           the news sources. The index of an archive day is only made again once its files have changed."""
+
+        start_time = time.perf_counter()
+        if MainWindow.archive_index is not None:
+            MainWindow.archive_index.close()
+        MainWindow.archive_index = ArchiveIndex(directory)
+        MainWindow.archive_selection = MainWindow.archive_index.select(MainWindow.news_sources, MainWindow.sort_by_var)
+
+        # Every article of the archive is selected, the ID's are read from the index without decoding the articles.
+        MainWindow.article_list = MainWindow.archive_selection.article_ids()
+        MainWindow.selected_articles = list(MainWindow.article_list)
+        print("<GUI Thread Process: " + str(len(MainWindow.archive_selection)) + " Article(s) In " + str(len(MainWindow.archive_index.days)) +
+              " Day(s) Opened In " + str(int((time.perf_counter() - start_time) * 1000)) + "ms>")
+
+        MainWindow.render_articles([], "<h2> No Articles. </h2>" if len(MainWindow.archive_selection) == 0 else "")
+        MainWindow.archive_generation = MainWindow.render_generation
+        MainWindow.archive_position = 0
+        MainWindow.append_archive_page()
+
+    # Method is used to display the next page of the articles of the archive.
+    def append_archive_page():
+        """This method decodes the next page of the articles of the archive and appends it to the textbox. Pages
+           are appended until the textbox can be scrolled, the next page is then appended once the end is
+           scrolled into view. Nothing is appended if other articles have been displayed since the archive."""
+
+        selection = MainWindow.archive_selection
+        if selection is None or MainWindow.archive_generation != MainWindow.render_generation or MainWindow.archive_position >= len(selection):
+            return
+
+        try:
+            articles = selection.articles(MainWindow.archive_position, MainWindow.archive_position + MainWindow.first_page_articles)
+        except (OSError, ValueError) as error:
+            print("<GUI Thread Process: Error: " + str(error) + ", Load The Archive Again>")
+            return
+        MainWindow.archive_position = MainWindow.archive_position + len(articles)
+        MainWindow.article_store.add_articles(articles)
+        MainWindow.append_articles(articles, MainWindow.archive_generation)
+
+        if MainWindow.Textbox.verticalScrollBar().maximum() == 0:
+            QTimer.singleShot(0, MainWindow.append_archive_page)
+
+    # Method is activated once the textbox is scrolled.
+    def archive_scrolled(value):
+        """This method appends the next page of the articles of the archive once the end of the textbox is scrolled into view."""
+
+        scroll_bar = MainWindow.Textbox.verticalScrollBar()
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep():
+            MainWindow.append_archive_page()
 
     # Method is used to display a warning box when there is no internet connection.
     def no_internet_connection():
@@ -734,35 +927,33 @@ class MainWindow(QMainWindow):
         warning_box.setText("Could not connect to News API")
         warning_box.exec_()
 
-    # Method is used to create unique ID's for all articles.
-    def create_article_id():
-        """This method is used to create unique ID's for all articles."""
+    # Method is used to display the articles of a news source as soon as it has been collected.
+    def append_article_batch(news_source, articles):
+        """This method appends the articles of a news source to the textbox with a single call. The articles
+           are passed by the SearchArticlesThread, so no files are read."""
 
-        characters = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "a", "b", "c", "d",
-                      "e", "f", "g", "h", "i", "j", "k", "i", "m", "n", "o", "p", "q",
-                      "r", "s", "t", "u", "v", "w", "x", "y", "z", "A", "B", "C", "D",
-                      "E", "F", "G", "H", "I", "J", "K", "I", "M", "N", "O", "P", "Q",
-                      "R", "S", "T", "U", "V", "W", "X", "Y", "Z"]
+        if not articles:
+            return
+
+        start_time = time.perf_counter()
+        with stage("render", view = "source"):
+            MainWindow.Textbox.append("".join(MainWindow.article_html(article) for article in articles))
+        metrics.count("newsfeed_rendered_articles_total", len(articles))
+        print("<GUI Thread Process: " + str(len(articles)) + " Article(s) Displayed For " + news_source + " In " + str(int((time.perf_counter() - start_time) * 1000)) + "ms>")
 
-        article_id = []
-        for interations in range(10):
-            article_id.append(random.choice(characters))
-        article_id = (''.join(article_id))
-        return article_id
+    # Method is used to create the HTML of the header of the textbox.
+    def header_html():
+        """This method returns the HTML displayed at the top of the textbox."""
+
+        return ("<b> NewsFeed 1.0.0 (64-bit) </b><br>" + "<b> Prithvi R, powered by News API </b><br>"
+                + "<b>" + MainWindow.executable_directory + "</b><br><br>")
 
     # Method is used to clear all text from the GUI.
     def clear_textbox():
         """This method clears all text from the text box."""
 
-        MainWindow.Textbox.clear()
-        MainWindow.Textbox.insertHtml("<b> NewsFeed 1.0.0 (64-bit) </b>")
-        MainWindow.Textbox.insertPlainText("\n")
-        MainWindow.Textbox.insertHtml("<b> Prithvi R, powered by News API </b>")
-        MainWindow.Textbox.insertPlainText("\n")
-        MainWindow.Textbox.insertHtml("<b>" + MainWindow.executable_directory + "</b>")
-        MainWindow.Textbox.insertPlainText("\n")
-        MainWindow.Textbox.insertPlainText("")
-        MainWindow.Textbox.insertPlainText("\n")
+        MainWindow.render_generation = MainWindow.render_generation + 1
+        MainWindow.Textbox.setHtml(MainWindow.header_html())
 
     # Method is used to update the statusbar.
     def update_statusbar_articles_thread():
@@ -776,6 +967,16 @@ class MainWindow(QMainWindow):
 
         MainWindow.StatusBar.showMessage("Saving Articles Offline...")
 
+    # Method is used to show the number of requests left today.
+    def update_quota_label():
+        """This method shows the number of requests to News API which can still be made today in the statusbar."""
+
+        remaining = MainWindow.rate_limiter.remaining()
+        if remaining is None:
+            MainWindow.QuotaLabel.setText("")
+        else:
+            MainWindow.QuotaLabel.setText(str(remaining) + "/" + str(MainWindow.daily_quota) + " Requests Left Today")
+
     # Method is used to update the progressbar.
     def update_progressbar():
         """This method updates the statusbar."""
@@ -791,25 +992,31 @@ class SearchArticlesThread(QThread):
     update_statusbar_signal = pyqtSignal()
     update_progressbar_signal = pyqtSignal()
     display_articles_signal = pyqtSignal()
+    articles_batch_signal = pyqtSignal(str, object)
     terminate_signal = pyqtSignal()
     no_connection_signal = pyqtSignal()
 
     def __init__(self, parent = None):
         super(SearchArticlesThread, self).__init__(parent)
+        self.cancel_token = CancellationToken()
 
     def __del__(self):
         self.wait()
 
+    def start(self, *arguments):
+        """Every run of the thread is given a new cancellation token, which is cancelled by the "Cancel" button."""
+
+        self.cancel_token = CancellationToken()
+        super(SearchArticlesThread, self).start(*arguments)
+
     def run(self):
-        """This method of the SearchArticlesThread contains the algorithm for searching for news articles."""
+        """This method of the SearchArticlesThread searches for news articles, the search is timed as the refresh stage."""
 
-        #Checking internet connection.
-        try:
-            print("<Info: Attempting Connection With https://newsapi.org>")
-            urllib.request.urlopen("https://newsapi.org/")
-            print ("<Search Articles Thread Process: Connected To NewsAPI.org>")
-        except:
-            self.no_connection_signal.emit()
+        with stage("refresh", sort = MainWindow.sort_by_var):
+            self.search_articles()
+
+    def search_articles(self):
+        """This method of the SearchArticlesThread contains the algorithm for searching for news articles."""
 
         # Articles lists reset.
         MainWindow.article_list = []
@@ -828,89 +1035,68 @@ class SearchArticlesThread(QThread):
         # Updating statusbar.
         self.update_statusbar_signal.emit()
 
-        # Find the date.
-        raw_time = time.asctime()
-        raw_time = raw_time.split()
-        day = raw_time[2]
-        month = raw_time[1]
-        year = raw_time[4]
-        date = str(day + month + year)
+        # Directory archive created, the articles are displayed from it.
+        directory = archive_directory(MainWindow.working_directory)
+        MainWindow.current_directory = directory
+
+        # Algorithm for collecting news articles, the news sources are collected at once by the fetch engine, in batches of
+        # up to sources_per_request news sources for each request.
+        fetch_engine = FetchEngine(MainWindow.APIKEY, MainWindow.max_concurrent_requests, MainWindow.max_requests_per_host,
+                                   MainWindow.read_timeout, http_cache = MainWindow.http_cache, database = MainWindow.database,
+                                   connect_timeout = MainWindow.connect_timeout, retry_policy = RetryPolicy(MainWindow.max_attempts),
+                                   circuit_breaker = MainWindow.circuit_breaker, rate_limiter = MainWindow.rate_limiter,
+                                   priority = USER_PRIORITY, archive_format = MainWindow.archive_format,
+                                   sources_per_request = MainWindow.sources_per_request, articles_per_source = MainWindow.articles_per_source,
+                                   high_water_marks = (MainWindow.high_water_marks if MainWindow.incremental_latest else None))
+        completed = 0
+        connection_checked = False
+        for news_source, formatted_articles in fetch_engine.fetch_sources(MainWindow.news_sources, MainWindow.sort_by_var, directory, cancel_token = self.cancel_token):
 
-        # Reset Directory.
-        os.chdir(MainWindow.working_directory)
+            # The first request is the connectivity check.
+            if not connection_checked and fetch_engine.connection_pool.connected is not None:
+                connection_checked = True
+                if fetch_engine.connection_pool.connected:
+                    print("<Search Articles Thread Process: Connected To News API>")
+                else:
+                    self.no_connection_signal.emit()
 
-        # Directory archive created.
-        try:
-            os.mkdir("Archive")
-            os.chdir("Archive")
-            os.mkdir(date)
-            os.chdir(date)
-        except:
-            try:
-                os.chdir("Archive")
-                os.mkdir(date)
-                os.chdir(date)
-            except:
-                os.chdir(date)
+            # Error code.
+            if formatted_articles is None:
+                print("<Search Articles Thread Process: Error: Data Not Collected For: " + news_source + "-" + MainWindow.sort_by_var + ">")
+                continue
 
-        # Algorithm for collecting news articles.
-        completed = 0
-        for news_source in MainWindow.news_sources:
-            try:
-                if MainWindow.sort_by_var == "top":
-                    sort_by = "top-headlines?"
-                if MainWindow.sort_by_var == "latest":
-                    sort_by = "everything?"
+            # Articles collected incrementally were added to the file of the day, the whole file is displayed.
+            if fetch_engine.incremental(MainWindow.sort_by_var):
+                formatted_articles = fetch_engine.read_source(directory, news_source, MainWindow.sort_by_var)
 
-                #URL request is created.
-                url = ("https://newsapi.org/v2/" + sort_by + "sources=" + news_source + "&apiKey=" + MainWindow.APIKEY)
+            # Article ID's are added to the article list.
+            for formatted_article in formatted_articles:
+                MainWindow.article_list.append(formatted_article["ID"])
 
-                #URL address is opened, returning JSON data from NewsAPI.org.
-                server_response = (json.load(urllib.request.urlopen(url)))
+            # The articles are kept by the article store and the file is added to the search index, the file is not read again.
+            file_name = fetch_engine.source_file_name(directory, news_source, MainWindow.sort_by_var)
+            articles = MainWindow.article_store.store_records(file_name, formatted_articles, news_source)
+            MainWindow.search_index.index_file(file_name)
 
-            except:
-                server_response = None
-                print("<Search Articles Thread Process: Error: Data Not Collected For: " + news_source + "-" + MainWindow.sort_by_var + ">")
+            # Signal sent to display the articles of the news source to GUI.
+            if MainWindow.incremental_display:
+                self.articles_batch_signal.emit(news_source, articles)
 
-            #The news articles from NewsAPI.org is formatted and saved.
-            try:
-                formatted_articles = []
-                for article in server_response["articles"]:
-
-                    #Unique ID is created for each news article.
-                    article_id = MainWindow.create_article_id()
-
-                    # Formatting algorithm.
-                    author = article["author"]
-                    published = article["publishedAt"]
-                    title = article["title"]
-                    description = article["description"]
-                    url = article["url"]
-                    formatted_article = {"ID": (article_id), "Title": (title), "Description": (description), "Author": (author), "Published": (published), "URL": (url)}
-                    formatted_articles.append(formatted_article)
-                    MainWindow.article_list.append(article_id)
-
-                # JSON file containing news articles for a given source is saved.
-                formatted_data = (json.dumps(formatted_articles, indent=4, sort_keys = False))
-                json_file = open(news_source + "-" + MainWindow.sort_by_var + ".json", "w")
-                json_file.write(formatted_data)
-                json_file.close()
-
-                # StatusBar is updated.
-                completed = completed + divident
-                MainWindow.progress_bar_value = completed
-                self.update_progressbar_signal.emit()
-                print("<Search Articles Thread Process: JSON Created For: " + news_source + "-" + MainWindow.sort_by_var + ">" + " <" + str(int(completed)) + "%" + ">")
-
-            #Error code.
-            except:
-                print("<Search Articles Thread Process: JSON Not Created For: " + news_source + "-" + MainWindow.sort_by_var + ">")
+            # StatusBar is updated.
+            completed = completed + divident
+            MainWindow.progress_bar_value = completed
+            self.update_progressbar_signal.emit()
+            print("<Search Articles Thread Process: JSON Created For: " + news_source + "-" + MainWindow.sort_by_var + ">" + " <" + str(int(completed)) + "%" + ">")
+
+        if self.cancel_token.cancelled():
+            print("<Search Articles Thread Process: Cancelled>")
 
         # Selected articles updated.
         MainWindow.selected_articles = MainWindow.article_list
 
-        # Signal sent to display news articles to GUI.
-        self.display_articles_signal.emit()
+        # Signal sent to display news articles to GUI, unless they have already been displayed.
+        if not MainWindow.incremental_display:
+            self.display_articles_signal.emit()
 
         #Number of articles is calculated.
         try:
@@ -923,6 +1109,62 @@ class SearchArticlesThread(QThread):
         # Signal sent to terminate thread.
         self.terminate_signal.emit()
 
+# Class for the Source Catalogue Thread.
+class SourceCatalogueThread(QThread):
+    """The SourceCatalogueThread collects the source catalogue from News API, so the GUI is not blocked."""
+
+    # Defining signals.
+    refreshed_signal = pyqtSignal()
+
+    def __init__(self, parent = None):
+        super(SourceCatalogueThread, self).__init__(parent)
+
+    def __del__(self):
+        self.wait()
+
+    def run(self):
+        """This method of the SourceCatalogueThread collects the source catalogue, the catalogue in the archive
+           is kept if it cannot be collected."""
+
+        fetch_engine = FetchEngine(MainWindow.APIKEY, 1, 1, MainWindow.read_timeout, connect_timeout = MainWindow.connect_timeout,
+                                   retry_policy = RetryPolicy(MainWindow.max_attempts), rate_limiter = MainWindow.rate_limiter,
+                                   priority = SCHEDULED_PRIORITY)
+        if MainWindow.source_catalogue.refresh(fetch_engine.request_sources, force = True):
+            self.refreshed_signal.emit()
+        else:
+            print("<Source Catalogue Thread Process: Error: Source Catalogue Not Collected>")
+
+# Class for the Configuration Thread.
+class ConfigurationThread(QThread):
+    """The ConfigurationThread watches the configuration file and sends its settings to the GUI once it has changed,
+       so the file is never waited for by the GUI."""
+
+    # Defining signals.
+    reloaded_signal = pyqtSignal(object)
+    error_signal = pyqtSignal(object)
+
+    def __init__(self, parent = None):
+        super(ConfigurationThread, self).__init__(parent)
+
+    def __del__(self):
+        self.requestInterruption()
+        self.wait()
+
+    def run(self):
+        """This method of the ConfigurationThread checks the configuration file every reload_interval seconds
+           until the application is closed. The configuration file loaded at start up is not loaded again."""
+
+        configuration_watcher = ConfigurationWatcher(MainWindow.working_directory)
+        while not self.isInterruptionRequested():
+            self.msleep(int(MainWindow.reload_interval * 1000))
+            try:
+                configuration = configuration_watcher.poll()
+            except ConfigurationError as error:
+                self.error_signal.emit(error)
+                continue
+            if configuration is not None:
+                self.reloaded_signal.emit(configuration)
+
 # Class for the Save Articles Thread.
 class SaveArticlesThread(QThread):
     """The SaveArticlesThread saves news articles offline as HTML files."""
@@ -935,11 +1177,24 @@ class SaveArticlesThread(QThread):
 
     def __init__(self, parent = None):
         super(SaveArticlesThread, self).__init__(parent)
+        self.cancel_token = CancellationToken()
 
     def __del__(self):
         self.wait()
 
+    def start(self, *arguments):
+        """Every run of the thread is given a new cancellation token, which is cancelled by the "Cancel" button."""
+
+        self.cancel_token = CancellationToken()
+        super(SaveArticlesThread, self).start(*arguments)
+
     def run(self):
+        """This method of the SaveArticlesThread saves news articles offline, the save is timed as the save stage."""
+
+        with stage("save", mode = MainWindow.save_mode):
+            self.save_articles()
+
+    def save_articles(self):
         """This method of the SaveArticlesThread contains the algorithm for saving news articles offline."""
 
         #Number of articles is calculated.
@@ -955,57 +1210,64 @@ class SaveArticlesThread(QThread):
             divident = 100 / number_of_articles
         except:
             self.terminate_signal.emit()
-
-        # Internet connection is checked.
-        try:
-            print("<Info: Attempting Connection With https://newsapi.org>")
-            urllib.request.urlopen("https://newsapi.org")
-            print("<Save Articles Thread Process: Connected To NewsAPI.org>")
-        except:
-            self.no_connection_signal.emit()
+            return
 
         # Statusbar is updated.
         self.update_statusbar_signal.emit()
 
-        # Saving algorithm.
-        completed = 0
-        for news_source in MainWindow.news_sources:
+        # The articles of a loaded archive which have not been scrolled into view are decoded.
+        selection = MainWindow.archive_selection
+        if selection is not None and any(MainWindow.article_store.get(article_id) is None for article_id in MainWindow.selected_articles):
             try:
-                file_name = (news_source + "-" + MainWindow.sort_by_var + ".json")
-                json_file = open(file_name, "r")
-                article_list = json.load(json_file)
-
-                for article in article_list:
-                    # Checking if the article ID is in the selected articles list.
-                    if article["ID"] in MainWindow.selected_articles:
-
-                        # Article is saved for offline use.
-                        print("<Save Articles Thread Process: Parsing ID: " + article["ID"] + ">")
-                        web_page = urllib.request.urlopen(article["URL"])
-                        soup = BeautifulSoup(web_page, "html.parser")
-                        soup = str(soup)
-                        save_file_name = (article["Title"] + ".html")
-                        save_file = open(save_file_name, "w")
-                        save_file.write(soup)
-
-                        # Files are closed.
-                        save_file.close()
-                        json_file.close()
-
-                        # Progressbar is updated.
-                        completed = completed + divident
-                        MainWindow.progress_bar_value = completed
-                        self.update_progressbar_signal.emit()
-                        print("<Save Articles Thread Process: Article Saved Offline: " + article["Title"] + ">" + " <" + str(int(completed)) + "%>")
+                MainWindow.article_store.add_articles(selection.articles(MainWindow.archive_position, len(selection)))
+            except (OSError, ValueError) as error:
+                print("<Save Articles Thread Process: Error: " + str(error) + ">")
+
+        # The selected articles are found in the article store.
+        articles = []
+        for article_id in MainWindow.selected_articles:
+            article = MainWindow.article_store.get(article_id)
+            if article is not None:
+                articles.append(article.to_record())
+
+        # Saving algorithm, articles are downloaded, rewritten and stored at the same time by the save engine.
+        try:
+            save_engine = SaveEngine(MainWindow.max_concurrent_requests, MainWindow.max_parsers, MainWindow.max_requests_per_host,
+                                     http_cache = MainWindow.http_cache, save_mode = MainWindow.save_mode, parser = MainWindow.html_parser,
+                                     parse_processes = MainWindow.parse_processes)
+        except (ImportError, ValueError) as error:
+            print("<Save Articles Thread Process: Error: " + str(error) + ">")
+            self.terminate_signal.emit()
+            return
+        completed = 0
+        connection_checked = False
+        for article, error in save_engine.save_articles(articles, MainWindow.page_store, self.cancel_token):
+
+            # The first download is the connectivity check.
+            if not connection_checked and save_engine.connection_pool.connected is not None:
+                connection_checked = True
+                if save_engine.connection_pool.connected is False:
+                    self.no_connection_signal.emit()
+
+            # Progressbar is updated.
+            completed = completed + divident
+            MainWindow.progress_bar_value = completed
+            self.update_progressbar_signal.emit()
+
+            if error is None:
+                print("<Save Articles Thread Process: Article Saved Offline: " + article["Title"] + ">" + " <" + str(int(completed)) + "%>")
 
             # Error code.
-            except:
-                completed = completed + divident
-                MainWindow.progress_bar_value = completed
-                self.update_progressbar_signal.emit()
+            else:
                 print("<Save Articles Thread Process: Error: Could Not Save Article: " + article["Title"] + ">")
 
+        if self.cancel_token.cancelled():
+            print("<Save Articles Thread Process: Cancelled>")
+
         # Terminate signal is sent.
         self.terminate_signal.emit()
 
-run()
+if __name__ == "__main__":
+    # Worker processes parsing web pages are started from NewsFeed.exe as well.
+    multiprocessing.freeze_support()
+    run()
@@ -0,0 +1,127 @@
+
+# Importing the Python modules, the dependencies of the page store.
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import threading
+from AtomicFile import write_atomic
+
+# Function is used to create a file name from the title of an article.
+def safe_file_name(title, article_id):
+    """This function returns a file name made from the title of an article which is valid on every system. The
+       ID of the article is added, so articles with the same title do not overwrite each other."""
+
+    name = re.sub(r"[^\w\- .]", "_", str(title or "")).strip(" .")[:100]
+    return (name or "Article") + "-" + str(article_id) + ".html"
+
+# Class for the content-addressed store of saved web pages.
+class PageStore:
+    """The PageStore keeps the web pages of the articles saved offline. Every web page is stored once, in a
+       compressed blob named by the hash of its contents, so identical web pages, such as wire stories
+       published by many news sources, share a blob. A manifest maps the ID of every saved article to its blob,
+       new entries are appended to it, so the manifest is never written again from the start."""
+
+    """The file name of the manifest in the directory of the store."""
+    manifest_file_name = "Manifest.ndjson"
+
+    def __init__(self, directory):
+        """The initiation/constructor method for the PageStore class. The manifest in the directory is loaded."""
+
+        self.directory = directory
+        self.lock = threading.Lock()
+
+        # The manifest entry of every saved article is kept by ID, a later entry replaces an earlier one.
+        self.entries = {}
+        try:
+            with open(os.path.join(self.directory, PageStore.manifest_file_name), "r", encoding = "utf-8") as manifest_file:
+                for line in manifest_file:
+                    try:
+                        entry = json.loads(line)
+                        self.entries[entry["ID"]] = entry
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            pass
+
+    def __contains__(self, article_id):
+        return article_id in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Method is used to find the file of a blob.
+    def blob_file_name(self, blob):
+        """This method returns the file name of a blob, the blobs are spread over directories by their first two characters."""
+
+        return os.path.join(self.directory, blob[:2], blob + ".html.gz")
+
+    # Method is used to store the web page of an article.
+    def put(self, article, web_page):
+        """This method stores the web page of an article, given as bytes, and adds the article to the manifest.
+           The blob is only written if no identical web page has been stored before. The blob is returned."""
+
+        blob = hashlib.sha256(web_page).hexdigest()
+        blob_file_name = self.blob_file_name(blob)
+        if not os.path.exists(blob_file_name):
+            write_atomic(blob_file_name, gzip.compress(web_page, mtime = 0))
+
+        entry = {"ID": (article["ID"]), "Blob": (blob), "Title": (article.get("Title")), "URL": (article.get("URL")),
+                 "Size": (len(web_page)), "Saved": (int(time.time()))}
+        with self.lock:
+            os.makedirs(self.directory, exist_ok = True)
+            with open(os.path.join(self.directory, PageStore.manifest_file_name), "a", encoding = "utf-8") as manifest_file:
+                manifest_file.write(json.dumps(entry) + "\n")
+            self.entries[article["ID"]] = entry
+        return blob
+
+    # Method is used to read the web page of an article.
+    def get(self, article_id):
+        """This method returns the web page of a saved article as bytes, None is returned if it has not been saved."""
+
+        entry = self.entries.get(article_id)
+        if entry is None:
+            return None
+        with gzip.open(self.blob_file_name(entry["Blob"]), "rb") as blob_file:
+            return blob_file.read()
+
+    # Method is used to write the web page of a saved article as a HTML file.
+    def export_page(self, article_id, directory):
+        """This method writes the web page of a saved article to the directory as a HTML file named after its
+           title, so it can be opened in a web browser. The file name is returned, None is returned if the
+           article has not been saved."""
+
+        entry = self.entries.get(article_id)
+        if entry is None:
+            return None
+        file_name = os.path.join(directory, safe_file_name(entry.get("Title"), article_id))
+        write_atomic(file_name, self.get(article_id))
+        return file_name
+
+    # Method is used to write the web pages of the saved articles as HTML files.
+    def export(self, directory, article_ids = None):
+        """This method writes the web page of every saved article, or of the articles with the ID's if they are
+           given, to the directory as a HTML file named after its title. The number of files written is returned."""
+
+        exported = 0
+        for article_id in (article_ids if article_ids is not None else list(self.entries)):
+            if self.export_page(article_id, directory) is not None:
+                exported = exported + 1
+        return exported
+
+    # Method is used to find the size of the store.
+    def statistics(self):
+        """This method returns a dictionary of the number of saved articles and blobs, the size of the web pages
+           and the size of the compressed blobs on disk in bytes."""
+
+        with self.lock:
+            blobs = {entry["Blob"]: entry["Size"] for entry in self.entries.values()}
+        stored = 0
+        for blob in blobs:
+            try:
+                stored = stored + os.path.getsize(self.blob_file_name(blob))
+            except OSError:
+                pass
+        return {"Articles": (len(self.entries)), "Blobs": (len(blobs)), "Page Bytes": (sum(blobs.values())), "Stored Bytes": (stored)}
@@ -0,0 +1,246 @@
+
+# Importing the Python modules, the dependencies of the rate limiter.
+import json
+import time
+import heapq
+import datetime
+import threading
+import contextlib
+from AtomicFile import write_atomic, FileLock
+
+"""Priorities of the requests, requests made by the user are let through before scheduled requests."""
+USER_PRIORITY = 0
+SCHEDULED_PRIORITY = 1
+
+# Class for the error raised once the daily quota is used up.
+class QuotaExceededError(OSError):
+    """The QuotaExceededError is raised instead of making a request once the daily quota of the API key is used up."""
+
+# Class for the rate limiter of the requests made to News API.
+class RateLimiter:
+    """The RateLimiter limits the requests made with the News API key. A token bucket lets through at most
+       requests_per_second requests, with bursts of up to burst requests, and a ledger counts the requests
+       made each day so no more than daily_quota requests are made. The ledger is saved to a file, so the quota
+       is shared by every process using the same archive. The file is locked while it is read and written, so
+       no process loses the requests counted by another. Requests are reserved in the ledger a few at a time,
+       so the file is not written for every request, and the requests a process reserved but did not make are
+       given back once it closes the rate limiter. News API resets the quota at midnight UTC. Threads waiting
+       for a token are let through in order of priority, then in the order they asked. The last user_reserve of
+       the daily quota is kept for requests made by the user, so scheduled requests of any process cannot use
+       up the requests the GUI needs."""
+
+    """The longest time in seconds a waiting thread takes to notice it has been cancelled."""
+    cancel_interval = 0.25
+
+    """The number of requests reserved in the ledger file at a time, and the number of seconds after which the
+       requests made by other processes are read again."""
+    reserve_requests = 10
+    reload_interval = 5.0
+
+    """The share of the daily quota kept for requests made by the user, scheduled requests are refused once
+       only this share of the quota is left."""
+    user_reserve = 0.1
+
+    def __init__(self, requests_per_second = 5.0, burst = 10, daily_quota = None, file_name = None):
+        """The initiation/constructor method for the RateLimiter class. There is no daily quota if daily_quota
+           is None, and the ledger is not saved if no file name is given."""
+
+        self.requests_per_second = float(requests_per_second)
+        self.burst = max(1.0, float(burst))
+        self.daily_quota = daily_quota
+        self.file_name = file_name
+        self.condition = threading.Condition()
+
+        # The bucket starts full.
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+        # Threads waiting for a token, as a heap of their priority and ticket.
+        self.waiting = []
+        self.tickets = 0
+
+        # The number of requests counted in the ledger on its date by every process, the requests reserved by this
+        # process which it has not made yet, and the time the ledger file was last read.
+        self.day = self.today()
+        self.used = 0
+        self.reserved = 0
+        self.loaded = 0.0
+        self.file_lock = (FileLock(file_name + ".lock") if file_name is not None else None)
+        self.load()
+
+    # Method is used to find the date of the quota.
+    def today(self):
+        """This method returns the current UTC date, the date News API counts the quota by."""
+
+        return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d")
+
+    # Method is used to lock the ledger file.
+    def ledger_lock(self):
+        """This method returns the lock of the ledger file, to be used with the with statement."""
+
+        return (self.file_lock if self.file_lock is not None else contextlib.nullcontext())
+
+    # Method is used to load the ledger.
+    def load(self):
+        """This method reads the number of requests counted today by every process from the ledger file, the count
+           starts again at 0 on a new day. The requests reserved on an earlier day are dropped."""
+
+        day = self.today()
+        if day != self.day:
+            self.day = day
+            self.used = 0
+            self.reserved = 0
+        self.loaded = time.monotonic()
+        if self.file_name is None:
+            return
+        try:
+            with open(self.file_name, "r") as ledger_file:
+                ledger = json.load(ledger_file)
+            self.used = (int(ledger.get("Used", 0)) if ledger.get("Date") == self.day else 0)
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+
+    # Method is used to save the ledger.
+    def save(self, used):
+        """This method saves the number of requests counted today to the ledger file, the lock of the ledger must be held."""
+
+        self.used = max(0, used)
+        write_atomic(self.file_name, json.dumps({"Date": (self.day), "Used": (self.used), "Quota": (self.daily_quota)}, indent = 4))
+
+    # Method is used to find the number of requests a priority may count.
+    def quota_limit(self, priority):
+        """This method returns the number of requests which may be counted in the ledger today by requests of the
+           given priority, None is returned if there is no daily quota. Scheduled requests leave the user reserve."""
+
+        if self.daily_quota is None:
+            return None
+        if priority == USER_PRIORITY:
+            return self.daily_quota
+        return self.daily_quota - int(self.daily_quota * RateLimiter.user_reserve)
+
+    # Method is used to raise the error of a used up quota.
+    def quota_exceeded(self, priority):
+        """This method raises the QuotaExceededError of the given priority."""
+
+        if priority == USER_PRIORITY:
+            raise QuotaExceededError("Daily Quota Of " + str(self.daily_quota) + " Requests Used")
+        raise QuotaExceededError("Daily Quota Of " + str(self.daily_quota) + " Requests Used, " +
+                                 str(self.daily_quota - self.quota_limit(priority)) + " Kept For The User")
+
+    # Method is used to count a request.
+    def count_request(self, priority = USER_PRIORITY):
+        """This method counts a request, the lock of the condition must be held. Once the requests reserved by this
+           process have been made, up to reserve_requests more are reserved under the lock of the ledger file, never
+           more than the priority may count. A QuotaExceededError is raised if the daily quota is used up."""
+
+        limit = self.quota_limit(priority)
+        if self.file_name is None:
+            self.load()
+            if limit is not None and self.used >= limit:
+                self.quota_exceeded(priority)
+            self.used = self.used + 1
+            return
+
+        # The requests this process reserved for the user are not made by scheduled requests beyond their limit.
+        if limit is not None and self.used - self.reserved >= limit:
+            self.quota_exceeded(priority)
+        if self.reserved == 0 or self.today() != self.day:
+            with self.ledger_lock():
+                self.load()
+                # Near the quota at most half of the requests left are reserved, so other processes are not shut out.
+                reserve = RateLimiter.reserve_requests
+                if limit is not None:
+                    reserve = min(reserve, limit - self.used, max(1, (limit - self.used) // 2))
+                if reserve <= 0:
+                    self.quota_exceeded(priority)
+                self.save(self.used + reserve)
+                self.reserved = reserve
+        self.reserved = self.reserved - 1
+
+    # Method is used to give back the requests reserved in the ledger.
+    def close(self):
+        """This method gives back the requests this process reserved in the ledger file but did not make, it is
+           called once the rate limiter is no longer used."""
+
+        with self.condition:
+            if self.file_name is None or self.reserved == 0:
+                return
+            with self.ledger_lock():
+                reserved = self.reserved
+                self.reserved = 0
+                day = self.day
+                self.load()
+                if day == self.day:
+                    self.save(self.used - reserved)
+
+    # Method is used to add the tokens earned since the bucket was last filled.
+    def refill(self):
+        """This method adds the tokens earned since the bucket was last filled, up to the burst size."""
+
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.requests_per_second)
+        self.updated = now
+
+    # Method is used to change the limits of the rate limiter.
+    def configure(self, requests_per_second, burst, daily_quota):
+        """This method changes the rate, burst size and daily quota while threads may be waiting. The tokens
+           earned so far are kept, up to the new burst size, and the waiting threads check the new limits at once."""
+
+        with self.condition:
+            self.refill()
+            self.requests_per_second = float(requests_per_second)
+            self.burst = max(1.0, float(burst))
+            self.tokens = min(self.burst, self.tokens)
+            self.daily_quota = daily_quota
+            self.condition.notify_all()
+
+    # Method is used to find the number of requests left today.
+    def remaining(self):
+        """This method returns the number of requests which can still be made today, None is returned if there
+           is no daily quota."""
+
+        with self.condition:
+            self.load()
+            if self.daily_quota is None:
+                return None
+            return max(0, self.daily_quota - self.used + self.reserved)
+
+    # Method is used to wait for a request to be allowed.
+    def acquire(self, priority = USER_PRIORITY, cancel_token = None):
+        """This method waits until the token bucket and every waiting thread of a higher priority allow a request
+           to be made, then counts it in the ledger. A QuotaExceededError is raised if the daily quota is used up.
+           The wait ends with a CancelledError if the cancel_token is cancelled."""
+
+        with self.condition:
+            self.tickets = self.tickets + 1
+            ticket = (priority, self.tickets)
+            heapq.heappush(self.waiting, ticket)
+            try:
+                while True:
+                    if cancel_token is not None:
+                        cancel_token.check()
+
+                    # The requests counted by other processes are read again once they are out of date.
+                    if time.monotonic() - self.loaded >= RateLimiter.reload_interval or self.today() != self.day:
+                        self.load()
+                    limit = self.quota_limit(priority)
+                    if limit is not None and self.reserved == 0 and self.used >= limit:
+                        self.quota_exceeded(priority)
+
+                    # Only the first thread in the queue may take a token.
+                    self.refill()
+                    if self.waiting[0] == ticket and (self.requests_per_second <= 0 or self.tokens >= 1):
+                        break
+                    # A waiting thread wakes up regularly to check its cancellation token.
+                    if self.waiting[0] != ticket or self.requests_per_second <= 0:
+                        self.condition.wait(RateLimiter.cancel_interval)
+                    else:
+                        self.condition.wait(min(RateLimiter.cancel_interval, (1 - self.tokens) / self.requests_per_second))
+
+                self.count_request(priority)
+                if self.requests_per_second > 0:
+                    self.tokens = self.tokens - 1
+            finally:
+                self.waiting.remove(ticket)
+                heapq.heapify(self.waiting)
+                self.condition.notify_all()
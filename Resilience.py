@@ -0,0 +1,164 @@
+
+# Importing the Python modules, the dependencies of the resilience layer.
+import json
+import time
+import random
+import threading
+import email.utils
+from RateLimiter import QuotaExceededError
+from ConnectionPool import NotConnectedError
+from AtomicFile import write_atomic
+
+# Class for the error raised when a news source is skipped.
+class CircuitOpenError(OSError):
+    """The CircuitOpenError is raised instead of making a request to a news source whose circuit is open."""
+
+# Function is used to read the Retry-After header of a server response.
+def parse_retry_after(value):
+    """This function returns the number of seconds to wait given by a Retry-After header, which is either a
+       number of seconds or a date. None is returned if there is no header or it cannot be read."""
+
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# Class for the retry policy.
+class RetryPolicy:
+    """The RetryPolicy decides if whether and when a failed request is made again. Requests which failed to
+       connect, timed out, were rate limited (429) or failed on the server (5xx) are retried with jittered
+       exponential backoff, the wait given by a Retry-After header is used instead when there is one."""
+
+    """Statuses of server responses which are retried."""
+    retry_statuses = (429, 500, 502, 503, 504)
+
+    """Errors raised without making a request, they are never retried."""
+    final_errors = (CircuitOpenError, QuotaExceededError, NotConnectedError)
+
+    def __init__(self, max_attempts = 3, base_delay = 0.5, max_delay = 30.0):
+        """The initiation/constructor method for the RetryPolicy class. A request is made at most max_attempts
+           times, no wait is longer than max_delay seconds."""
+
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    # Method is used to find the wait before a request is made again.
+    def delay(self, attempt, retry_after = None):
+        """This method returns the number of seconds to wait after the attempt, counting from 1. None is returned
+           if the server asked for a longer wait than max_delay, the request should then not be made again."""
+
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    # Method is used to make a request with retries.
+    def call(self, send_request, url, headers = None, sleep = time.sleep):
+        """This method calls send_request(url, headers) until it succeeds or max_attempts is reached, and
+           returns the status, headers and body of the last server response. The error of the last attempt is
+           raised if it failed to connect or timed out. Requests refused by the client, because the circuit is
+           open, the daily quota is used up or there is no connection, are not made again."""
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                status, response_headers, body = send_request(url, headers)
+            except self.final_errors:
+                raise
+            except OSError:
+                if attempt == self.max_attempts:
+                    raise
+                sleep(self.delay(attempt))
+                continue
+
+            if status not in self.retry_statuses or attempt == self.max_attempts:
+                return status, response_headers, body
+            delay = self.delay(attempt, parse_retry_after(response_headers.get("Retry-After")))
+            if delay is None:
+                return status, response_headers, body
+            sleep(delay)
+
+# Class for the circuit breakers of the news sources.
+class CircuitBreaker:
+    """The CircuitBreaker remembers which news sources, or batches of news sources, keep failing. Once a key has
+       failed failure_threshold times in a row its circuit is opened, and no requests are made to it until
+       reset_timeout seconds have passed. A single request is then allowed through, the circuit is closed
+       if it succeeds and opened again if it fails. The state is saved to a file, so it is kept across runs."""
+
+    """Statuses of server responses which are neither a failure nor a success of the news sources requested, the
+       rate limit and daily quota of News API (429) are on the API key."""
+    ignored_statuses = (429,)
+
+    def __init__(self, file_name = None, failure_threshold = 3, reset_timeout = 600.0):
+        """The initiation/constructor method for the CircuitBreaker class. The state is not saved if no file
+           name is given."""
+
+        self.file_name = file_name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+
+        # The number of failures in a row and the time the circuit was opened are kept for each news source.
+        self.circuits = {}
+        if self.file_name is not None:
+            try:
+                with open(self.file_name, "r") as circuit_file:
+                    self.circuits = json.load(circuit_file)
+            except (OSError, ValueError):
+                self.circuits = {}
+
+    # Method is used to save the state of the circuits.
+    def save(self):
+        """This method saves the state of the circuits to the file."""
+
+        if self.file_name is None:
+            return
+        write_atomic(self.file_name, json.dumps(self.circuits, indent = 4))
+
+    # Method is used to check if a request may be made.
+    def allow(self, key):
+        """This method returns True if a request may be made to the news source."""
+
+        with self.lock:
+            circuit = self.circuits.get(key)
+            if circuit is None or circuit["Opened"] is None:
+                return True
+
+            # Once the reset timeout has passed a single request is allowed, the timeout starts again.
+            if time.time() - circuit["Opened"] >= self.reset_timeout:
+                circuit["Opened"] = time.time()
+                self.save()
+                return True
+            return False
+
+    # Method is used to record a successful request.
+    def record_success(self, key):
+        """This method closes the circuit of the news source."""
+
+        with self.lock:
+            if key in self.circuits:
+                del self.circuits[key]
+                self.save()
+
+    # Method is used to record a failed request.
+    def record_failure(self, key):
+        """This method records a failed request to the news source, the circuit is opened once the news
+           source has failed failure_threshold times in a row."""
+
+        with self.lock:
+            circuit = self.circuits.setdefault(key, {"Failures": 0, "Opened": None})
+            circuit["Failures"] = circuit["Failures"] + 1
+            if circuit["Failures"] >= self.failure_threshold:
+                circuit["Opened"] = time.time()
+            self.save()
+
+    # Method is used to list the news sources whose circuit is open.
+    def open_circuits(self):
+        """This method returns the news sources whose circuit is open."""
+
+        with self.lock:
+            return sorted(key for key, circuit in self.circuits.items() if circuit["Opened"] is not None)
@@ -0,0 +1,230 @@
+
+# Importing the Python modules, the dependencies of the save engine.
+import os
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from ConnectionPool import ConnectionPool
+from Cancellation import CancellationToken
+from Instrumentation import metrics, stage
+from Configuration import save_modes
+import Extraction
+
+# Function is used to parse the web page of an article.
+def parse_web_page(web_page, url, save_mode, parser):
+    """This function parses the web page of an article in the save mode with the parser backend of BeautifulSoup
+       and returns the document to be saved as bytes."""
+
+    if save_mode == "extract":
+        return Extraction.extract_article(web_page, url, parser)
+    return str(Extraction.BeautifulSoup(web_page, parser)).encode("utf-8")
+
+# Function is used to parse a chunk of web pages in a worker process.
+def parse_chunk(chunk, save_mode, parser):
+    """This function is run by the worker processes of the SaveEngine. It parses a chunk of web pages, a list of
+       tuples of each web page and its URL, and returns a list of tuples of each document, the message of the
+       error if it could not be parsed, and the number of seconds it took. Errors are sent back as messages, so
+       only bytes and strings are sent between the processes."""
+
+    parsed = []
+    for web_page, url in chunk:
+        start_time = time.perf_counter()
+        try:
+            parsed.append((parse_web_page(web_page, url, save_mode, parser), None, time.perf_counter() - start_time))
+        except Exception as error:
+            parsed.append((None, type(error).__name__ + ": " + str(error), time.perf_counter() - start_time))
+    return parsed
+
+# Class for the save engine.
+class SaveEngine:
+    """The SaveEngine saves news articles offline to a PageStore. Saving is split into three stages which run
+       at the same time: the web pages are downloaded by a pool of threads over pooled keep-alive connections,
+       the downloaded web pages are parsed by a second pool unless the save mode is "raw", and the web pages
+       are stored by the thread consuming the results. By default the web pages are stored exactly as they
+       were downloaded, so they are never parsed.
+
+       Parsing is bound by the CPU, so large batches are parsed by a pool of worker processes instead of
+       threads, which would share a single core. The downloaded web pages are sent to the workers in chunks of
+       parse_chunk_size, and only the parsed documents are sent back. Batches of fewer than min_process_batch
+       articles are parsed by threads, since starting the processes would take longer than parsing them."""
+
+    """The number of web pages sent to a worker process at once, and the smallest batch of articles parsed by processes."""
+    parse_chunk_size = 8
+    min_process_batch = 50
+
+    def __init__(self, max_downloads = 8, max_parsers = 2, max_connections_per_host = 4, timeout = 30, http_cache = None,
+                 save_mode = "raw", parser = None, parse_processes = None):
+        """The initiation/constructor method for the SaveEngine class. Web pages are downloaded through the
+           http_cache if one is given. Web pages are parsed with the parser backend of BeautifulSoup if one is
+           given, otherwise with lxml if it is installed. Large batches are parsed by parse_processes worker
+           processes, by one for each core if it is None, and always by max_parsers threads if it is 0. A
+           ValueError is raised if the save mode is unknown, an ImportError is raised if the save mode needs
+           BeautifulSoup and it is not installed."""
+
+        if save_mode not in save_modes:
+            raise ValueError("Unknown Save Mode: " + str(save_mode))
+        if save_mode != "raw" and Extraction.BeautifulSoup is None:
+            raise ImportError("BeautifulSoup Is Needed To Save Web Pages In The " + save_mode + " Mode")
+        self.max_downloads = max(1, int(max_downloads))
+        self.max_parsers = max(1, int(max_parsers))
+        self.connection_pool = ConnectionPool(max_connections_per_host, timeout)
+        self.http_cache = http_cache
+        self.save_mode = save_mode
+        self.parser = Extraction.parser_backend(parser)
+        self.parse_processes = (os.cpu_count() or 1) if parse_processes is None else max(0, int(parse_processes))
+
+        # The number of seconds each web page took to parse is appended to parse_timings if it is a list.
+        self.parse_timings = None
+
+    # Method is used to download the web page of an article.
+    def download(self, article):
+        """This method downloads the web page of an article and returns it as bytes."""
+
+        with stage("save_download"):
+            if self.http_cache is not None:
+                web_page = self.http_cache.request(article["URL"], self.connection_pool.request_response)
+            else:
+                web_page = self.connection_pool.request(article["URL"])
+        metrics.count("newsfeed_save_download_bytes_total", len(web_page))
+        return web_page
+
+    # Method is used to parse the web page of an article.
+    def parse(self, article, web_page):
+        """This method parses the web page of an article in the save mode and returns the document to be saved as bytes."""
+
+        start_time = time.perf_counter()
+        try:
+            return parse_web_page(web_page, article.get("URL"), self.save_mode, self.parser)
+        finally:
+            self.parsed(time.perf_counter() - start_time)
+
+    # Method is used to count the time taken to parse a web page.
+    def parsed(self, seconds):
+        """This method adds the seconds taken to parse a web page to the metrics, and to parse_timings if it is a list."""
+
+        metrics.observe("newsfeed_save_parse_seconds", seconds, mode = self.save_mode)
+        if self.parse_timings is not None:
+            self.parse_timings.append(seconds)
+
+    # Method is used to decide if web pages are parsed by worker processes.
+    def use_processes(self, number_of_articles):
+        """This method returns True if a batch of the number of articles is parsed by worker processes."""
+
+        return self.save_mode != "raw" and self.parse_processes > 0 and number_of_articles >= self.min_process_batch
+
+    # Method is used to save many articles offline.
+    def save_articles(self, articles, page_store, cancel_token = None):
+        """This method saves the articles offline to the page_store using the download, parse and store stages.
+           It is a generator, a tuple of the article and the error is yielded as soon as each article is
+           finished. The error is None if the article was saved. Articles which are already in the page_store
+           are yielded at once without being downloaded again. Once the cancel_token is cancelled, downloads in
+           flight are interrupted, articles not yet started are skipped and the generator returns without
+           yielding the remaining articles."""
+
+        cancel_token = (cancel_token or CancellationToken())
+
+        # Articles which have been saved before are not downloaded again.
+        for article in [article for article in articles if article["ID"] in page_store]:
+            metrics.count("newsfeed_saved_articles_total", result = "stored")
+            yield (article, None)
+        articles = [article for article in articles if article["ID"] not in page_store]
+
+        results = queue.Queue()
+
+        # Web pages are parsed by worker processes for large batches, the processes are started fresh so no
+        # thread or lock of this process is copied into them.
+        process_executor = None
+        if self.use_processes(len(articles)):
+            process_executor = ProcessPoolExecutor(max_workers = self.parse_processes, mp_context = multiprocessing.get_context("spawn"))
+
+        # Downloaded web pages waiting to be sent to a worker process, and the number of downloads not yet finished.
+        chunk = []
+        chunk_lock = threading.Lock()
+        downloads_left = [len(articles)]
+
+        # The parse stage is started once an article has been downloaded.
+        def parse_stage(article, web_page):
+            try:
+                cancel_token.check()
+                results.put((article, self.parse(article, web_page), None))
+            except Exception as error:
+                results.put((article, None, error))
+
+        # The parsed documents of a chunk are passed on to the store stage.
+        def chunk_parsed(chunk_articles, future):
+            try:
+                parsed = future.result()
+            except BaseException as error:
+                parsed = [(None, type(error).__name__ + ": " + str(error), None)] * len(chunk_articles)
+            for article, (document, error, seconds) in zip(chunk_articles, parsed):
+                if seconds is not None:
+                    self.parsed(seconds)
+                results.put((article, document, None if error is None else ValueError(error)))
+
+        # A chunk of downloaded web pages is sent to a worker process.
+        def submit_chunk(chunk_articles):
+            try:
+                future = process_executor.submit(parse_chunk, [(web_page, article.get("URL")) for article, web_page in chunk_articles],
+                                                 self.save_mode, self.parser)
+            except Exception as error:
+                for article, web_page in chunk_articles:
+                    results.put((article, None, error))
+                return
+            future.add_done_callback(lambda future: chunk_parsed([article for article, web_page in chunk_articles], future))
+
+        # The download stage passes each web page on to the parse stage, or straight to the store stage. A chunk
+        # is sent to the worker processes once it is full or the last download has finished.
+        def download_stage(article):
+            web_page = None
+            try:
+                cancel_token.check()
+                web_page = self.download(article)
+            except Exception as error:
+                results.put((article, None, error))
+            if process_executor is not None:
+                with chunk_lock:
+                    if web_page is not None:
+                        chunk.append((article, web_page))
+                    downloads_left[0] = downloads_left[0] - 1
+                    full_chunk = None
+                    if chunk and (len(chunk) >= self.parse_chunk_size or downloads_left[0] == 0):
+                        full_chunk = chunk[:]
+                        del chunk[:]
+                if full_chunk is not None:
+                    submit_chunk(full_chunk)
+            elif web_page is not None and self.save_mode != "raw":
+                parse_executor.submit(parse_stage, article, web_page)
+            elif web_page is not None:
+                results.put((article, web_page, None))
+
+        # The parse pool is shut down after the download pool, so every downloaded web page is still parsed.
+        with ThreadPoolExecutor(max_workers = self.max_parsers) as parse_executor, \
+             ThreadPoolExecutor(max_workers = self.max_downloads) as download_executor:
+
+            for article in articles:
+                download_executor.submit(download_stage, article)
+
+            # The store stage saves the web pages in the order they are finished.
+            cancel_token.add_callback(self.connection_pool.abort)
+            try:
+                for finished in range(len(articles)):
+                    article, document, error = results.get()
+                    if cancel_token.cancelled():
+                        return
+                    if error is None:
+                        try:
+                            with stage("save_store"):
+                                page_store.put(article, document)
+                        except Exception as store_error:
+                            error = store_error
+                    metrics.count("newsfeed_saved_articles_total", result = ("saved" if error is None else "failed"))
+                    if error is None:
+                        metrics.count("newsfeed_saved_bytes_total", len(document))
+                    yield (article, error)
+            finally:
+                cancel_token.remove_callback(self.connection_pool.abort)
+                self.connection_pool.close()
+                if process_executor is not None:
+                    process_executor.shutdown(wait = False, cancel_futures = True)
@@ -0,0 +1,234 @@
+
+# Importing the Python modules, the dependencies of the search index.
+import os
+import re
+import math
+import threading
+
+# Class for the search index.
+class SearchIndex:
+    """The SearchIndex is an inverted index over the title, description and author of news articles. The
+       index maps every word to the articles containing it and the positions of the word in each article,
+       so queries only look at the articles which contain the words searched for. Queries are not case
+       sensitive. Words in a query must all be found, words either side of OR are alternatives and words
+       in quotation marks must be found as a phrase. Results are ranked using BM25."""
+
+    """Values used by the BM25 ranking function."""
+    k1 = 1.2
+    b = 0.75
+
+    """The gap left between the positions of words in different fields, so a phrase cannot span two fields."""
+    field_gap = 100
+
+    word_pattern = re.compile(r"\w+")
+    query_pattern = re.compile(r'"([^"]*)"|(\S+)')
+
+    def __init__(self, article_store):
+        """The initiation/constructor method for the SearchIndex class. The articles are loaded from the files
+           through the article store."""
+
+        self.article_store = article_store
+
+        # Every word is mapped to the documents containing it, and every document to the positions of the word.
+        self.postings = {}
+
+        # Every document is an article of an indexed file, the number of words in each document is kept.
+        self.documents = {}
+        self.document_lengths = {}
+        self.total_length = 0
+        self.next_document = 0
+
+        # The articles and documents of every indexed file are kept, so a changed file can be indexed again.
+        self.files = {}
+
+        self.lock = threading.RLock()
+
+    # Method is used to split text into words.
+    def tokenize(self, text):
+        """This method returns the words of the text in lower case."""
+
+        if not text:
+            return []
+        return self.word_pattern.findall(text.casefold())
+
+    # Method is used to remove the documents of a file from the index.
+    def remove_file(self, file_name):
+        """This method removes the articles of a file from the index."""
+
+        with self.lock:
+            entry = self.files.pop(os.path.abspath(file_name), None)
+            if entry is None:
+                return
+            for document in entry[1]:
+                for word in set(self.postings_words(document)):
+                    documents = self.postings.get(word)
+                    if documents is not None:
+                        documents.pop(document, None)
+                        if not documents:
+                            del self.postings[word]
+                del self.documents[document]
+                self.total_length = self.total_length - self.document_lengths.pop(document)
+
+    # Method is used to find the words of a document.
+    def postings_words(self, document):
+        """This method returns the words of the article of a document."""
+
+        article = self.documents[document]
+        return self.tokenize(article.title) + self.tokenize(article.description) + self.tokenize(article.author)
+
+    # Method is used to add an article to the index.
+    def add_article(self, article):
+        """This method adds an article to the index and returns its document number."""
+
+        document = self.next_document
+        self.next_document = self.next_document + 1
+        self.documents[document] = article
+
+        position = 0
+        length = 0
+        for field in (article.title, article.description, article.author):
+            words = self.tokenize(field)
+            for offset, word in enumerate(words):
+                self.postings.setdefault(word, {}).setdefault(document, []).append(position + offset)
+            position = position + len(words) + self.field_gap
+            length = length + len(words)
+
+        self.document_lengths[document] = length
+        self.total_length = self.total_length + length
+        return document
+
+    # Method is used to add the articles of a file to the index.
+    def index_file(self, file_name):
+        """This method adds the articles of a JSON file to the index. The file is only indexed again once it has
+           changed. False is returned if the file could not be loaded."""
+
+        file_name = os.path.abspath(file_name)
+        try:
+            articles = self.article_store.load_file(file_name)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.remove_file(file_name)
+            return False
+
+        with self.lock:
+            entry = self.files.get(file_name)
+            if entry is not None and entry[0] is articles:
+                return True
+            self.remove_file(file_name)
+            self.files[file_name] = (articles, [self.add_article(article) for article in articles])
+        return True
+
+    # Method is used to add the articles of every file in a directory to the index.
+    def index_directory(self, directory, recursive = False):
+        """This method adds the articles of every JSON file in the directory to the index. The sub-directories
+           are also indexed if recursive is True. The number of files indexed is returned."""
+
+        indexed = 0
+        for file_name in self.article_store.list_files(directory, recursive):
+            if self.index_file(file_name):
+                indexed = indexed + 1
+        return indexed
+
+    # Method is used to split a query into clauses.
+    def parse_query(self, query):
+        """This method splits a query into clauses which are separated by OR. Each clause is a list of the
+           phrases which must all be found, each phrase is a list of words."""
+
+        clauses = [[]]
+        for phrase, word in self.query_pattern.findall(query):
+            if word == "OR":
+                clauses.append([])
+                continue
+            if word == "AND":
+                continue
+            words = self.tokenize(phrase or word)
+            if words:
+                clauses[-1].append(words)
+        return [clause for clause in clauses if clause]
+
+    # Method is used to find the documents containing a phrase.
+    def match_phrase(self, words):
+        """This method returns the documents which contain the words of the phrase next to each other."""
+
+        postings = [self.postings.get(word) for word in words]
+        if not all(postings):
+            return set()
+
+        documents = set(postings[0])
+        for documents_of_word in postings[1:]:
+            documents.intersection_update(documents_of_word)
+        if len(words) == 1:
+            return documents
+
+        # The positions of each word are checked to follow the position of the previous word.
+        matches = set()
+        for document in documents:
+            positions = set(postings[0][document])
+            for offset, documents_of_word in enumerate(postings[1:], 1):
+                positions = {position for position in positions if position + offset in documents_of_word[document]}
+                if not positions:
+                    break
+            if positions:
+                matches.add(document)
+        return matches
+
+    # Method is used to rank the documents matching a query.
+    def rank(self, documents, words):
+        """This method returns the documents sorted by their BM25 score for the words of a query, the highest
+           scoring documents are first."""
+
+        number_of_documents = len(self.documents)
+        if number_of_documents == 0:
+            return []
+        average_length = (self.total_length / number_of_documents) or 1
+
+        # The inverse document frequency of each word is calculated once for all documents.
+        weights = []
+        for word in words:
+            documents_of_word = self.postings.get(word)
+            if documents_of_word:
+                idf = math.log(1 + (number_of_documents - len(documents_of_word) + 0.5) / (len(documents_of_word) + 0.5))
+                weights.append((documents_of_word, idf))
+
+        scores = {}
+        for document in documents:
+            normalisation = self.k1 * (1 - self.b + self.b * self.document_lengths[document] / average_length)
+            score = 0.0
+            for documents_of_word, idf in weights:
+                positions = documents_of_word.get(document)
+                if positions:
+                    frequency = len(positions)
+                    score = score + idf * (frequency * (self.k1 + 1)) / (frequency + normalisation)
+            scores[document] = score
+        return sorted(documents, key = lambda document: (-scores[document], document))
+
+    # Method is used to search the index.
+    def search(self, query, limit = None):
+        """This method returns the articles matching the query, the best matching articles are first. An
+           article stored in more than one file is only returned once."""
+
+        clauses = self.parse_query(query)
+        with self.lock:
+            matches = set()
+            for clause in clauses:
+                documents = None
+                for words in clause:
+                    phrase_matches = self.match_phrase(words)
+                    documents = phrase_matches if documents is None else documents & phrase_matches
+                    if not documents:
+                        break
+                matches.update(documents or ())
+
+            query_words = set(word for clause in clauses for words in clause for word in words)
+            ranked = self.rank(matches, query_words)
+
+            articles = []
+            article_ids = set()
+            for document in ranked:
+                article = self.documents[document]
+                if article.id in article_ids:
+                    continue
+                article_ids.add(article.id)
+                articles.append(article)
+                if limit is not None and len(articles) >= limit:
+                    break
+        return articles
@@ -0,0 +1,220 @@
+
+# Importing the Python modules, the dependencies of the source catalogue.
+import json
+import time
+import threading
+from AtomicFile import write_atomic
+
+"""The news sources known before the catalogue is first collected from News API, or if it cannot be collected, as
+   tuples of the ID, category, language and country of every news source."""
+default_sources = [
+    ("abc-news", "general", "en", "us"), ("abc-news-au", "general", "en", "au"),
+    ("aftenposten", "general", "no", "no"), ("al-jazeera-english", "general", "en", "us"),
+    ("ansa", "general", "it", "it"), ("argaam", "general", "ar", "sa"), ("ars-technica", "general", "en", "us"),
+    ("ary-news", "general", "ud", "pk"), ("associated-press", "general", "en", "us"),
+    ("australian-financial-review", "business", "en", "au"), ("axios", "general", "en", "us"),
+    ("bbc-news", "general", "en", "gb"), ("bbc-sport", "sports", "en", "gb"), ("bild", "general", "de", "de"),
+    ("blasting-news-br", "general", "pt", "br"), ("bleacher-report", "sports", "en", "us"),
+    ("bloomberg", "business", "en", "us"), ("breitbart-news", "general", "en", "us"),
+    ("business-insider", "business", "en", "us"), ("business-insider-uk", "business", "en", "gb"),
+    ("buzzfeed", "entertainment", "en", "us"), ("cbc-news", "general", "en", "ca"),
+    ("cbs-news", "general", "en", "us"), ("cnbc", "business", "en", "us"), ("cnn", "general", "en", "us"),
+    ("cnn-es", "general", "es", "us"), ("crypto-coins-news", "general", "en", "us"),
+    ("daily-mail", "entertainment", "en", "gb"), ("der-tagesspiegel", "general", "de", "de"),
+    ("die-zeit", "business", "de", "de"), ("el-mundo", "general", "es", "es"), ("engadget", "general", "en", "us"),
+    ("entertainment-weekly", "entertainment", "en", "us"), ("espn", "sports", "en", "us"),
+    ("espn-cric-info", "general", "en", "us"), ("financial-post", "business", "en", "ca"),
+    ("financial-times", "business", "en", "gb"), ("focus", "general", "de", "de"),
+    ("football-italia", "sports", "it", "it"), ("fortune", "business", "en", "us"),
+    ("four-four-two", "sports", "en", "gb"), ("fox-news", "general", "en", "us"),
+    ("fox-sports", "sports", "en", "us"), ("globo", "general", "pt", "br"), ("google-news", "general", "en", "us"),
+    ("google-news-ar", "general", "es", "ar"), ("google-news-au", "general", "en", "au"),
+    ("google-news-br", "general", "pt", "br"), ("google-news-ca", "general", "en", "ca"),
+    ("google-news-fr", "general", "fr", "fr"), ("google-news-in", "general", "en", "in"),
+    ("google-news-is", "general", "he", "is"), ("google-news-it", "general", "it", "it"),
+    ("google-news-ru", "general", "ru", "ru"), ("google-news-sa", "general", "ar", "sa"),
+    ("google-news-uk", "general", "en", "gb"), ("goteborgs-posten", "general", "se", "se"),
+    ("gruenderszene", "technology", "de", "de"), ("hacker-news", "technology", "en", "us"),
+    ("handelsblatt", "business", "de", "de"), ("ign", "entertainment", "en", "us"),
+    ("il-sole-24-ore", "business", "it", "it"), ("independent", "general", "en", "gb"),
+    ("info-money", "business", "pt", "br"), ("infobae", "general", "es", "ar"), ("la-gaceta", "general", "es", "ar"),
+    ("la-nacion", "general", "es", "ar"), ("la-repubblica", "general", "it", "it"),
+    ("le-monde", "general", "fr", "fr"), ("lenta", "general", "ru", "ru"), ("lequipe", "sports", "fr", "fr"),
+    ("les-echos", "business", "fr", "fr"), ("liberation", "general", "fr", "fr"), ("marca", "sports", "es", "es"),
+    ("mashable", "entertainment", "en", "us"), ("medical-news-today", "health", "en", "us"),
+    ("metro", "general", "en", "gb"), ("mirror", "general", "en", "gb"), ("msnbc", "general", "en", "us"),
+    ("mtv-news", "entertainment", "en", "us"), ("mtv-news-uk", "entertainment", "en", "gb"),
+    ("national-geographic", "science", "en", "us"), ("nbc-news", "general", "en", "us"),
+    ("new-scientist", "science", "en", "us"), ("new-york-magazine", "general", "en", "us"),
+    ("news-com-au", "general", "en", "au"), ("news24", "general", "en", "za"), ("newsweek", "general", "en", "us"),
+    ("next-big-future", "science", "en", "us"), ("nfl-news", "sports", "en", "us"),
+    ("nhl-news", "sports", "en", "us"), ("nrk", "general", "no", "no"), ("politico", "general", "en", "us"),
+    ("polygon", "entertainment", "en", "us"), ("rbc", "general", "ru", "ru"), ("recode", "technology", "en", "us"),
+    ("reuters", "general", "en", "us"), ("rt", "general", "ru", "ru"), ("rte", "general", "en", "ie"),
+    ("rtl-nieuws", "general", "nl", "nl"), ("sabq", "general", "ar", "sa"),
+    ("spiegel-online", "general", "de", "de"), ("svenska-dagbladet", "general", "se", "se"),
+    ("t3n", "technology", "de", "de"), ("talksport", "sports", "en", "gb"), ("techcrunch", "technology", "en", "us"),
+    ("techcrunch-cn", "general", "zh", "cn"), ("techradar", "technology", "en", "us"),
+    ("the-economist", "business", "en", "gb"), ("the-globe-and-mail", "general", "en", "ca"),
+    ("the-guardian-au", "general", "en", "au"), ("the-guardian-uk", "general", "en", "gb"),
+    ("the-hill", "general", "en", "us"), ("the-hindu", "general", "en", "in"),
+    ("the-huffington-post", "general", "en", "us"), ("the-irish-times", "general", "en", "ie"),
+    ("the-lad-bible", "entertainment", "en", "gb"), ("the-new-york-times", "general", "en", "us"),
+    ("the-next-web", "technology", "en", "us"), ("the-sport-bible", "sports", "en", "gb"),
+    ("the-telegraph", "general", "en", "gb"), ("the-times-of-india", "general", "en", "in"),
+    ("the-verge", "technology", "en", "us"), ("the-wall-street-journal", "business", "en", "us"),
+    ("the-washington-post", "general", "en", "us"), ("time", "general", "en", "us"),
+    ("usa-today", "general", "en", "us"), ("vice-news", "general", "en", "us"), ("wired", "technology", "en", "us"),
+    ("wired-de", "technology", "de", "de"), ("wirtschafts-woche", "business", "de", "de"),
+    ("xinhua-net", "general", "zh", "cn"), ("ynet", "general", "he", "is")]
+
+"""The names of the countries of the news sources, the countries News API does not name are shown by their code."""
+country_names = {"ae": "United Arab Emirates", "ar": "Argentina", "at": "Austria", "au": "Australia", "be": "Belgium",
+                 "bg": "Bulgaria", "br": "Brazil", "ca": "Canada", "ch": "Switzerland", "cn": "China", "co": "Colombia",
+                 "cu": "Cuba", "cz": "Czechia", "de": "Germany", "eg": "Egypt", "es": "Spain", "fr": "France",
+                 "gb": "United Kingdom", "gr": "Greece", "hk": "Hong Kong", "hu": "Hungary", "id": "Indonesia", "ie": "Ireland",
+                 "il": "Israel", "in": "India", "is": "Israel", "it": "Italy", "jp": "Japan", "kr": "South Korea",
+                 "lt": "Lithuania", "lv": "Latvia", "ma": "Morocco", "mx": "Mexico", "my": "Malaysia", "ng": "Nigeria",
+                 "nl": "Netherlands", "no": "Norway", "nz": "New Zealand", "ph": "Philippines", "pk": "Pakistan", "pl": "Poland",
+                 "pt": "Portugal", "ro": "Romania", "rs": "Serbia", "ru": "Russia", "sa": "Saudi Arabia", "se": "Sweden",
+                 "sg": "Singapore", "si": "Slovenia", "sk": "Slovakia", "th": "Thailand", "tr": "Turkey", "tw": "Taiwan",
+                 "ua": "Ukraine", "us": "United States", "ve": "Venezuela", "za": "South Africa", "zh": "China"}
+
+# Class for the catalogue of news sources.
+class SourceCatalogue:
+    """The SourceCatalogue is the list of news sources offered by News API, collected from its /v2/sources
+       endpoint. The catalogue is cached in a file and collected again once it is older than ttl seconds. The
+       news sources are indexed by category, country and language, so the news sources of a category are
+       found with a dictionary lookup. A news source is only listed once, whichever lists it is in."""
+
+    def __init__(self, file_name = None, ttl = 7 * 24 * 60 * 60):
+        """The initiation/constructor method for the SourceCatalogue class. The cached catalogue is loaded from
+           the file, the default news sources are used if there is none. The catalogue is not cached if no file
+           name is given."""
+
+        self.file_name = file_name
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.fetched = 0
+        self.sources = {}
+        self.by_category = {}
+        self.by_country = {}
+        self.by_language = {}
+
+        cached = None
+        if self.file_name is not None:
+            try:
+                with open(self.file_name, "r") as catalogue_file:
+                    cached = json.load(catalogue_file)
+            except (OSError, ValueError):
+                cached = None
+        if cached is not None and cached.get("Sources"):
+            self.index(cached["Sources"])
+            self.fetched = cached.get("Fetched", 0)
+        else:
+            self.index([{"id": (source_id), "category": (category), "language": (language), "country": (country)}
+                        for source_id, category, language, country in default_sources])
+
+    def __len__(self):
+        return len(self.sources)
+
+    # Method is used to index the news sources.
+    def index(self, sources):
+        """This method replaces the news sources of the catalogue and indexes them by category, country and
+           language. A news source listed more than once is only kept once."""
+
+        catalogue = {}
+        for source in sources:
+            if source.get("id"):
+                catalogue.setdefault(source["id"], source)
+
+        by_category = {}
+        by_country = {}
+        by_language = {}
+        for source_id in sorted(catalogue):
+            source = catalogue[source_id]
+            for index, key in ((by_category, source.get("category")), (by_country, source.get("country")), (by_language, source.get("language"))):
+                if key:
+                    index.setdefault(key.lower(), []).append(source_id)
+
+        with self.lock:
+            self.sources = catalogue
+            self.by_category = by_category
+            self.by_country = by_country
+            self.by_language = by_language
+
+    # Method is used to check if the catalogue should be collected again.
+    def stale(self):
+        """This method returns True if the catalogue has never been collected or is older than the ttl."""
+
+        return time.time() - self.fetched >= self.ttl
+
+    # Method is used to collect the catalogue from News API.
+    def refresh(self, request_sources, force = False):
+        """This method collects the catalogue again with request_sources, a function returning the news sources
+           of the /v2/sources endpoint, if it is stale or force is True. The catalogue is cached in the file. The
+           catalogue is kept and False is returned if it could not be collected."""
+
+        if not force and not self.stale():
+            return True
+        try:
+            sources = request_sources()
+        except Exception:
+            return False
+        if not sources:
+            return False
+        self.index(sources)
+        self.fetched = time.time()
+        if self.file_name is not None:
+            try:
+                write_atomic(self.file_name, json.dumps({"Fetched": (self.fetched), "Sources": (sources)}, indent = 4))
+            except OSError:
+                pass
+        return True
+
+    # Method is used to list every news source.
+    def all_sources(self):
+        """This method returns the ID of every news source of the catalogue, in alphabetical order."""
+
+        with self.lock:
+            return sorted(self.sources)
+
+    # Method is used to list the categories of the catalogue.
+    def categories(self):
+        """This method returns the categories of the catalogue, in alphabetical order."""
+
+        with self.lock:
+            return sorted(self.by_category)
+
+    # Method is used to list the countries of the catalogue.
+    def countries(self):
+        """This method returns the country codes of the catalogue, in alphabetical order of the names of the countries."""
+
+        with self.lock:
+            return sorted(self.by_country, key = SourceCatalogue.country_name)
+
+    # Method is used to list the languages of the catalogue.
+    def languages(self):
+        """This method returns the language codes of the catalogue, in alphabetical order."""
+
+        with self.lock:
+            return sorted(self.by_language)
+
+    # Method is used to find the name of a country.
+    @staticmethod
+    def country_name(country):
+        """This method returns the name of a country code, the code in capitals if it is not known."""
+
+        return country_names.get(country, country.upper())
+
+    # Method is used to find the news sources of a selection.
+    def select(self, category = None, country = None, language = None):
+        """This method returns the ID's of the news sources of the category, country and language, every one
+           which is given must match. The ID's are in alphabetical order and each is only listed once."""
+
+        with self.lock:
+            selected = set(self.sources)
+            for index, key in ((self.by_category, category), (self.by_country, country), (self.by_language, language)):
+                if key:
+                    selected = selected.intersection(index.get(key.lower(), []))
+        return sorted(selected)
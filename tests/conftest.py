@@ -0,0 +1,27 @@
+# Importing the Python modules, the dependencies of the tests.
+import os
+import sys
+import pytest
+
+# The modules of the application are imported from the directory above the tests.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MockNewsAPI import MockNewsAPI
+
+# Fixture is used to serve the mock News API.
+@pytest.fixture
+def mock_api():
+    """This fixture starts a MockNewsAPI without latency and stops it after the test."""
+
+    mock = MockNewsAPI(latency = 0.0, page_size = 2000).start()
+    yield mock
+    mock.stop()
+
+# Fixture is used to create an archive day.
+@pytest.fixture
+def day_directory(tmp_path):
+    """This fixture returns the directory of an archive day, Archive/28Dec2017 in a temporary directory."""
+
+    directory = tmp_path / "Archive" / "28Dec2017"
+    directory.mkdir(parents = True)
+    return str(directory)
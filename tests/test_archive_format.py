@@ -0,0 +1,71 @@
+# Importing the Python modules, the dependencies of the tests of the archive formats.
+import os
+import json
+import gzip
+import pytest
+import ArchiveFormat
+from Harvest import main
+
+# Function is used to create the records of a news source.
+def create_records(number_of_records):
+    """This function returns the records of the articles of a news source."""
+
+    return [{"ID": ("%016x" % number), "Title": ("Story " + str(number)), "Description": ("Über " + str(number)),
+             "Author": (None), "URL": ("http://localhost/" + str(number))} for number in range(number_of_records)]
+
+@pytest.mark.parametrize("archive_format", ["json", "ndjson", "ndjson.gz"])
+def test_records_are_written_and_read_back(day_directory, archive_format):
+    records = create_records(25)
+    file_name = ArchiveFormat.write_source_file(day_directory, "source-0", "top", iter(records), archive_format)
+
+    assert file_name.endswith("source-0-top" + ArchiveFormat.archive_formats[archive_format])
+    assert ArchiveFormat.read_records(file_name) == records
+    assert [record for offset, length, record in ArchiveFormat.iter_record_spans(file_name, ArchiveFormat.read_bytes(file_name))] == records
+
+def test_compressed_files_are_gzip_line_delimited(day_directory):
+    file_name = ArchiveFormat.write_source_file(day_directory, "source-0", "top", create_records(3), "ndjson.gz")
+    with gzip.open(file_name, "rt", encoding = "utf-8") as input_file:
+        assert [json.loads(line)["ID"] for line in input_file] == ["%016x" % number for number in range(3)]
+
+def test_records_are_read_one_line_at_a_time(day_directory):
+    file_name = ArchiveFormat.write_source_file(day_directory, "source-0", "top", create_records(3), "ndjson")
+    with open(file_name, "ab") as output_file:
+        output_file.write(b"{not json\n")
+
+    # The records before a broken line are read before it is reached.
+    records = ArchiveFormat.iter_records(file_name)
+    assert [next(records)["ID"] for number in range(3)] == ["%016x" % number for number in range(3)]
+    with pytest.raises(ValueError):
+        next(records)
+
+def test_a_news_source_keeps_a_single_file(day_directory):
+    ArchiveFormat.write_source_file(day_directory, "source-0", "top", create_records(3), "json")
+    ArchiveFormat.write_source_file(day_directory, "source-0", "top", create_records(4), "ndjson.gz")
+
+    assert os.listdir(day_directory) == ["source-0-top.ndjson.gz"]
+    assert ArchiveFormat.find_source_file(day_directory, "source-0", "top") == os.path.join(day_directory, "source-0-top.ndjson.gz")
+
+def test_state_files_are_not_archive_files():
+    assert ArchiveFormat.is_source_file("bbc-news-top.json")
+    assert ArchiveFormat.is_source_file("bbc-news-latest.ndjson.gz")
+    assert not ArchiveFormat.is_source_file("Circuits.json")
+    assert not ArchiveFormat.is_source_file("Quota.json")
+    assert not ArchiveFormat.is_source_file("Manifest.ndjson")
+
+def test_archive_is_converted_from_the_command_line(day_directory, tmp_path):
+    ArchiveFormat.write_source_file(day_directory, "source-0", "top", create_records(5), "json")
+    ArchiveFormat.write_source_file(day_directory, "source-1", "latest", create_records(7), "ndjson")
+    with open(str(tmp_path / "Archive" / "Quota.json"), "w") as quota_file:
+        json.dump({"Used": 1}, quota_file)
+
+    assert main(["convert-archive", "--directory", str(tmp_path), "--format", "ndjson.gz"]) == 0
+    assert sorted(os.listdir(day_directory)) == ["source-0-top.ndjson.gz", "source-1-latest.ndjson.gz"]
+    assert ArchiveFormat.read_records(os.path.join(day_directory, "source-0-top.ndjson.gz")) == create_records(5)
+    assert ArchiveFormat.read_records(os.path.join(day_directory, "source-1-latest.ndjson.gz")) == create_records(7)
+    assert os.path.exists(str(tmp_path / "Archive" / "Quota.json"))
+
+    # The files are converted back, and an unknown format is refused.
+    assert ArchiveFormat.convert_archive(str(tmp_path / "Archive"), "json") == 2
+    assert ArchiveFormat.read_records(os.path.join(day_directory, "source-0-top.json")) == create_records(5)
+    with pytest.raises(SystemExit):
+        main(["convert-archive", "--directory", str(tmp_path), "--format", "xml"])
@@ -0,0 +1,78 @@
+# Importing the Python modules, the dependencies of the tests of the archive index.
+import os
+import json
+from ArchiveIndex import ArchiveIndex, DayIndex
+from ArticleStore import ArticleStore
+import ArchiveFormat
+
+# Function is used to create the articles of a news source.
+def create_articles(news_source, number_of_articles):
+    """This function returns the records of the articles of a news source."""
+
+    return [{"ID": ("%016x" % (hash((news_source, number)) & 0xffffffffffffffff)), "Title": (news_source + " story " + str(number)),
+             "Description": ("Über " + str(number)), "Author": (None), "Published": ("2017-12-28T10:%02d:00Z" % number),
+             "URL": ("http://localhost/" + news_source + "/" + str(number))} for number in range(number_of_articles)]
+
+# Function is used to create an archive with state files.
+def create_archive(day_directory):
+    """This function saves three news sources to the archive day, in JSON and NDJSON, and adds the state files
+       kept in Archive. The records of every news source are returned."""
+
+    archive_directory = os.path.dirname(day_directory)
+    for file_name in ("Circuits.json", "Quota.json", "Marks.json", "Sources.json"):
+        with open(os.path.join(archive_directory, file_name), "w") as state_file:
+            json.dump({"source-0": {"Failures": 1}}, state_file)
+    os.makedirs(os.path.join(archive_directory, "Pages"))
+    with open(os.path.join(archive_directory, "Pages", "Manifest.ndjson"), "w") as manifest_file:
+        manifest_file.write(json.dumps({"ID": "x", "Blob": "y"}) + "\n")
+
+    records = {}
+    for news_source, archive_format in (("source-0", "json"), ("source-1", "ndjson"), ("source-2", "json")):
+        records[news_source] = create_articles(news_source, 12)
+        ArchiveFormat.write_source_file(day_directory, news_source, "top", records[news_source], archive_format)
+    return records
+
+def test_only_archive_days_are_indexed(day_directory):
+    create_archive(day_directory)
+    archive_index = ArchiveIndex(os.path.dirname(day_directory))
+    try:
+        assert [day_index.directory for day_index in archive_index.days] == [day_directory]
+        assert len(archive_index) == 36
+    finally:
+        archive_index.close()
+    assert not os.path.exists(os.path.join(day_directory, "Index.dat"))
+
+def test_every_loaded_article_is_selected(day_directory):
+    records = create_archive(day_directory)
+    archive_index = ArchiveIndex(os.path.dirname(day_directory))
+    try:
+        selection = archive_index.select(["source-0", "source-1"], "top")
+        article_ids = selection.article_ids()
+
+        # Every ID is known without decoding the articles, and the articles are decoded from the files of the news sources.
+        assert sorted(article_ids) == sorted(record["ID"] for news_source in ("source-0", "source-1") for record in records[news_source])
+        articles = selection.articles(5, len(selection))
+        assert [article.id for article in articles] == article_ids[5:]
+
+        # The articles not scrolled into view are decoded when saving, as by the SaveArticlesThread.
+        article_store = ArticleStore()
+        article_store.add_articles(selection.articles(0, len(selection)))
+        assert all(article_store.get(article_id) is not None for article_id in article_ids)
+        assert article_store.get(article_ids[-1]).description.startswith("Über")
+    finally:
+        archive_index.close()
+
+def test_index_is_made_again_once_a_file_changes(day_directory):
+    records = create_archive(day_directory)
+    DayIndex(day_directory).close()
+    assert os.path.exists(os.path.join(day_directory, "Index.idx"))
+
+    # A news source saved again with more articles makes the index out of date.
+    ArchiveFormat.write_source_file(day_directory, "source-2", "top", create_articles("source-2", 20), "json")
+    day_index = DayIndex(day_directory)
+    try:
+        assert len(day_index) == 44
+        assert [day_index.article(row).id for row in range(len(day_index)) if day_index.record(row)[1] == "source-0"] == \
+               [record["ID"] for record in records["source-0"]]
+    finally:
+        day_index.close()
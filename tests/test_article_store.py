@@ -0,0 +1,33 @@
+# Importing the Python modules, the dependencies of the tests of the article store.
+import os
+from ArticleStore import ArticleStore
+import ArchiveFormat
+
+# Function is used to create the records of a news source.
+def create_records(titles):
+    """This function returns a record for each of the titles."""
+
+    return [{"ID": (str(number)), "Title": (title), "Description": (None), "Author": (None), "Published": (None),
+             "URL": ("http://localhost/" + str(number))} for number, title in enumerate(titles)]
+
+def test_files_are_only_read_again_once_changed(day_directory, monkeypatch):
+    ArchiveFormat.write_source_file(day_directory, "source-0", "top", create_records(["First", "Second"]))
+    article_store = ArticleStore()
+    articles, missing_files = article_store.load(day_directory, ["source-0", "source-1"], "top")
+    assert [article.title for article in articles] == ["First", "Second"]
+    assert missing_files == ["source-1-top.json"]
+
+    # An unchanged file is answered from memory.
+    def no_reads(file_name):
+        raise AssertionError("File Read Again")
+    monkeypatch.setattr(article_store, "read_records", no_reads)
+    assert article_store.load(day_directory, ["source-0"], "top")[0] == articles
+    monkeypatch.undo()
+
+    # A changed file is read again, and the articles it no longer holds are removed.
+    file_name = ArchiveFormat.source_file_name(day_directory, "source-0", "top")
+    ArchiveFormat.write_source_file(day_directory, "source-0", "top", create_records(["Third"]))
+    os.utime(file_name, ns = (1, 1))
+    assert [article.title for article in article_store.load(day_directory, ["source-0"], "top")[0]] == ["Third"]
+    assert article_store.get("1") is None
+    assert article_store.get("0").title == "Third"
@@ -0,0 +1,82 @@
+# Importing the Python modules, the dependencies of the tests of cancellation.
+import os
+import time
+import threading
+import pytest
+from Cancellation import CancellationToken, CancelledError
+from AtomicFile import atomic_writer
+from FetchEngine import FetchEngine
+from SaveEngine import SaveEngine
+from PageStore import PageStore
+
+# Function is used to cancel a token after a delay.
+def cancel_later(cancel_token, seconds):
+    """This function cancels the token from another thread after the number of seconds."""
+
+    timer = threading.Timer(seconds, cancel_token.cancel)
+    timer.start()
+    return timer
+
+def test_token_interrupts_sleep_and_calls_callbacks():
+    cancel_token = CancellationToken()
+    called = []
+    cancel_token.add_callback(lambda: called.append("added"))
+    cancel_later(cancel_token, 0.1)
+
+    start_time = time.perf_counter()
+    with pytest.raises(CancelledError):
+        cancel_token.sleep(5)
+    assert time.perf_counter() - start_time < 1
+    assert called == ["added"]
+
+    # A callback added once the token is cancelled is called at once.
+    cancel_token.add_callback(lambda: called.append("late"))
+    assert called == ["added", "late"]
+
+def test_fetch_sources_returns_promptly_once_cancelled(mock_api, day_directory):
+    mock_api.latency = 3.0
+    fetch_engine = FetchEngine("test", max_workers = 4, base_url = mock_api.base_url())
+    cancel_token = CancellationToken()
+    cancel_later(cancel_token, 0.3)
+
+    start_time = time.perf_counter()
+    fetched = list(fetch_engine.fetch_sources(["source-" + str(number) for number in range(8)], "top", day_directory,
+                                              cancel_token = cancel_token))
+    seconds = time.perf_counter() - start_time
+
+    # Requests in flight are interrupted, so nothing is archived and no temporary file is left behind.
+    assert seconds < 2
+    assert [formatted_articles for news_source, formatted_articles in fetched if formatted_articles is not None] == []
+    assert os.listdir(day_directory) == []
+
+def test_save_articles_returns_promptly_once_cancelled(mock_api, day_directory, tmp_path):
+    articles = []
+    for news_source, formatted_articles in FetchEngine("test", base_url = mock_api.base_url()).fetch_sources(["source-0"], "top", day_directory):
+        articles.extend(formatted_articles)
+
+    mock_api.latency = 3.0
+    page_store = PageStore(str(tmp_path / "Pages"))
+    cancel_token = CancellationToken()
+    cancel_later(cancel_token, 0.3)
+
+    start_time = time.perf_counter()
+    saved = list(SaveEngine(4).save_articles(articles[:8], page_store, cancel_token))
+    seconds = time.perf_counter() - start_time
+
+    assert seconds < 2
+    assert saved == []
+    assert [article["ID"] for article in articles[:8] if article["ID"] in page_store] == []
+
+def test_interrupted_write_keeps_the_old_file(tmp_path):
+    file_name = str(tmp_path / "source-0-top.json")
+    with atomic_writer(file_name) as output_file:
+        output_file.write(b"old")
+
+    with pytest.raises(CancelledError):
+        with atomic_writer(file_name) as output_file:
+            output_file.write(b"half")
+            raise CancelledError("Cancelled")
+
+    with open(file_name, "rb") as input_file:
+        assert input_file.read() == b"old"
+    assert os.listdir(str(tmp_path)) == ["source-0-top.json"]
@@ -0,0 +1,86 @@
+# Importing the Python modules, the dependencies of the tests of the configuration.
+import os
+import json
+import time
+import pytest
+from Configuration import (ConfigurationError, ConfigurationWatcher, configuration_file, load_configuration,
+                           validate_configuration, settings)
+from Harvest import Harvester, main
+
+# Function is used to write a configuration file.
+def write_configuration(file_name, text):
+    """This function writes the text to the configuration file, with a modification time the watcher cannot miss."""
+
+    with open(file_name, "w") as configuration_file:
+        configuration_file.write(text)
+    modified = time.time() + len(text)
+    os.utime(file_name, (modified, modified))
+
+# Function is used to wait for a condition.
+def wait_for(condition, seconds = 5.0):
+    """This function waits until the condition returns True and returns it, False is returned after the number of seconds."""
+
+    deadline = time.monotonic() + seconds
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def test_settings_not_given_are_the_defaults():
+    configuration = validate_configuration({"SourcesPerRequest": 5, "ReadTimeout": 10})
+
+    assert configuration["SourcesPerRequest"] == 5
+    assert configuration["ReadTimeout"] == 10.0
+    assert configuration["MaxAttempts"] == settings["MaxAttempts"].default
+
+def test_every_invalid_setting_is_rejected():
+    with pytest.raises(ConfigurationError) as error:
+        validate_configuration({"SourcesPerRequest": 50, "MaxAttempts": "3", "IncrementalLatest": 1, "SaveMode": "pdf",
+                                "DailyQuota": None, "MaxWorkers": 8})
+
+    message = str(error.value)
+    for key in ("SourcesPerRequest Must Be At Most 20", "MaxAttempts Must Be An Integer", "IncrementalLatest Must Be True Or False",
+                "SaveMode Must Be One Of", "Unknown Setting: MaxWorkers"):
+        assert key in message
+    assert "DailyQuota" not in message
+
+def test_configuration_files_are_read_without_running_code(tmp_path):
+    assert configuration_file(str(tmp_path)) == str(tmp_path / "Config.txt")
+    write_configuration(str(tmp_path / "Config.txt"), "{'APIKEY': 'key', 'Sources': ['cnn']}")
+    assert load_configuration(str(tmp_path / "Config.txt"))["Sources"] == ["cnn"]
+
+    write_configuration(str(tmp_path / "Config.txt"), "open(" + repr(str(tmp_path / "Ran")) + ", 'w')")
+    with pytest.raises(ConfigurationError):
+        load_configuration(str(tmp_path / "Config.txt"))
+    assert not os.path.exists(str(tmp_path / "Ran"))
+
+    # A TOML file is used before Config.txt.
+    write_configuration(str(tmp_path / "Config.toml"), "APIKEY = \"key\"\nArchiveFormat = \"ndjson.gz\"\n")
+    assert configuration_file(str(tmp_path)) == str(tmp_path / "Config.toml")
+    assert load_configuration(str(tmp_path / "Config.toml"))["ArchiveFormat"] == "ndjson.gz"
+
+def test_harvester_refuses_an_invalid_configuration(tmp_path, capsys):
+    write_configuration(str(tmp_path / "Config.json"), json.dumps({"MaxConcurrentRequests": 0}))
+
+    assert main(["harvest", "--directory", str(tmp_path), "--sources", "cnn"]) == 1
+    assert "MaxConcurrentRequests Must Be At Least 1" in capsys.readouterr().out
+
+def test_previous_settings_are_kept_on_an_invalid_reload(tmp_path):
+    file_name = str(tmp_path / "Config.json")
+    write_configuration(file_name, json.dumps({"SourcesPerRequest": 20}))
+    harvester = Harvester("test", str(tmp_path))
+    errors = []
+    stop_watching = ConfigurationWatcher(str(tmp_path), 0.01).start(harvester.configure, errors.append)
+    try:
+        write_configuration(file_name, json.dumps({"SourcesPerRequest": 5, "MaxAttempts": 2}))
+        assert wait_for(lambda: harvester.fetch_engine.sources_per_request == 5)
+        assert harvester.fetch_engine.retry_policy.max_attempts == 2
+
+        # An invalid file is reported and none of its settings are used, not even the valid ones.
+        write_configuration(file_name, json.dumps({"SourcesPerRequest": 50, "MaxAttempts": 7}))
+        assert wait_for(lambda: errors)
+        assert isinstance(errors[0], ConfigurationError)
+        assert (harvester.fetch_engine.sources_per_request, harvester.fetch_engine.retry_policy.max_attempts) == (5, 2)
+    finally:
+        stop_watching.set()
@@ -0,0 +1,77 @@
+# Importing the Python modules, the dependencies of the tests of the SQLite archive.
+import os
+import json
+import threading
+from Database import ArchiveDatabase
+from ArticleStore import ArticleStore
+from FetchEngine import FetchEngine
+import ArchiveFormat
+
+# Function is used to create the records of a news source.
+def create_records(news_source, published_times):
+    """This function returns a record for each of the published times."""
+
+    return [{"ID": (news_source + "-" + str(number)), "Title": (news_source + " story " + str(number)), "Description": (None),
+             "Author": (None), "Published": (published), "URL": ("http://localhost/" + news_source + "/" + str(number))}
+            for number, published in enumerate(published_times)]
+
+def test_collected_articles_are_stored_in_the_database(mock_api, day_directory):
+    database = ArchiveDatabase(os.path.join(os.path.dirname(day_directory), "Archive.db"))
+    engine = FetchEngine("test", base_url = mock_api.base_url(), database = database)
+    fetched = dict(engine.fetch_sources(["source-0", "source-1"], "top", day_directory))
+
+    # No files are written, the articles are read back through the article store.
+    assert os.listdir(day_directory) == []
+    assert database.list_sources() == [("28Dec2017", "source-0", "top"), ("28Dec2017", "source-1", "top")]
+    articles, missing_files = ArticleStore(database).load(day_directory, ["source-0", "source-1", "source-2"], "top")
+    assert [article.id for article in articles] == [article["ID"] for article in fetched["source-0"] + fetched["source-1"]]
+    assert missing_files == ["source-2-top.json"]
+
+def test_stored_articles_replace_those_of_the_day(tmp_path):
+    database = ArchiveDatabase(str(tmp_path / "Archive.db"))
+    database.replace_source("28Dec2017", "source-0", "top", create_records("source-0", ["2017-12-28T10:00:00Z"] * 3))
+    signature = database.source_signature("28Dec2017", "source-0", "top")
+    database.replace_source("28Dec2017", "source-0", "top", create_records("source-0", ["2017-12-28T11:00:00Z"]))
+
+    assert [record["Published"] for record in database.source_articles("28Dec2017", "source-0", "top")] == ["2017-12-28T11:00:00Z"]
+    assert database.source_signature("28Dec2017", "source-0", "top") != signature
+    assert database.source_signature("29Dec2017", "source-0", "top") is None
+
+def test_articles_are_found_across_days(tmp_path):
+    database = ArchiveDatabase(str(tmp_path / "Archive.db"))
+    database.replace_source("27Dec2017", "source-0", "top", [create_records("source-0", ["2017-12-27T10:00:00Z"])[0]])
+    database.replace_source("28Dec2017", "source-0", "latest", create_records("source-0", [None, "2017-12-28T10:00:00Z"])[1:])
+    database.replace_source("28Dec2017", "source-1", "top", create_records("source-1", ["2017-12-28T09:00:00Z"]))
+
+    assert [record["Published"] for record in database.articles_by_source("source-0")] == ["2017-12-28T10:00:00Z", "2017-12-27T10:00:00Z"]
+    assert [record["Published"] for record in database.articles_by_source("source-0", "2017-12-28")] == ["2017-12-28T10:00:00Z"]
+
+def test_readers_are_not_blocked_by_the_writer(tmp_path):
+    database = ArchiveDatabase(str(tmp_path / "Archive.db"))
+    database.replace_source("28Dec2017", "source-0", "top", create_records("source-0", ["2017-12-28T10:00:00Z"]))
+    assert database.connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    # A write transaction is left open while another thread reads.
+    connection = database.connection()
+    connection.execute("BEGIN IMMEDIATE")
+    connection.execute("DELETE FROM articles")
+    read = []
+    reader = threading.Thread(target = lambda: read.append(database.source_articles("28Dec2017", "source-0", "top")))
+    reader.start()
+    reader.join(5)
+    connection.rollback()
+
+    assert not reader.is_alive()
+    assert len(read[0]) == 1
+
+def test_archives_of_files_are_imported(day_directory):
+    archive_directory = os.path.dirname(day_directory)
+    ArchiveFormat.write_source_file(day_directory, "source-0", "top", create_records("source-0", ["2017-12-28T10:00:00Z"] * 2))
+    ArchiveFormat.write_source_file(day_directory, "source-1", "latest", create_records("source-1", ["2017-12-28T10:00:00Z"]), "ndjson.gz")
+    with open(os.path.join(day_directory, "Notes.json"), "w") as notes_file:
+        json.dump({"Note": "Not An Archive File"}, notes_file)
+
+    database = ArchiveDatabase(os.path.join(archive_directory, "Archive.db"))
+    assert database.import_json_archive(archive_directory) == 2
+    assert database.list_sources() == [("28Dec2017", "source-0", "top"), ("28Dec2017", "source-1", "latest")]
+    assert len(database.source_articles("28Dec2017", "source-1", "latest")) == 1
@@ -0,0 +1,99 @@
+# Importing the Python modules, the dependencies of the tests of deduplication.
+from Deduplication import SeenIndex, HighWaterMarks, create_article_id, normalize_url
+import ArchiveFormat
+from FetchEngine import FetchEngine
+from MockNewsAPI import MockNewsAPI
+
+# Class for a mock News API where every news source publishes the same wire stories.
+class SyndicatedMockNewsAPI(MockNewsAPI):
+    """Every news source links to the articles of source-0, with tracking parameters of its own."""
+
+    def articles(self, news_source, sort):
+        articles = MockNewsAPI.articles(self, "source-0", sort)
+        for article in articles:
+            article["source"] = {"id": news_source, "name": news_source}
+            article["url"] = article["url"] + "?utm_source=" + news_source
+        return articles
+
+# Class for a mock News API where news sources publish new articles.
+class PublishingMockNewsAPI(MockNewsAPI):
+    """Every news source has published the number of new articles after its first twenty."""
+
+    published = 0
+
+    def articles(self, news_source, sort):
+        articles = MockNewsAPI.articles(self, news_source, sort)
+        for number in range(self.published):
+            articles.append(dict(articles[0], title = news_source + " new story " + str(number), url = articles[0]["url"] + "-new-" + str(number),
+                                 publishedAt = "2017-12-28T23:%02d:00Z" % number))
+        return articles
+
+def test_article_ids_are_stable():
+    url = "https://www.example.com/world/story/?utm_source=feed&b=2&a=1#comments"
+
+    assert normalize_url(url) == "https://example.com/world/story?a=1&b=2"
+    assert create_article_id(url) == create_article_id("http://example.com/world/story?a=1&b=2")
+    assert create_article_id(url) != create_article_id("https://example.com/world/other")
+    assert len(create_article_id(url)) == 16
+    assert create_article_id(None, "Title") == create_article_id("", "Title")
+
+def test_seen_articles_are_remembered(tmp_path):
+    file_name = str(tmp_path / "Archived.txt")
+    assert SeenIndex(file_name).add(["a", "b", "a"]) == ["a", "b"]
+    seen_index = SeenIndex(file_name)
+
+    assert "a" in seen_index and "c" not in seen_index
+    assert seen_index.add(["b", "c"]) == ["c"]
+    assert len(SeenIndex(file_name)) == 3
+
+def test_syndicated_and_archived_articles_are_kept_once(day_directory, tmp_path):
+    mock = SyndicatedMockNewsAPI(latency = 0.0).start()
+    try:
+        seen_index = SeenIndex(str(tmp_path / "Archived.txt"))
+        engine = FetchEngine("test", base_url = mock.base_url())
+        fetched = dict(engine.fetch_sources(["source-0", "source-1"], "top", day_directory, seen_index))
+
+        # The same story from two news sources is only kept once.
+        assert len(fetched["source-0"]) + len(fetched["source-1"]) == 20
+        assert len(seen_index) == 20
+
+        # Articles archived by an earlier run are not collected again.
+        fetched = dict(engine.fetch_sources(["source-0", "source-1"], "top", day_directory, SeenIndex(str(tmp_path / "Archived.txt"))))
+        assert fetched == {"source-0": [], "source-1": []}
+    finally:
+        mock.stop()
+
+def test_articles_published_at_the_mark_are_new(tmp_path):
+    high_water_marks = HighWaterMarks(str(tmp_path / "Marks.json"))
+    high_water_marks.advance("source-0", ["2017-12-28T10:00:00Z", "2017-12-28T09:00:00Z"])
+
+    assert high_water_marks.is_new("source-0", "2017-12-28T10:00:00Z")
+    assert not high_water_marks.is_new("source-0", "2017-12-28T09:59:59Z")
+    assert high_water_marks.is_new("source-1", "2017-12-28T09:00:00Z")
+
+def test_marks_are_shared_through_the_file(tmp_path):
+    file_name = str(tmp_path / "Marks.json")
+    first = HighWaterMarks(file_name)
+    second = HighWaterMarks(file_name)
+    first.advance("source-0", ["2017-12-28T10:00:00Z"])
+    second.advance("source-1", ["2017-12-28T11:00:00Z"])
+
+    assert HighWaterMarks(file_name).marks == {"source-0": "2017-12-28T10:00:00Z", "source-1": "2017-12-28T11:00:00Z"}
+
+def test_latest_articles_are_collected_incrementally(day_directory, tmp_path):
+    mock = PublishingMockNewsAPI(latency = 0.0).start()
+    high_water_marks = HighWaterMarks(str(tmp_path / "Archive" / "HighWater.json"))
+    engine = FetchEngine("test", base_url = mock.base_url(), high_water_marks = high_water_marks)
+    try:
+        first = dict(engine.fetch_sources(["source-0", "source-1"], "latest", day_directory))
+        mock.published = 3
+        second = dict(engine.fetch_sources(["source-0", "source-1"], "latest", day_directory))
+    finally:
+        mock.stop()
+
+    # The second poll only adds the articles published since the first, they are merged into the file of the day.
+    assert [len(first[news_source]) for news_source in ("source-0", "source-1")] == [20, 20]
+    assert [article["Title"] for article in second["source-0"]] == ["source-0 new story 2", "source-0 new story 1", "source-0 new story 0"]
+    records = ArchiveFormat.read_records(ArchiveFormat.source_file_name(day_directory, "source-1", "latest"))
+    assert [record["ID"] for record in records] == [article["ID"] for article in first["source-1"] + second["source-1"]]
+    assert HighWaterMarks(str(tmp_path / "Archive" / "HighWater.json")).marks["source-1"] == "2017-12-28T23:02:00Z"
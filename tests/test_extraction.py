@@ -0,0 +1,27 @@
+# Importing the Python modules, the dependencies of the tests of article extraction.
+import pytest
+import Extraction
+
+"""A web page of an article with the boilerplate of a news site."""
+web_page = ("<html><head><title>Site | Story</title><meta property=\"og:title\" content=\"The Story\">"
+            "<meta name=\"author\" content=\"A. Writer\"></head><body><nav><a href=\"/\">Home</a></nav>"
+            "<div class=\"sidebar\"><p>Most read elsewhere</p></div><script>var tracking = 1;</script>"
+            "<article class=\"story-body\"><p>First paragraph of the story, long enough to be the text.</p>"
+            "<img src=\"/images/photo.jpg\" alt=\"Photo\"><p>Second paragraph of the story, also kept.</p></article>"
+            "<div class=\"advert\">Buy now</div><footer>Copyright</footer></body></html>").encode("utf-8")
+
+@pytest.mark.skipif(Extraction.BeautifulSoup is None, reason = "BeautifulSoup is not installed")
+def test_only_the_article_is_kept():
+    document = Extraction.extract_article(web_page, "http://news.example/world/story", parser = "html.parser").decode("utf-8")
+
+    assert "<h1>The Story</h1>" in document
+    assert "A. Writer" in document
+    assert "First paragraph" in document and "Second paragraph" in document
+    assert "<img src=\"http://news.example/images/photo.jpg\" alt=\"Photo\">" in document
+    for boilerplate in ("Home", "Most read", "tracking", "Buy now", "Copyright"):
+        assert boilerplate not in document
+
+def test_extraction_needs_beautifulsoup(monkeypatch):
+    monkeypatch.setattr(Extraction, "BeautifulSoup", None)
+    with pytest.raises(ImportError):
+        Extraction.extract_article(web_page)
@@ -0,0 +1,141 @@
+# Importing the Python modules, the dependencies of the tests of the fetch engine.
+import time
+import threading
+from MockNewsAPI import MockNewsAPI
+from FetchEngine import FetchEngine
+from Resilience import RetryPolicy
+import ArchiveFormat
+
+# Function is used to create a fetch engine for the mock News API.
+def create_engine(mock, **keyword_arguments):
+    """This function returns a FetchEngine making requests to the mock, without waiting between retries."""
+
+    keyword_arguments.setdefault("retry_policy", RetryPolicy(1, base_delay = 0.0))
+    return FetchEngine("test", base_url = mock.base_url(), **keyword_arguments)
+
+# Function is used to read the articles saved for a news source.
+def saved_articles(directory, news_source, sort_by_var = "top"):
+    """This function returns the articles of the news source saved to the directory."""
+
+    return ArchiveFormat.read_records(ArchiveFormat.source_file_name(directory, news_source, sort_by_var))
+
+# Class for a mock News API with busy news sources.
+class BusyMockNewsAPI(MockNewsAPI):
+    """The news sources named busy-<number> publish five times as many articles as the others."""
+
+    def articles(self, news_source, sort):
+        articles = MockNewsAPI.articles(self, news_source, sort)
+        if news_source.startswith("busy-"):
+            articles = [dict(article, url = article["url"] + "-" + str(copy)) for copy in range(5) for article in articles]
+        return articles
+
+# Class for a mock News API with a stale news source.
+class StaleMockNewsAPI(MockNewsAPI):
+    """The news sources named stale-<number> published their articles a day before the others."""
+
+    def articles(self, news_source, sort):
+        articles = MockNewsAPI.articles(self, news_source, sort)
+        if news_source.startswith("stale-"):
+            articles = [dict(article, publishedAt = article["publishedAt"].replace("2017-12-28", "2017-12-27")) for article in articles]
+        return articles
+
+def test_sources_are_fetched_concurrently(day_directory):
+    mock = MockNewsAPI(latency = 0.1).start()
+    try:
+        news_sources = ["source-" + str(number) for number in range(16)]
+        engine = create_engine(mock, max_workers = 8, max_requests_per_host = 8, sources_per_request = 1)
+        start_time = time.perf_counter()
+        fetched = dict(engine.fetch_sources(news_sources, "top", day_directory))
+        seconds = time.perf_counter() - start_time
+    finally:
+        mock.stop()
+
+    # One request after another would take 1.6 seconds.
+    assert seconds < 0.8
+    assert sorted(fetched) == sorted(news_sources)
+    for news_source in news_sources:
+        assert len(saved_articles(day_directory, news_source)) == 20
+
+def test_requests_to_a_host_are_bounded(day_directory):
+    mock = MockNewsAPI(latency = 0.05).start()
+    engine = create_engine(mock, max_workers = 8, max_requests_per_host = 3, sources_per_request = 1)
+
+    # The number of requests in flight is counted around every request.
+    in_flight = [0, 0]
+    lock = threading.Lock()
+    request_response = engine.connection_pool.request_response
+    def counted_request_response(*arguments):
+        with lock:
+            in_flight[0] = in_flight[0] + 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        try:
+            return request_response(*arguments)
+        finally:
+            with lock:
+                in_flight[0] = in_flight[0] - 1
+    engine.connection_pool.request_response = counted_request_response
+
+    try:
+        fetched = dict(engine.fetch_sources(["source-" + str(number) for number in range(12)], "top", day_directory))
+    finally:
+        mock.stop()
+
+    assert in_flight[1] == 3
+    assert all(articles is not None for articles in fetched.values())
+
+def test_batches_are_paged_and_split_into_sources(mock_api, day_directory):
+    news_sources = ["source-" + str(number) for number in range(30)]
+    fetched = dict(create_engine(mock_api).fetch_sources(news_sources, "top", day_directory))
+
+    # 20 sources are collected in 4 pages of 100 articles, the other 10 in 2 pages.
+    assert mock_api.requests == 6
+    for news_source in news_sources:
+        assert len(fetched[news_source]) == 20
+        assert len(saved_articles(day_directory, news_source)) == 20
+        assert all(article["URL"].split("/")[-2] == news_source for article in fetched[news_source])
+
+def test_busy_sources_do_not_starve_the_batch(day_directory):
+    mock = BusyMockNewsAPI(latency = 0.0).start()
+    try:
+        news_sources = ["busy-0", "busy-1", "source-0", "source-1"]
+        fetched = dict(create_engine(mock).fetch_sources(news_sources, "top", day_directory))
+    finally:
+        mock.stop()
+
+    for news_source in news_sources:
+        assert len(fetched[news_source]) == 20
+        assert len(saved_articles(day_directory, news_source)) == 20
+
+def test_sources_not_collected_keep_their_files(day_directory):
+    mock = StaleMockNewsAPI(latency = 0.0).start()
+    news_sources = ["source-" + str(number) for number in range(19)] + ["stale-0"]
+    ArchiveFormat.write_source_file(day_directory, "stale-0", "top", [{"ID": "kept", "Title": "Kept"}])
+    engine = create_engine(mock)
+
+    # Only the first page of the whole batch is answered, the news sources it does not hold cannot be collected.
+    send_request = engine.send_request
+    def send_first_page(url, headers = None, news_sources = None):
+        if "page=1&" not in url or len(news_sources) != 20:
+            return 500, {}, b'{"status": "error"}'
+        return send_request(url, headers, news_sources)
+    engine.send_request = send_first_page
+
+    try:
+        fetched = dict(engine.fetch_sources(news_sources, "top", day_directory))
+    finally:
+        mock.stop()
+
+    # The first page holds the newest articles, none of the stale news source.
+    assert all(fetched[news_source] for news_source in news_sources[:-1])
+    assert fetched["stale-0"] is None
+    assert saved_articles(day_directory, "stale-0") == [{"ID": "kept", "Title": "Kept"}]
+
+def test_fewer_articles_per_source_need_fewer_pages(mock_api, day_directory):
+    news_sources = ["source-" + str(number) for number in range(30)]
+    fetched = dict(create_engine(mock_api, articles_per_source = 5).fetch_sources(news_sources, "top", day_directory))
+
+    # A batch of 20 sources fits on a single page of 100 articles.
+    assert mock_api.requests == 2
+    for news_source in news_sources:
+        assert len(fetched[news_source]) == 5
+        assert len(saved_articles(day_directory, news_source)) == 5
@@ -0,0 +1,66 @@
+# Importing the Python modules, the dependencies of the tests of the headless harvester.
+import os
+import sys
+import time
+import subprocess
+from Harvest import Harvester, parse_sources
+from FetchEngine import archive_directory
+import ArchiveFormat
+
+# Function is used to create a harvester for the mock News API.
+def create_harvester(mock, working_directory, **keyword_arguments):
+    """This function returns a Harvester making requests to the mock."""
+
+    harvester = Harvester("test", working_directory, **keyword_arguments)
+    harvester.fetch_engine.base_url = mock.base_url()
+    return harvester
+
+def test_harvester_does_not_import_pyqt5():
+    modules = subprocess.run([sys.executable, "-c", "import sys, Harvest; print(sorted(module for module in sys.modules if module.startswith('PyQt')))"],
+                             cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__))), capture_output = True, text = True, check = True)
+    assert modules.stdout.strip() == "[]"
+
+def test_sources_are_given_their_own_interval():
+    assert parse_sources(["bbc-news:60", "cnn"], 300) == [("bbc-news", 60.0), ("cnn", 300)]
+    assert parse_sources(["cnn"]) == [("cnn", None)]
+
+def test_due_sources_are_archived(mock_api, tmp_path):
+    harvester = create_harvester(mock_api, str(tmp_path))
+    assert harvester.harvest(["source-0", "source-1"]) == 40
+
+    # Articles archived before are not collected again.
+    assert harvester.harvest(["source-0"]) == 0
+    directory = archive_directory(str(tmp_path))
+    assert len(ArchiveFormat.read_records(ArchiveFormat.source_file_name(directory, "source-0", "top"))) == 20
+
+def test_sources_are_only_collected_when_due(mock_api, tmp_path):
+    harvester = create_harvester(mock_api, str(tmp_path))
+
+    # Every collection is recorded instead of made, the harvester is stopped after a while.
+    collections = []
+    start_time = time.monotonic()
+    def harvest(news_sources):
+        collections.append((time.monotonic() - start_time, sorted(news_sources)))
+        if time.monotonic() - start_time > 0.5:
+            harvester.cancel_token.cancel()
+        return 0
+    harvester.harvest = harvest
+    harvester.run([("fast", 0.1), ("slow", 0.3), ("once", 0)])
+
+    collected = [news_source for seconds, news_sources in collections for news_source in news_sources]
+    assert collections[0][1] == ["fast", "once", "slow"]
+    assert collected.count("once") == 1
+    assert collected.count("slow") in (2, 3)
+    assert collected.count("fast") >= 2 * collected.count("slow")
+
+    # A news source is never collected before it is due.
+    slow_times = [seconds for seconds, news_sources in collections if "slow" in news_sources]
+    assert all(later - earlier >= 0.3 for earlier, later in zip(slow_times, slow_times[1:]))
+
+def test_a_schedule_of_single_collections_returns(mock_api, tmp_path):
+    harvester = create_harvester(mock_api, str(tmp_path))
+    harvested = []
+    harvester.harvest = lambda news_sources: harvested.append(news_sources)
+    harvester.run([("source-0", 0), ("source-1", None)])
+
+    assert harvested == [["source-0", "source-1"]]
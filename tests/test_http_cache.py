@@ -0,0 +1,82 @@
+# Importing the Python modules, the dependencies of the tests of the HTTP cache.
+import os
+import pytest
+from HttpCache import HttpCache
+from FetchEngine import FetchEngine
+from Resilience import RetryPolicy
+
+# Class for a server answered from a list of responses.
+class Server:
+    """The Server answers every request with the next of the responses and records the request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, url, headers = None):
+        self.requests.append(dict(headers or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+def test_unchanged_responses_are_revalidated(mock_api, day_directory, tmp_path):
+    http_cache = HttpCache(str(tmp_path / "Cache"))
+    engine = FetchEngine("test", base_url = mock_api.base_url(), http_cache = http_cache, retry_policy = RetryPolicy(1))
+    first = dict(engine.fetch_sources(["source-0", "source-1"], "top", day_directory))
+    second = dict(engine.fetch_sources(["source-0", "source-1"], "top", day_directory))
+
+    assert (http_cache.misses, http_cache.revalidated) == (1, 1)
+    assert [article["ID"] for article in second["source-0"]] == [article["ID"] for article in first["source-0"]]
+
+def test_conditional_requests_send_the_validators(tmp_path):
+    http_cache = HttpCache(str(tmp_path))
+    server = Server((200, {"ETag": "\"v1\"", "Last-Modified": "Thu, 28 Dec 2017 10:00:00 GMT"}, b"body"), (304, {}, b""))
+    assert http_cache.request("http://localhost/a?apiKey=secret", server) == b"body"
+    assert http_cache.request("http://localhost/a?apiKey=secret", server) == b"body"
+
+    assert server.requests[1] == {"If-None-Match": "\"v1\"", "If-Modified-Since": "Thu, 28 Dec 2017 10:00:00 GMT"}
+
+    # The API key is not written to disk.
+    for file_name in os.listdir(str(tmp_path)):
+        with open(os.path.join(str(tmp_path), file_name), "rb") as cache_file:
+            assert b"secret" not in cache_file.read()
+
+def test_fresh_responses_are_not_requested(tmp_path):
+    http_cache = HttpCache(str(tmp_path))
+    server = Server((200, {"Cache-Control": "max-age=600"}, b"fresh"), (200, {"Cache-Control": "no-store"}, b"private"))
+    assert http_cache.request("http://localhost/a", server) == b"fresh"
+    assert http_cache.request("http://localhost/a", server) == b"fresh"
+    assert http_cache.hits == 1
+
+    # A response which may not be stored is requested every time.
+    assert http_cache.request("http://localhost/b", server) == b"private"
+    assert http_cache.lookup("http://localhost/b") is None
+
+def test_stored_responses_are_used_when_requests_fail(tmp_path):
+    http_cache = HttpCache(str(tmp_path))
+    server = Server((200, {}, b"stored"), OSError("Timed Out"), (503, {}, b""), OSError("Timed Out"))
+    http_cache.request("http://localhost/a", server)
+    assert http_cache.request("http://localhost/a", server) == b"stored"
+    assert http_cache.request("http://localhost/a", server) == b"stored"
+    assert http_cache.stale == 2
+    with pytest.raises(OSError):
+        http_cache.request("http://localhost/b", server)
+
+    # Offline, stored responses are returned without a request.
+    offline_cache = HttpCache(str(tmp_path), offline = True)
+    assert offline_cache.request("http://localhost/a", Server()) == b"stored"
+    with pytest.raises(OSError):
+        offline_cache.request("http://localhost/b", Server())
+
+def test_least_recently_used_responses_are_evicted(tmp_path):
+    http_cache = HttpCache(str(tmp_path), max_size = 250)
+    server = Server(*[(200, {}, bytes(100))] * 3)
+    http_cache.request("http://localhost/a", server)
+    http_cache.request("http://localhost/b", server)
+    os.utime(os.path.join(str(tmp_path), http_cache.key("http://localhost/a") + ".body"), (0, 0))
+    http_cache.request("http://localhost/c", server)
+
+    assert http_cache.lookup("http://localhost/a") is None
+    assert http_cache.lookup("http://localhost/b") is not None
+    assert http_cache.size == 200
@@ -0,0 +1,70 @@
+# Importing the Python modules, the dependencies of the tests of the instrumentation.
+import json
+import urllib.request
+import urllib.error
+import pytest
+from Instrumentation import Metrics, MetricsServer, Tracer, timer_buckets
+
+def test_timings_are_counted_in_buckets():
+    registry = Metrics()
+    for seconds in (0.0005, 0.003, 0.003, 0.2, 60.0):
+        registry.observe("newsfeed_fetch_seconds", seconds, source = "cnn")
+    with pytest.raises(ValueError):
+        with registry.timer("newsfeed_fetch_seconds", source = "cnn"):
+            raise ValueError("Failed")
+
+    timer = registry.timers[("newsfeed_fetch_seconds", (("source", "cnn"),))]
+    assert timer["Count"] == 6
+    assert len(timer["Buckets"]) == len(timer_buckets) + 1
+    assert (timer["Buckets"][0], timer["Buckets"][2], timer["Buckets"][-1]) == (2, 2, 1)
+
+    # The p50 is the upper bound of its bucket, the p99 falls in the last bucket and is the longest timing.
+    timing = registry.snapshot()["Timers"][0]
+    assert (timing["P50"], timing["P99"], timing["Max"]) == (0.005, 60.0, 60.0)
+
+def test_metrics_are_written_in_the_prometheus_format():
+    registry = Metrics()
+    registry.count("newsfeed_requests_total", status = 200)
+    registry.count("newsfeed_requests_total", 2, status = 200)
+    registry.count("newsfeed_articles_total", 20, source = "say \"hi\"")
+    registry.observe("newsfeed_render_seconds", 0.003)
+    lines = registry.prometheus_text().splitlines()
+
+    assert lines[:5] == ["# TYPE newsfeed_articles_total counter", "newsfeed_articles_total{source=\"say \\\"hi\\\"\"} 20",
+                         "# TYPE newsfeed_requests_total counter", "newsfeed_requests_total{status=\"200\"} 3",
+                         "# TYPE newsfeed_render_seconds histogram"]
+    assert "newsfeed_render_seconds_bucket{le=\"0.0025\"} 0" in lines
+    assert "newsfeed_render_seconds_bucket{le=\"0.005\"} 1" in lines
+    assert "newsfeed_render_seconds_bucket{le=\"30.0\"} 1" in lines
+    assert lines[-3:] == ["newsfeed_render_seconds_bucket{le=\"+Inf\"} 1", "newsfeed_render_seconds_sum 0.003", "newsfeed_render_seconds_count 1"]
+
+def test_metrics_are_served_on_localhost():
+    registry = Metrics()
+    registry.count("newsfeed_articles_total", 20, source = "cnn")
+    metrics_server = MetricsServer(0, registry = registry).start()
+    try:
+        with urllib.request.urlopen(metrics_server.url(), timeout = 5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert response.read().decode("utf-8") == registry.prometheus_text()
+        with urllib.request.urlopen(metrics_server.url() + ".json", timeout = 5) as response:
+            assert json.load(response)["Counters"] == [{"Name": "newsfeed_articles_total", "Labels": {"source": "cnn"}, "Value": 20}]
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(metrics_server.url() + "/other", timeout = 5)
+    finally:
+        metrics_server.stop()
+
+def test_spans_are_written_as_a_chrome_trace(tmp_path):
+    file_name = str(tmp_path / "Trace.json")
+    tracer = Tracer(file_name)
+    with tracer.span("fetch_batch", sources = "cnn,bbc-news"):
+        pass
+    with pytest.raises(OSError):
+        with tracer.span("save_store"):
+            raise OSError("Disk Full")
+    tracer.close()
+
+    # The trace file is left unterminated, so it can be read at any time.
+    with open(file_name, "r") as trace_file:
+        events = json.loads(trace_file.read().rstrip().rstrip(",") + "]")
+    assert [(event["name"], event["ph"], event["args"]) for event in events] == [("fetch_batch", "X", {"sources": "cnn,bbc-news"}),
+                                                                               ("save_store", "X", {"error": "OSError"})]
@@ -0,0 +1,64 @@
+# Importing the Python modules, the dependencies of the tests of the rate limiter.
+import json
+import pytest
+from RateLimiter import RateLimiter, QuotaExceededError, USER_PRIORITY, SCHEDULED_PRIORITY
+
+def test_quota_is_shared_through_the_ledger(tmp_path):
+    file_name = str(tmp_path / "Quota.json")
+    rate_limiters = [RateLimiter(0, 1, 15, file_name), RateLimiter(0, 1, 15, file_name)]
+
+    made = 0
+    with pytest.raises(QuotaExceededError):
+        while True:
+            rate_limiters[made % 2].acquire()
+            made = made + 1
+    assert made <= 15
+
+    # The requests reserved but not made are given back, another process can then make them.
+    for rate_limiter in rate_limiters:
+        rate_limiter.close()
+    rate_limiter = RateLimiter(0, 1, 15, file_name)
+    with pytest.raises(QuotaExceededError):
+        while True:
+            rate_limiter.acquire()
+            made = made + 1
+    assert made == 15
+
+def test_unused_reservations_are_given_back(tmp_path):
+    file_name = str(tmp_path / "Quota.json")
+    rate_limiter = RateLimiter(0, 1, 100, file_name)
+    for request in range(3):
+        rate_limiter.acquire()
+    assert rate_limiter.remaining() == 97
+
+    rate_limiter.close()
+    with open(file_name, "r") as ledger_file:
+        assert json.load(ledger_file)["Used"] == 3
+
+def test_scheduled_requests_leave_the_user_reserve(tmp_path):
+    file_name = str(tmp_path / "Quota.json")
+    harvester = RateLimiter(0, 1, 20, file_name)
+    gui = RateLimiter(0, 1, 20, file_name)
+
+    # Scheduled requests stop once only a tenth of the quota is left.
+    made = 0
+    with pytest.raises(QuotaExceededError):
+        while True:
+            harvester.acquire(SCHEDULED_PRIORITY)
+            made = made + 1
+    assert made == 18
+    harvester.close()
+
+    # Another process still makes the requests of the user.
+    for request in range(2):
+        gui.acquire(USER_PRIORITY)
+    with pytest.raises(QuotaExceededError):
+        gui.acquire(USER_PRIORITY)
+
+def test_reservations_of_the_user_are_not_spent_by_scheduled_requests(tmp_path):
+    rate_limiter = RateLimiter(0, 1, 10, str(tmp_path / "Quota.json"))
+    for request in range(9):
+        rate_limiter.acquire(USER_PRIORITY)
+    with pytest.raises(QuotaExceededError):
+        rate_limiter.acquire(SCHEDULED_PRIORITY)
+    rate_limiter.acquire(USER_PRIORITY)
@@ -0,0 +1,137 @@
+# Importing the Python modules, the dependencies of the tests of the resilience layer.
+import pytest
+from MockNewsAPI import MockNewsAPI
+from FetchEngine import FetchEngine
+from HttpCache import HttpCache
+from Resilience import RetryPolicy, CircuitBreaker, parse_retry_after
+from Instrumentation import metrics
+
+# Function is used to create a fetch engine for the mock News API.
+def create_engine(mock, **keyword_arguments):
+    """This function returns a FetchEngine making requests to the mock, without waiting between retries."""
+
+    keyword_arguments.setdefault("retry_policy", RetryPolicy(1, base_delay = 0.0))
+    return FetchEngine("test", base_url = mock.base_url(), **keyword_arguments)
+
+# Function is used to collect news sources from a mock answering every request with an error.
+def fetch_failing(error_status, news_sources, day_directory, circuit_breaker):
+    """This function collects the news sources from a mock answering every request with the error status and
+       returns the articles of every news source."""
+
+    mock = MockNewsAPI(latency = 0.0, error_rate = 1.0, error_status = error_status).start()
+    try:
+        return dict(create_engine(mock, circuit_breaker = circuit_breaker).fetch_sources(news_sources, "top", day_directory))
+    finally:
+        mock.stop()
+
+def test_retry_after_is_read():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert RetryPolicy(max_delay = 30).delay(1, 60) is None
+    assert 0 <= RetryPolicy(base_delay = 1).delay(3) <= 4
+
+def test_failed_requests_are_retried(day_directory):
+    # With the seed the first request fails.
+    mock = MockNewsAPI(latency = 0.0, error_rate = 0.5, seed = 4).start()
+    try:
+        engine = create_engine(mock, retry_policy = RetryPolicy(10, base_delay = 0.0))
+        fetched = dict(engine.fetch_sources(["source-0", "source-1"], "top", day_directory))
+    finally:
+        mock.stop()
+
+    assert mock.requests > 1
+    assert len(fetched["source-0"]) == 20
+
+def test_circuits_open_and_close(monkeypatch):
+    circuit_breaker = CircuitBreaker(failure_threshold = 2, reset_timeout = 60)
+    circuit_breaker.record_failure("source-0")
+    assert circuit_breaker.allow("source-0")
+    circuit_breaker.record_failure("source-0")
+    assert not circuit_breaker.allow("source-0")
+
+    # A single request is let through once the reset timeout has passed.
+    opened = circuit_breaker.circuits["source-0"]["Opened"]
+    monkeypatch.setattr("time.time", lambda: opened + 61)
+    assert circuit_breaker.allow("source-0")
+    assert not circuit_breaker.allow("source-0")
+    circuit_breaker.record_success("source-0")
+    assert circuit_breaker.open_circuits() == []
+
+def test_server_errors_open_the_circuit_of_a_single_source(day_directory):
+    circuit_breaker = CircuitBreaker(failure_threshold = 1)
+    assert fetch_failing(500, ["source-0"], day_directory, circuit_breaker) == {"source-0": None}
+    assert circuit_breaker.open_circuits() == ["source-0"]
+
+def test_failed_batches_do_not_blame_their_sources(day_directory):
+    circuit_breaker = CircuitBreaker(failure_threshold = 1)
+    fetch_failing(500, ["source-0", "source-1"], day_directory, circuit_breaker)
+
+    assert circuit_breaker.open_circuits() == ["batch:source-0,source-1"]
+    assert circuit_breaker.allow("source-0") and circuit_breaker.allow("source-1")
+
+def test_rate_limited_requests_do_not_open_circuits(day_directory):
+    circuit_breaker = CircuitBreaker(failure_threshold = 1)
+    assert fetch_failing(429, ["source-0"], day_directory, circuit_breaker) == {"source-0": None}
+    assert circuit_breaker.open_circuits() == []
+
+def test_invalid_requests_are_not_successes(day_directory):
+    circuit_breaker = CircuitBreaker(failure_threshold = 2)
+    circuit_breaker.record_failure("source-0")
+    assert fetch_failing(401, ["source-0"], day_directory, circuit_breaker) == {"source-0": None}
+    assert circuit_breaker.circuits["source-0"]["Failures"] == 1
+
+def test_successful_batches_close_circuits(mock_api, day_directory):
+    circuit_breaker = CircuitBreaker(failure_threshold = 2)
+    circuit_breaker.record_failure("source-0")
+    circuit_breaker.record_failure("batch:source-0,source-1")
+    list(create_engine(mock_api, circuit_breaker = circuit_breaker).fetch_sources(["source-0", "source-1"], "top", day_directory))
+
+    assert circuit_breaker.circuits == {}
+
+def test_open_circuits_are_answered_from_the_cache(mock_api, day_directory, tmp_path):
+    http_cache = HttpCache(str(tmp_path / "Cache"))
+    circuit_breaker = CircuitBreaker(failure_threshold = 1)
+    engine = create_engine(mock_api, http_cache = http_cache, circuit_breaker = circuit_breaker)
+    first = dict(engine.fetch_sources(["source-0", "source-1"], "top", day_directory))
+
+    circuit_breaker.record_failure("source-1")
+    requests = mock_api.requests
+    second = dict(engine.fetch_sources(["source-0", "source-1"], "top", day_directory))
+
+    # Only source-0 is requested, the articles of source-1 are those of the stored response of the whole batch.
+    assert mock_api.requests == requests + 1
+    assert http_cache.stale == 1
+    assert [article["ID"] for article in second["source-1"]] == [article["ID"] for article in first["source-1"]]
+
+    # A batch whose circuit is open is not requested at all.
+    circuit_breaker.record_success("source-1")
+    circuit_breaker.record_failure("batch:source-0,source-1")
+    third = dict(engine.fetch_sources(["source-0", "source-1"], "top", day_directory))
+    assert mock_api.requests == requests + 1
+    assert [article["ID"] for article in third["source-0"]] == [article["ID"] for article in first["source-0"]]
+
+def test_archive_errors_are_reported(mock_api, day_directory, capsys):
+    engine = create_engine(mock_api)
+    write_source = engine.write_source
+    def failing_write_source(directory, news_source, sort_by_var, formatted_articles):
+        if news_source == "source-1":
+            raise OSError("Disk Full")
+        write_source(directory, news_source, sort_by_var, formatted_articles)
+    engine.write_source = failing_write_source
+    errors = metrics.counters.get(("newsfeed_archive_errors_total", (("source", "source-1"),)), 0)
+    fetched = dict(engine.fetch_sources(["source-0", "source-1"], "top", day_directory))
+
+    assert len(fetched["source-0"]) == 20
+    assert fetched["source-1"] is None
+    assert "Could Not Archive source-1-top: Disk Full" in capsys.readouterr().out
+    assert metrics.counters[("newsfeed_archive_errors_total", (("source", "source-1"),))] == errors + 1
+
+def test_unexpected_errors_are_raised(mock_api, day_directory):
+    engine = create_engine(mock_api)
+    def broken_write_source(directory, news_source, sort_by_var, formatted_articles):
+        raise RuntimeError("Bug")
+    engine.write_source = broken_write_source
+
+    with pytest.raises(RuntimeError):
+        list(engine.fetch_sources(["source-0"], "top", day_directory))
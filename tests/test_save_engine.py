@@ -0,0 +1,118 @@
+# Importing the Python modules, the dependencies of the tests of the save engine.
+import os
+import time
+import pytest
+import Extraction
+from MockNewsAPI import MockNewsAPI
+from FetchEngine import FetchEngine
+from SaveEngine import SaveEngine
+from PageStore import PageStore
+from Harvest import main
+
+# Function is used to collect articles from the mock News API.
+def collect_articles(mock, day_directory, news_sources):
+    """This function returns the formatted articles of the news sources collected from the mock."""
+
+    articles = []
+    for news_source, formatted_articles in FetchEngine("test", base_url = mock.base_url()).fetch_sources(news_sources, "top", day_directory):
+        articles.extend(formatted_articles)
+    return articles
+
+def test_every_article_is_saved_or_reported(mock_api, day_directory, tmp_path):
+    articles = collect_articles(mock_api, day_directory, ["source-0"])[:5]
+    missing_article = {"ID": "missing", "Title": "Missing", "URL": mock_api.base_url() + "missing"}
+    page_store = PageStore(str(tmp_path / "Pages"))
+    errors = dict((article["ID"], error) for article, error in SaveEngine(4).save_articles(articles + [missing_article], page_store))
+
+    assert sorted(errors) == sorted([article["ID"] for article in articles] + ["missing"])
+    assert [errors[article["ID"]] for article in articles] == [None] * 5
+    assert isinstance(errors["missing"], OSError)
+    assert "missing" not in page_store
+
+def test_web_pages_are_downloaded_concurrently(day_directory, tmp_path):
+    mock = MockNewsAPI(latency = 0.1, page_size = 2000).start()
+    try:
+        articles = collect_articles(mock, day_directory, ["source-0"])[:16]
+        start_time = time.perf_counter()
+        errors = [error for article, error in SaveEngine(8, max_connections_per_host = 8).save_articles(articles, PageStore(str(tmp_path / "Pages")))]
+        seconds = time.perf_counter() - start_time
+    finally:
+        mock.stop()
+
+    # One download after another would take 1.6 seconds.
+    assert errors == [None] * 16
+    assert seconds < 0.8
+
+def test_raw_pages_are_stored_as_downloaded(mock_api, day_directory, tmp_path):
+    articles = collect_articles(mock_api, day_directory, ["source-0"])[:5]
+    page_store = PageStore(str(tmp_path / "Pages"))
+    errors = [error for article, error in SaveEngine(4, save_mode = "raw").save_articles(articles, page_store)]
+
+    assert errors == [None] * 5
+    for article in articles:
+        assert page_store.get(article["ID"]) == mock_api.web_page("/articles/source-0/" + article["URL"].split("/")[-1])
+    assert page_store.statistics()["Articles"] == 5
+
+    # A saved page is written out as a HTML file which can be opened.
+    file_name = page_store.export_page(articles[0]["ID"], str(tmp_path / "Open"))
+    with open(file_name, "rb") as page_file:
+        assert page_file.read() == page_store.get(articles[0]["ID"])
+
+def test_saved_articles_are_not_downloaded_again(mock_api, day_directory, tmp_path):
+    articles = collect_articles(mock_api, day_directory, ["source-0"])[:3]
+    page_store = PageStore(str(tmp_path / "Pages"))
+    list(SaveEngine(4).save_articles(articles, page_store))
+    requests = mock_api.requests
+    list(SaveEngine(4).save_articles(articles, PageStore(str(tmp_path / "Pages"))))
+
+    assert mock_api.requests == requests
+
+def test_identical_pages_share_a_blob(tmp_path):
+    page_store = PageStore(str(tmp_path / "Archive" / "Pages"))
+    first_blob = page_store.put({"ID": "a", "Title": "Wire Story"}, b"<html>Wire</html>")
+    second_blob = page_store.put({"ID": "b", "Title": "Wire Story"}, b"<html>Wire</html>")
+
+    assert first_blob == second_blob
+    assert page_store.statistics()["Blobs"] == 1
+
+    # The manifest is read again by another store, and every article is exported with its own file name.
+    page_store = PageStore(str(tmp_path / "Archive" / "Pages"))
+    assert page_store.get("b") == b"<html>Wire</html>"
+    assert main(["export-pages", "--directory", str(tmp_path), "--output", str(tmp_path / "Open")]) == 0
+    assert sorted(os.listdir(str(tmp_path / "Open"))) == ["Wire Story-a.html", "Wire Story-b.html"]
+
+@pytest.mark.skipif(Extraction.BeautifulSoup is None, reason = "BeautifulSoup is not installed")
+def test_extracted_pages_keep_the_article(mock_api, day_directory, tmp_path):
+    articles = collect_articles(mock_api, day_directory, ["source-0"])[:2]
+    page_store = PageStore(str(tmp_path / "Pages"))
+    errors = [error for article, error in SaveEngine(4, save_mode = "extract", parse_processes = 0).save_articles(articles, page_store)]
+
+    assert errors == [None, None]
+    web_page = page_store.get(articles[0]["ID"]).decode("utf-8")
+    assert "Synthetic article text" in web_page
+    assert "tracking" not in web_page
+
+# Function is used in place of parsing a web page in a thread.
+def parse_in_thread(save_engine, article, web_page):
+    """This function fails the parse of a web page, it replaces SaveEngine.parse where only processes may parse."""
+
+    raise ValueError("Parsed By A Thread")
+
+@pytest.mark.skipif(Extraction.BeautifulSoup is None, reason = "BeautifulSoup is not installed")
+def test_large_batches_are_parsed_by_processes(mock_api, day_directory, tmp_path, monkeypatch):
+    articles = collect_articles(mock_api, day_directory, ["source-0", "source-1", "source-2"])
+    assert len(articles) >= SaveEngine.min_process_batch
+    thread_store = PageStore(str(tmp_path / "Threads"))
+    list(SaveEngine(4, save_mode = "extract", parser = "html.parser", parse_processes = 0).save_articles(articles, thread_store))
+
+    # The worker processes parse every web page, none is parsed by a thread of this process.
+    save_engine = SaveEngine(4, save_mode = "extract", parser = "html.parser", parse_processes = 2)
+    assert save_engine.use_processes(len(articles)) and not save_engine.use_processes(SaveEngine.min_process_batch - 1)
+    monkeypatch.setattr(SaveEngine, "parse", parse_in_thread)
+    save_engine.parse_timings = []
+    process_store = PageStore(str(tmp_path / "Processes"))
+    errors = [error for article, error in save_engine.save_articles(articles, process_store)]
+
+    assert errors == [None] * len(articles)
+    assert len(save_engine.parse_timings) == len(articles)
+    assert all(process_store.get(article["ID"]) == thread_store.get(article["ID"]) for article in articles)
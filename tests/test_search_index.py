@@ -0,0 +1,78 @@
+# Importing the Python modules, the dependencies of the tests of the search index.
+import os
+from ArticleStore import ArticleStore
+from SearchIndex import SearchIndex
+import ArchiveFormat
+
+# Function is used to create a record.
+def create_record(article_id, title, description = None, author = None):
+    """This function returns the record of an article."""
+
+    return {"ID": (article_id), "Title": (title), "Description": (description), "Author": (author), "Published": (None),
+            "URL": ("http://localhost/" + article_id)}
+
+# Function is used to index an archive day.
+def create_index(day_directory):
+    """This function saves two news sources to the archive day and returns a SearchIndex of the archive."""
+
+    ArchiveFormat.write_source_file(day_directory, "source-0", "top", [
+        create_record("a", "Markets rally on rate cut", "Stocks rose across Asia.", "Jane Doe"),
+        create_record("b", "Elections held in the north", "Votes are counted.")])
+    ArchiveFormat.write_source_file(day_directory, "source-1", "top", [
+        create_record("c", "Rate cut expected", "Markets wait for the central bank."),
+        create_record("a", "Markets rally on rate cut", "Stocks rose across Asia.", "Jane Doe")])
+    search_index = SearchIndex(ArticleStore())
+    search_index.index_directory(os.path.dirname(day_directory), recursive = True)
+    return search_index
+
+# Function is used to search the index.
+def search(search_index, query):
+    """This function returns the ID's of the articles matching the query, in order."""
+
+    return [article.id for article in search_index.search(query)]
+
+def test_empty_index_returns_no_results():
+    search_index = SearchIndex(ArticleStore())
+
+    assert search_index.search("markets") == []
+    assert search_index.search("\"story 1\" OR markets") == []
+
+def test_words_must_all_be_found(day_directory):
+    search_index = create_index(day_directory)
+
+    assert sorted(search(search_index, "MARKETS")) == ["a", "c"]
+    assert search(search_index, "markets asia") == ["a"]
+    assert search(search_index, "markets AND elections") == []
+    assert search(search_index, "doe") == ["a"]
+
+def test_or_queries_match_either_side(day_directory):
+    search_index = create_index(day_directory)
+
+    assert sorted(search(search_index, "elections OR asia")) == ["a", "b"]
+    assert sorted(search(search_index, "weather OR counted")) == ["b"]
+
+def test_phrases_must_be_found_in_order(day_directory):
+    search_index = create_index(day_directory)
+
+    assert sorted(search(search_index, "\"rate cut\"")) == ["a", "c"]
+    assert search(search_index, "\"cut rate\"") == []
+    assert search(search_index, "\"rally on rate\" stocks") == ["a"]
+
+    # A phrase cannot span the title and the description.
+    assert search(search_index, "\"cut stocks\"") == []
+
+def test_best_matches_are_first(day_directory):
+    search_index = create_index(day_directory)
+
+    # The article stored by both news sources is only returned once.
+    assert sorted(search(search_index, "markets rate")) == ["a", "c"]
+    assert search(search_index, "markets OR cut OR rally")[0] == "a"
+
+def test_changed_files_are_indexed_again(day_directory):
+    search_index = create_index(day_directory)
+    ArchiveFormat.write_source_file(day_directory, "source-0", "top", [create_record("d", "Weather warning")])
+    os.utime(ArchiveFormat.source_file_name(day_directory, "source-0", "top"), ns = (1, 1))
+    search_index.index_directory(day_directory)
+
+    assert search(search_index, "weather") == ["d"]
+    assert search(search_index, "elections") == []
@@ -0,0 +1,51 @@
+# Importing the Python modules, the dependencies of the tests of the source catalogue.
+from SourceCatalogue import SourceCatalogue, default_sources
+from FetchEngine import FetchEngine
+
+# Function is used in place of a request which fails.
+def failed_request():
+    """This function raises the error of a request to News API which could not be made."""
+
+    raise OSError("News API Not Reachable")
+
+def test_default_sources_are_used_without_a_catalogue(tmp_path):
+    source_catalogue = SourceCatalogue(str(tmp_path / "Sources.json"))
+
+    assert len(source_catalogue) == len(default_sources)
+    assert source_catalogue.stale()
+    assert "bbc-news" in source_catalogue.select(category = "General", country = "gb")
+
+def test_sources_listed_twice_are_kept_once():
+    source_catalogue = SourceCatalogue()
+    source_catalogue.index([{"id": "bbc-news", "category": "general", "country": "gb", "language": "en"},
+                            {"id": "bbc-news", "category": "sports", "country": "gb", "language": "en"},
+                            {"id": "cnn", "category": "general", "country": "us", "language": "en"}, {"name": "No ID"}])
+
+    assert source_catalogue.all_sources() == ["bbc-news", "cnn"]
+    assert source_catalogue.select(language = "en") == ["bbc-news", "cnn"]
+    assert source_catalogue.select(category = "sports") == []
+
+def test_catalogue_is_collected_and_cached(mock_api, tmp_path):
+    file_name = str(tmp_path / "Sources.json")
+    source_catalogue = SourceCatalogue(file_name)
+    assert source_catalogue.refresh(FetchEngine("test", base_url = mock_api.base_url()).request_sources)
+    assert source_catalogue.all_sources() == sorted("source-" + str(number) for number in range(mock_api.number_of_sources))
+
+    # The cached catalogue is loaded by another process and is not collected again until it is stale.
+    cached_catalogue = SourceCatalogue(file_name)
+    assert cached_catalogue.all_sources() == source_catalogue.all_sources()
+    assert not cached_catalogue.stale()
+    assert cached_catalogue.refresh(failed_request)
+    cached_catalogue.ttl = 0
+    assert cached_catalogue.stale()
+
+def test_catalogue_is_kept_if_it_cannot_be_collected(tmp_path):
+    file_name = str(tmp_path / "Sources.json")
+    source_catalogue = SourceCatalogue(file_name)
+    source_catalogue.refresh(lambda: [{"id": "cnn", "category": "general", "country": "us", "language": "en"}])
+
+    # A failed request and an empty catalogue both keep the catalogue collected before.
+    assert not source_catalogue.refresh(failed_request, force = True)
+    assert not source_catalogue.refresh(lambda: [], force = True)
+    assert source_catalogue.all_sources() == ["cnn"]
+    assert SourceCatalogue(file_name).all_sources() == ["cnn"]